@@ -4,11 +4,29 @@ SafeClaw - A privacy-first personal automation assistant.
 No GenAI required. 100% self-hosted. Your data stays yours.
 """
 
+import importlib
+
 __version__ = "0.2.1"
 __author__ = "SafeClaw Contributors"
 
-from safeclaw.core.engine import SafeClaw
-from safeclaw.core.memory import Memory
-from safeclaw.core.parser import CommandParser
-
 __all__ = ["SafeClaw", "CommandParser", "Memory", "__version__"]
+
+# Imported on first access, so `import safeclaw` (and the CLI's --version)
+# stays cheap
+_LAZY = {
+    "SafeClaw": "safeclaw.core.engine",
+    "CommandParser": "safeclaw.core.parser",
+    "Memory": "safeclaw.core.memory",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,25 +1,32 @@
 """SafeClaw actions - things the assistant can do."""
 
-from safeclaw.actions.blog import BlogAction
-from safeclaw.actions.briefing import BriefingAction
-from safeclaw.actions.calendar import CalendarAction
-from safeclaw.actions.crawl import CrawlAction
-from safeclaw.actions.email import EmailAction
-from safeclaw.actions.files import FilesAction
-from safeclaw.actions.news import NewsAction
-from safeclaw.actions.reminder import ReminderAction
-from safeclaw.actions.shell import ShellAction
-from safeclaw.actions.summarize import SummarizeAction
+import importlib
 
-__all__ = [
-    "BlogAction",
-    "FilesAction",
-    "ShellAction",
-    "SummarizeAction",
-    "CrawlAction",
-    "ReminderAction",
-    "BriefingAction",
-    "NewsAction",
-    "EmailAction",
-    "CalendarAction",
-]
+# Actions are imported on first access, so importing one action (or
+# safeclaw.actions.base) doesn't import every other action's dependencies
+_LAZY = {
+    "BlogAction": "safeclaw.actions.blog",
+    "FilesAction": "safeclaw.actions.files",
+    "ShellAction": "safeclaw.actions.shell",
+    "SummarizeAction": "safeclaw.actions.summarize",
+    "CrawlAction": "safeclaw.actions.crawl",
+    "ReminderAction": "safeclaw.actions.reminder",
+    "BriefingAction": "safeclaw.actions.briefing",
+    "NewsAction": "safeclaw.actions.news",
+    "EmailAction": "safeclaw.actions.email",
+    "CalendarAction": "safeclaw.actions.calendar",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,55 @@
 """Base class for SafeClaw actions."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from safeclaw.core.engine import SafeClaw
 
 
+@dataclass
+class ActionResult:
+    """
+    Action reply with an optional structured artifact.
+
+    The text is what the user sees. The artifact is the data behind it
+    (a CrawlResult, a list of pages or FeedItems, a DocumentResult, ...)
+    and is handed to the next step of a pipe chain as
+    params["_previous_artifact"], so it doesn't have to refetch or parse
+    the rendered text.
+
+    Set cacheable to False for replies that must not be served from the
+    response cache, such as errors from a flaky upstream service.
+    """
+    text: str
+    artifact: Any = None
+    cacheable: bool = True
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def artifact_text(artifact: Any) -> str:
+    """
+    Plain text content of an artifact.
+
+    Handles objects with a text attribute (CrawlResult, DocumentResult),
+    feed items (content, else description) and lists of either.
+    """
+    if artifact is None:
+        return ""
+    if isinstance(artifact, str):
+        return artifact
+    if isinstance(artifact, (list, tuple)):
+        return "\n\n".join(text for text in map(artifact_text, artifact) if text)
+    text = getattr(artifact, "text", None) or getattr(artifact, "content", None)
+    if not text:
+        text = getattr(artifact, "description", "")
+    return text or ""
+
+
 class BaseAction(ABC):
     """
     Base class for all SafeClaw actions.
@@ -22,6 +65,21 @@ class BaseAction(ABC):
     name: str = "base"
     description: str = "Base action"
 
+    # What the action's blocking work is bound by. Sync handlers are run on
+    # the engine's executor for this workload, and async actions pass it to
+    # engine.run_blocking() for their blocking parts: "io" runs on the thread
+    # pool, "cpu" on the process pool when one is configured.
+    workload: str = "io"
+    # Seconds before the engine abandons the action, None for the default
+    timeout: float | None = None
+
+    # Response caching, opt-in: seconds a reply stays valid (float("inf")
+    # for as long as it fits in the cache), and the params that identify
+    # it. Replies are cached per user unless cache_per_user is False.
+    cache_ttl: float | None = None
+    cache_key: tuple[str, ...] = ()
+    cache_per_user: bool = True
+
     @abstractmethod
     async def execute(
         self,
@@ -29,7 +87,7 @@ class BaseAction(ABC):
         user_id: str,
         channel: str,
         engine: "SafeClaw",
-    ) -> str:
+    ) -> str | ActionResult:
         """
         Execute the action.
 
@@ -40,10 +98,38 @@ class BaseAction(ABC):
             engine: Reference to the SafeClaw engine
 
         Returns:
-            Response message to send back to user
+            Response message to send back to user, or an ActionResult
+            carrying the message and a structured artifact
         """
         pass
 
+    async def stream(
+        self,
+        params: dict[str, Any],
+        user_id: str,
+        channel: str,
+        engine: "SafeClaw",
+    ) -> AsyncIterator[str | ActionResult]:
+        """
+        Execute the action, yielding results as they become available.
+
+        Optional. Actions that produce many items (crawled pages, feed
+        items, document pages) override this and register it with
+        engine.register_action(..., stream=action.stream). In a pipe
+        chain each yielded item flows to the next step right away. The
+        default yields execute()'s single result.
+        """
+        yield await self.execute(params, user_id, channel, engine)
+
+    def should_cache(self, params: dict[str, Any]) -> bool:
+        """
+        Whether a reply for these params may be cached.
+
+        Only consulted when cache_ttl is set. Override to exclude calls that
+        change state or depend on more than the cache key.
+        """
+        return True
+
     def validate_params(self, params: dict[str, Any]) -> tuple[bool, str]:
         """
         Validate parameters before execution.
@@ -187,7 +187,7 @@ class BlogAction(BaseAction):
         extract_type = self._determine_extract_type(lower)
 
         # Crawl the page
-        async with Crawler() as crawler:
+        async with Crawler(run_blocking=engine.run_blocking) as crawler:
             result = await crawler.fetch(url)
 
         if result.error:
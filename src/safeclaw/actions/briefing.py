@@ -3,8 +3,6 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-import httpx
-
 from safeclaw.actions.base import BaseAction
 from safeclaw.core.feeds import Feed, FeedReader
 
@@ -89,6 +87,8 @@ class BriefingAction(BaseAction):
         if not self.weather_api_key:
             return None
 
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.get(
@@ -10,12 +10,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import dateparser  # type: ignore
-from icalendar import Calendar, Event
-
 from safeclaw.actions.base import BaseAction
 
 if TYPE_CHECKING:
+    from icalendar import Event
+
     from safeclaw.core.engine import SafeClaw
 
 logger = logging.getLogger(__name__)
@@ -48,6 +47,8 @@ class CalendarParser:
 
     def parse_file(self, path: str | Path) -> bool:
         """Parse an .ics file."""
+        from icalendar import Calendar, Event
+
         try:
             with open(path, 'rb') as f:
                 cal = Calendar.from_ical(f.read())
@@ -65,7 +66,7 @@ class CalendarParser:
             logger.error(f"Failed to parse calendar: {e}")
             return False
 
-    def _parse_event(self, component: Event) -> None:
+    def _parse_event(self, component: "Event") -> None:
         """Parse a single VEVENT."""
         try:
             summary = str(component.get('summary', 'No Title'))
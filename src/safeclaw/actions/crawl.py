@@ -1,13 +1,17 @@
 """Web crawling action."""
 
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, Any
 
-from safeclaw.actions.base import BaseAction
+from safeclaw.actions.base import ActionResult, BaseAction
 from safeclaw.core.crawler import Crawler
 
 if TYPE_CHECKING:
     from safeclaw.core.engine import SafeClaw
 
+# Streamed pages cached per write
+STREAM_CACHE_BATCH = 10
+
 
 class CrawlAction(BaseAction):
     """
@@ -39,22 +43,12 @@ class CrawlAction(BaseAction):
         user_id: str,
         channel: str,
         engine: "SafeClaw",
-    ) -> str:
+    ) -> str | ActionResult:
         """Execute crawl action."""
-        url = params.get("url", "")
-
-        if not url:
-            # Check entities for URLs
-            urls = params.get("urls", [])
-            if urls:
-                url = urls[0]
-
+        url = self._target_url(params)
         if not url:
             return "Please specify a URL to crawl"
 
-        if not url.startswith(("http://", "https://")):
-            url = "https://" + url
-
         depth = params.get("depth", 0)
         same_domain = params.get("same_domain", True)
         pattern = params.get("pattern")
@@ -66,15 +60,69 @@ class CrawlAction(BaseAction):
             # Multi-page crawl
             return await self._crawl_site(url, depth, same_domain, pattern, engine)
 
+    async def stream(
+        self,
+        params: dict[str, Any],
+        user_id: str,
+        channel: str,
+        engine: "SafeClaw",
+    ) -> AsyncIterator[str | ActionResult]:
+        """Crawl, yielding each page as it is fetched (artifact: its CrawlResult)."""
+        url = self._target_url(params)
+        depth = params.get("depth", 0)
+        if not url or depth == 0:
+            yield await self.execute(params, user_id, channel, engine)
+            return
+
+        crawler = Crawler(
+            max_depth=min(depth, self.max_depth),
+            max_pages=self.max_pages,
+            rate_limit=self.rate_limit,
+            run_blocking=engine.run_blocking,
+        )
+        pages: list[dict[str, Any]] = []
+        async for result in crawler.iter_crawl(
+            start_url=url,
+            same_domain=params.get("same_domain", True),
+            pattern=params.get("pattern"),
+        ):
+            # Cached in batches, each one write and one commit
+            pages.append({"url": result.url, "content": result.text, "links": result.links})
+            if len(pages) >= STREAM_CACHE_BATCH:
+                await engine.memory.cache_crawl_many(pages)
+                pages = []
+            status = "✓" if not result.error else f"✗ {result.error}"
+            yield ActionResult(
+                text=f"[{result.depth}] {status} {result.title or result.url}",
+                artifact=result,
+            )
+        if pages:
+            await engine.memory.cache_crawl_many(pages)
+
+    def _target_url(self, params: dict[str, Any]) -> str:
+        """URL to crawl from params (or URL entities), with a scheme."""
+        url = params.get("url", "")
+
+        if not url:
+            # Check entities for URLs
+            urls = params.get("urls", [])
+            if urls:
+                url = urls[0]
+
+        if url and not url.startswith(("http://", "https://")):
+            url = "https://" + url
+
+        return url
+
     async def _get_links(
         self,
         url: str,
         same_domain: bool,
         pattern: str | None,
         engine: "SafeClaw",
-    ) -> str:
-        """Get links from a single page."""
-        async with Crawler(rate_limit=self.rate_limit) as crawler:
+    ) -> str | ActionResult:
+        """Get links from a single page (artifact: the page's CrawlResult)."""
+        async with Crawler(rate_limit=self.rate_limit, run_blocking=engine.run_blocking) as crawler:
             # Fetch the page content and extract links
             result = await crawler.fetch(url)
             links = result.links
@@ -125,7 +173,7 @@ class CrawlAction(BaseAction):
             if len(links) > 50:
                 lines.append(f"... and {len(links) - 50} more")
 
-        return "\n".join(lines)
+        return ActionResult(text="\n".join(lines), artifact=result)
 
     async def _crawl_site(
         self,
@@ -134,12 +182,13 @@ class CrawlAction(BaseAction):
         same_domain: bool,
         pattern: str | None,
         engine: "SafeClaw",
-    ) -> str:
-        """Crawl multiple pages."""
+    ) -> str | ActionResult:
+        """Crawl multiple pages (artifact: the list of CrawlResults)."""
         crawler = Crawler(
             max_depth=min(depth, self.max_depth),
             max_pages=self.max_pages,
             rate_limit=self.rate_limit,
+            run_blocking=engine.run_blocking,
         )
 
         results = await crawler.crawl(
@@ -156,13 +205,11 @@ class CrawlAction(BaseAction):
         for result in results:
             all_links.update(result.links)
 
-        # Cache results
-        for result in results:
-            await engine.memory.cache_crawl(
-                url=result.url,
-                content=result.text,
-                links=result.links,
-            )
+        # Cache results, in one transaction
+        await engine.memory.cache_crawl_many([
+            {"url": result.url, "content": result.text, "links": result.links}
+            for result in results
+        ])
 
         # Format output
         lines = [
@@ -182,4 +229,4 @@ class CrawlAction(BaseAction):
         if len(results) > 20:
             lines.append(f"  ... and {len(results) - 20} more pages")
 
-        return "\n".join(lines)
+        return ActionResult(text="\n".join(lines), artifact=results)
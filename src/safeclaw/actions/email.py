@@ -344,9 +344,6 @@ class EmailAction(BaseAction):
     name = "email"
     description = "Check and send emails"
 
-    def __init__(self) -> None:
-        self._client: EmailClient | None = None
-
     async def execute(
         self,
         params: dict[str, Any],
@@ -366,22 +363,22 @@ class EmailAction(BaseAction):
                 "Note: Use an app password, not your regular password."
             )
 
-        self._client = EmailClient(config)
+        # One client per request: users run concurrently on this shared instance
+        client = EmailClient(config)
 
         try:
             if subcommand in ("check", "inbox"):
-                return await self._check_inbox(params)
+                return await self._check_inbox(client, params, engine)
             elif subcommand == "unread":
-                return await self._check_unread()
+                return await self._check_unread(client, engine)
             elif subcommand == "send":
-                return await self._send_email(params)
+                return await self._send_email(client, params, engine)
             elif subcommand == "count":
-                return await self._get_count()
+                return await self._get_count(client, engine)
             else:
-                return await self._check_inbox(params)
+                return await self._check_inbox(client, params, engine)
         finally:
-            if self._client:
-                self._client.disconnect_imap()
+            await engine.run_blocking(client.disconnect_imap)
 
     async def _get_config(
         self,
@@ -402,11 +399,10 @@ class EmailAction(BaseAction):
             password=config_data.get("password", ""),
         )
 
-    async def _check_inbox(self, params: dict) -> str:
+    async def _check_inbox(self, client: EmailClient, params: dict, engine: "SafeClaw") -> str:
         """Check inbox."""
         limit = params.get("limit", 5)
-        assert self._client
-        emails = self._client.get_emails(limit=limit)
+        emails = await engine.run_blocking(client.get_emails, limit=limit)
 
         if not emails:
             return "📭 No emails found."
@@ -425,10 +421,9 @@ class EmailAction(BaseAction):
 
         return "\n".join(lines)
 
-    async def _check_unread(self) -> str:
+    async def _check_unread(self, client: EmailClient, engine: "SafeClaw") -> str:
         """Check unread emails only."""
-        assert self._client
-        emails = self._client.get_emails(unread_only=True, limit=10)
+        emails = await engine.run_blocking(client.get_emails, unread_only=True, limit=10)
 
         if not emails:
             return "✅ No unread emails!"
@@ -443,7 +438,7 @@ class EmailAction(BaseAction):
 
         return "\n".join(lines)
 
-    async def _send_email(self, params: dict) -> str:
+    async def _send_email(self, client: EmailClient, params: dict, engine: "SafeClaw") -> str:
         """Send an email."""
         to = params.get("recipient", "")
         subject = params.get("subject", "")
@@ -455,18 +450,18 @@ class EmailAction(BaseAction):
         if not subject and not body:
             return "Please provide a subject and/or body for the email."
 
-        assert self._client
-        success = self._client.send_email(to, subject or "(No subject)", body)
+        success = await engine.run_blocking(
+            client.send_email, to, subject or "(No subject)", body
+        )
 
         if success:
             return f"✅ Email sent to {to}"
         else:
             return f"❌ Failed to send email to {to}"
 
-    async def _get_count(self) -> str:
+    async def _get_count(self, client: EmailClient, engine: "SafeClaw") -> str:
         """Get unread email count."""
-        assert self._client
-        count = self._client.get_unread_count()
+        count = await engine.run_blocking(client.get_unread_count)
         if count == 0:
             return "✅ No unread emails"
         elif count == 1:
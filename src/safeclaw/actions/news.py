@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING, Any
 
-from safeclaw.actions.base import BaseAction
+from safeclaw.actions.base import ActionResult, BaseAction
 from safeclaw.core.feeds import PRESET_FEEDS, Feed, FeedReader
 
 if TYPE_CHECKING:
@@ -23,6 +23,10 @@ class NewsAction(BaseAction):
     name = "news"
     description = "Fetch and summarize news from RSS feeds"
 
+    # Headlines per user (their enabled categories and feeds) and category
+    cache_ttl = 300
+    cache_key = ("category", "limit")
+
     def __init__(
         self,
         default_limit: int = 10,
@@ -40,7 +44,7 @@ class NewsAction(BaseAction):
         user_id: str,
         channel: str,
         engine: "SafeClaw",
-    ) -> str:
+    ) -> str | ActionResult:
         """Execute news action."""
         subcommand = params.get("subcommand", "fetch")
         category = params.get("category")
@@ -72,6 +76,10 @@ class NewsAction(BaseAction):
         else:
             return await self._fetch_news(category, limit, engine)
 
+    def should_cache(self, params: dict[str, Any]) -> bool:
+        """Only cache fetching headlines; other subcommands change or read feeds."""
+        return params.get("subcommand", "fetch") == "fetch"
+
     async def _load_user_prefs(self, user_id: str, engine: "SafeClaw") -> None:
         """Load user's feed preferences."""
         prefs = await engine.memory.get_preference(user_id, "news_feeds", {})
@@ -96,14 +104,15 @@ class NewsAction(BaseAction):
             ],
         }
         await engine.memory.set_preference(user_id, "news_feeds", prefs)
+        engine.response_cache.invalidate(self.name, user_id)
 
     async def _fetch_news(
         self,
         category: str | None,
         limit: int,
         engine: "SafeClaw",
-    ) -> str:
-        """Fetch news from feeds."""
+    ) -> str | ActionResult:
+        """Fetch news from feeds (artifact: the list of FeedItems)."""
         if category:
             if category not in PRESET_FEEDS:
                 return f"Unknown category: {category}. Use 'news categories' to see available options."
@@ -112,7 +121,10 @@ class NewsAction(BaseAction):
             items = await self.feed_reader.fetch_all_enabled()
 
         if not items:
-            return "No news items found. Try enabling more categories with 'news enable <category>'"
+            return ActionResult(
+                text="No news items found. Try enabling more categories with 'news enable <category>'",
+                cacheable=False,
+            )
 
         items = items[:limit]
 
@@ -143,7 +155,7 @@ class NewsAction(BaseAction):
             lines.append(f"[Read more]({item.link})")
             lines.append("")
 
-        return "\n".join(lines)
+        return ActionResult(text="\n".join(lines), artifact=items)
 
     def _list_categories(self) -> str:
         """List available news categories."""
@@ -267,8 +279,8 @@ class NewsAction(BaseAction):
 
         return "\n".join(lines)
 
-    async def _read_article(self, url: str) -> str:
-        """Fetch and summarize a full article."""
+    async def _read_article(self, url: str) -> str | ActionResult:
+        """Fetch and summarize a full article (artifact: the FeedItem)."""
         if not url:
             return "Please provide an article URL to read."
 
@@ -289,4 +301,4 @@ class NewsAction(BaseAction):
             f"[Read full article]({item.link})",
         ]
 
-        return "\n".join(lines)
+        return ActionResult(text="\n".join(lines), artifact=item)
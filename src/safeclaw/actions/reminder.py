@@ -3,8 +3,6 @@
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-import dateparser  # type: ignore
-
 from safeclaw.actions.base import BaseAction
 
 if TYPE_CHECKING:
@@ -41,6 +39,8 @@ class ReminderAction(BaseAction):
 
         # Parse time if not already parsed
         if not trigger_time and time_str:
+            import dateparser  # type: ignore
+
             trigger_time = dateparser.parse(
                 time_str,
                 settings={
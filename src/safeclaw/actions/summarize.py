@@ -2,13 +2,16 @@
 
 from typing import TYPE_CHECKING, Any
 
-from safeclaw.actions.base import BaseAction
-from safeclaw.core.crawler import Crawler
-from safeclaw.core.summarizer import Summarizer, SummaryMethod
+from safeclaw.actions.base import BaseAction, artifact_text
+from safeclaw.core.crawler import Crawler, CrawlResult
+from safeclaw.core.summarizer import SummaryMethod, summarize_text
 
 if TYPE_CHECKING:
     from safeclaw.core.engine import SafeClaw
 
+# Most items summarized from a list artifact (crawled pages, feed items)
+MAX_ARTIFACT_ITEMS = 20
+
 
 class SummarizeAction(BaseAction):
     """
@@ -19,6 +22,7 @@ class SummarizeAction(BaseAction):
 
     name = "summarize"
     description = "Summarize text or URLs"
+    workload = "cpu"
 
     def __init__(
         self,
@@ -26,7 +30,7 @@ class SummarizeAction(BaseAction):
         default_method: SummaryMethod = SummaryMethod.LEXRANK,
     ):
         self.default_sentences = default_sentences
-        self.summarizer = Summarizer(default_method=default_method)
+        self.default_method = default_method
         self.crawler = Crawler()
 
     async def execute(
@@ -37,6 +41,11 @@ class SummarizeAction(BaseAction):
         engine: "SafeClaw",
     ) -> str:
         """Execute summarization."""
+        # Piped from a step that returned structured output
+        artifact = params.get("_previous_artifact")
+        if artifact is not None:
+            return await self._summarize_artifact(artifact, params, engine)
+
         target = params.get("target", "")
 
         if not target:
@@ -46,7 +55,7 @@ class SummarizeAction(BaseAction):
         if target.startswith(("http://", "https://")):
             return await self._summarize_url(target, params, engine)
         else:
-            return await self._summarize_text(target, params)
+            return await self._summarize_text(target, params, engine)
 
     async def _summarize_url(
         self,
@@ -61,7 +70,7 @@ class SummarizeAction(BaseAction):
             return f"**Summary of {url}:**\n\n{cached['summary']}"
 
         # Fetch the page
-        async with Crawler() as crawler:
+        async with Crawler(run_blocking=engine.run_blocking) as crawler:
             result = await crawler.fetch(url)
 
         if result.error:
@@ -72,9 +81,11 @@ class SummarizeAction(BaseAction):
 
         # Summarize
         sentences = params.get("sentences", self.default_sentences)
-        method = params.get("method", SummaryMethod.LEXRANK)
+        method = params.get("method", self.default_method)
 
-        summary = self.summarizer.summarize(result.text, sentences, method)
+        summary = await engine.run_blocking(
+            summarize_text, result.text, sentences, method, workload=self.workload
+        )
 
         # Cache the result
         await engine.memory.cache_crawl(
@@ -88,15 +99,73 @@ class SummarizeAction(BaseAction):
         title = result.title or url
         return f"**{title}**\n\n{summary}"
 
+    async def _summarize_artifact(
+        self,
+        artifact: Any,
+        params: dict[str, Any],
+        engine: "SafeClaw",
+    ) -> str:
+        """
+        Summarize the artifact of a previous pipe step.
+
+        Pages, documents and feed items are summarized one by one from
+        their own text, with no refetching. Crawled pages get their summary
+        cached, as if they had been summarized by URL.
+        """
+        items = list(artifact) if isinstance(artifact, (list, tuple)) else [artifact]
+        default_sentences = self.default_sentences if len(items) == 1 else 2
+        sentences = params.get("sentences", default_sentences)
+        method = params.get("method", self.default_method)
+
+        sections = []
+        summarized_pages = []
+        for item in items[:MAX_ARTIFACT_ITEMS]:
+            if getattr(item, "error", None):
+                continue
+            # Feed items may already carry a summary
+            summary = getattr(item, "summary", "")
+            if not summary:
+                text = artifact_text(item)
+                if not text:
+                    continue
+                summary = await engine.run_blocking(
+                    summarize_text, text, sentences, method, workload=self.workload
+                )
+
+            if isinstance(item, CrawlResult):
+                summarized_pages.append(
+                    {"url": item.url, "content": item.text, "links": item.links, "summary": summary}
+                )
+
+            title = (
+                getattr(item, "title", None)
+                or getattr(item, "url", None)
+                or getattr(item, "path", None)
+            )
+            sections.append(f"**{title}**\n\n{summary}" if title else summary)
+
+        await engine.memory.cache_crawl_many(summarized_pages)
+
+        if not sections:
+            return "No text content found to summarize"
+
+        if len(items) > MAX_ARTIFACT_ITEMS:
+            sections.append(f"... and {len(items) - MAX_ARTIFACT_ITEMS} more")
+
+        return "\n\n".join(sections)
+
     async def _summarize_text(
         self,
         text: str,
         params: dict[str, Any],
+        engine: "SafeClaw",
     ) -> str:
         """Summarize provided text."""
         sentences = params.get("sentences", self.default_sentences)
-        method = params.get("method", SummaryMethod.LEXRANK)
+        method = params.get("method", self.default_method)
 
-        summary = self.summarizer.summarize(text, sentences, method)
+        summary = await engine.run_blocking(
+            summarize_text, text, sentences, method, workload=self.workload
+        )
 
         return f"**Summary:**\n\n{summary}"
@@ -9,7 +9,7 @@ Uses free services:
 import logging
 from typing import Any
 
-import httpx
+from safeclaw.actions.base import ActionResult
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,8 @@ async def get_weather_wttr(location: str, units: str = "imperial") -> str:
         location: City name or coordinates
         units: "imperial" (F) or "metric" (C)
     """
+    import httpx
+
     # wttr.in format codes: https://github.com/chubin/wttr.in
     # %c = condition icon, %C = condition text, %t = temp, %h = humidity, %w = wind
     unit_param = "u" if units == "imperial" else "m"
@@ -55,6 +57,8 @@ async def get_weather_openmeteo(
         lat: Latitude (if known)
         lon: Longitude (if known)
     """
+    import httpx
+
     async with httpx.AsyncClient(timeout=10.0) as client:
         # If no coords, geocode the location first
         if lat is None or lon is None:
@@ -141,7 +145,7 @@ async def execute(
     user_id: str,
     channel: str,
     engine: Any,
-) -> str:
+) -> str | ActionResult:
     """
     Execute weather action.
 
@@ -150,6 +154,8 @@ async def execute(
         provider: "wttr" or "open-meteo" (optional)
         units: "imperial" or "metric" (optional)
     """
+    import httpx
+
     # Get config from engine
     config = engine.config.get("actions", {}).get("weather", {})
 
@@ -164,7 +170,7 @@ async def execute(
             return await get_weather_wttr(location, units)
     except httpx.HTTPError as e:
         logger.error(f"Weather fetch failed: {e}")
-        return f"Could not fetch weather for {location}: {e}"
+        return ActionResult(text=f"Could not fetch weather for {location}: {e}", cacheable=False)
     except Exception as e:
         logger.error(f"Weather action error: {e}")
-        return f"Weather error: {e}"
+        return ActionResult(text=f"Weather error: {e}", cacheable=False)
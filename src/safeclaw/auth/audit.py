@@ -5,6 +5,8 @@ from typing import Any
 
 from cerbos.sdk.model import Principal, Resource
 
+from safeclaw.infra.telemetry import current_trace_id
+
 logger = logging.getLogger("audit")
 
 def sanitize(data: Any) -> Any:
@@ -43,6 +45,7 @@ class AuditLogger:
         event = {
             "timestamp": time.time(),
             "request_id": request_id,
+            "trace_id": current_trace_id(),
             "service": "safeclaw-mcp",
             "tool": "pdp",
             "principal": {
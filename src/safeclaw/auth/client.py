@@ -14,6 +14,7 @@ from safeclaw.infra.telemetry import (
     CERBOS_CALL_DURATION_SECONDS,
     CERBOS_DECISION_CACHE_HIT_TOTAL,
     CERBOS_DECISION_TOTAL,
+    get_request_id,
     tracer,
 )
 
@@ -81,7 +82,7 @@ class AuthClient:
         Fail-closed: Returns False on error.
         """
         cache_key = self._get_cache_key(principal, resource, action)
-        request_id = "req_unknown" # In real app, pass request_id from context
+        request_id = get_request_id() or "req_unknown"
 
         # 1. Check Cache
         try:
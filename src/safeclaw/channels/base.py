@@ -1,10 +1,23 @@
 """Base class for SafeClaw channels."""
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Any, Protocol
 
-if TYPE_CHECKING:
-    from safeclaw.core.engine import SafeClaw
+
+class ChannelEngine(Protocol):
+    """What channels need from the engine: SafeClaw, or a Supervisor in front of workers."""
+
+    def register_channel(self, name: str, channel: Any) -> None: ...
+
+    def get_help(self) -> str: ...
+
+    async def handle_message(
+        self,
+        text: str,
+        channel: str,
+        user_id: str,
+        metadata: dict | None = None,
+    ) -> str: ...
 
 
 class BaseChannel(ABC):
@@ -19,7 +32,7 @@ class BaseChannel(ABC):
 
     name: str = "base"
 
-    def __init__(self, engine: "SafeClaw"):
+    def __init__(self, engine: ChannelEngine):
         self.engine = engine
 
     @abstractmethod
@@ -37,14 +50,17 @@ class BaseChannel(ABC):
         """Send a message to a user."""
         pass
 
-    async def handle_message(self, text: str, user_id: str) -> str:
+    async def handle_message(self, text: str, user_id: str, request_id: str | None = None) -> str:
         """
         Handle incoming message and get response.
 
-        This delegates to the engine for processing.
+        This delegates to the engine for processing. The request id, if the
+        channel has one (e.g. a Telegram update id), is used for tracing
+        and the audit log.
         """
         return await self.engine.handle_message(
             text=text,
             channel=self.name,
             user_id=user_id,
+            metadata={"request_id": request_id} if request_id else None,
         )
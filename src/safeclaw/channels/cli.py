@@ -2,16 +2,12 @@
 
 import asyncio
 import sys
-from typing import TYPE_CHECKING
 
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
-from safeclaw.channels.base import BaseChannel
-
-if TYPE_CHECKING:
-    from safeclaw.core.engine import SafeClaw
+from safeclaw.channels.base import BaseChannel, ChannelEngine
 
 
 class CLIChannel(BaseChannel):
@@ -27,7 +23,7 @@ class CLIChannel(BaseChannel):
 
     name = "cli"
 
-    def __init__(self, engine: "SafeClaw"):
+    def __init__(self, engine: ChannelEngine):
         super().__init__(engine)
         self.console = Console()
         self.running = False
@@ -1,7 +1,6 @@
 """Telegram channel adapter."""
 
 import logging
-from typing import TYPE_CHECKING
 
 try:
     from telegram import Update
@@ -16,10 +15,7 @@ try:
 except ImportError:
     HAS_TELEGRAM = False
 
-from safeclaw.channels.base import BaseChannel
-
-if TYPE_CHECKING:
-    from safeclaw.core.engine import SafeClaw
+from safeclaw.channels.base import BaseChannel, ChannelEngine
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +37,7 @@ class TelegramChannel(BaseChannel):
 
     def __init__(
         self,
-        engine: "SafeClaw",
+        engine: ChannelEngine,
         token: str,
         allowed_users: list[int] | None = None,
     ):
@@ -153,6 +149,7 @@ class TelegramChannel(BaseChannel):
         response = await self.handle_message(
             text=update.message.text,
             user_id=str(user_id),
+            request_id=f"telegram_{update.update_id}",
         )
 
         # Send response
@@ -12,31 +12,18 @@ Usage:
 import asyncio
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.logging import RichHandler
 
 from safeclaw import __version__
-from safeclaw.actions import weather as weather_action
-from safeclaw.actions.blog import BlogAction
-from safeclaw.actions.briefing import BriefingAction
-from safeclaw.actions.calendar import CalendarAction
-from safeclaw.actions.crawl import CrawlAction
-from safeclaw.actions.email import EmailAction
-from safeclaw.actions.files import FilesAction
-from safeclaw.actions.news import NewsAction
-from safeclaw.actions.reminder import ReminderAction
-from safeclaw.actions.shell import ShellAction
-from safeclaw.actions.summarize import SummarizeAction
-from safeclaw.channels.cli import CLIChannel
-from safeclaw.core.analyzer import TextAnalyzer
-from safeclaw.core.crawler import Crawler
-from safeclaw.core.documents import DocumentReader
-from safeclaw.core.engine import SafeClaw
-from safeclaw.core.feeds import PRESET_FEEDS, FeedReader
-from safeclaw.core.summarizer import Summarizer, SummaryMethod
-from safeclaw.plugins import PluginLoader
+
+# Commands import what they use, so `safeclaw --help` or a single command
+# doesn't pay for every action's dependencies (see `safeclaw debug startup`)
+if TYPE_CHECKING:
+    from safeclaw.core.engine import SafeClaw
 
 app = typer.Typer(
     name="safeclaw",
@@ -56,36 +43,48 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
-def create_engine(config_path: Path | None = None) -> SafeClaw:
+def create_engine(config_path: Path | None = None, data_dir: Path | None = None) -> "SafeClaw":
     """Create and configure the SafeClaw engine."""
-    engine = SafeClaw(config_path=config_path)
-
-    # Register default actions
-    files_action = FilesAction()
-    shell_action = ShellAction()
-    summarize_action = SummarizeAction()
-    crawl_action = CrawlAction()
-    reminder_action = ReminderAction()
-    briefing_action = BriefingAction()
-    news_action = NewsAction()
-    email_action = EmailAction()
-    calendar_action = CalendarAction()
-    blog_action = BlogAction()
+    from safeclaw.actions import weather as weather_action
+    from safeclaw.actions.blog import BlogAction
+    from safeclaw.actions.briefing import BriefingAction
+    from safeclaw.actions.calendar import CalendarAction
+    from safeclaw.actions.crawl import CrawlAction
+    from safeclaw.actions.email import EmailAction
+    from safeclaw.actions.files import FilesAction
+    from safeclaw.actions.news import NewsAction
+    from safeclaw.actions.reminder import ReminderAction
+    from safeclaw.actions.shell import ShellAction
+    from safeclaw.actions.summarize import SummarizeAction
+    from safeclaw.core.engine import SafeClaw
+    from safeclaw.plugins import PluginLoader
+
+    engine = SafeClaw(config_path=config_path, data_dir=data_dir)
+
+    # Register default actions; each is built the first time it's used
+    engine.register_lazy_action("files", FilesAction)
+    engine.register_lazy_action("shell", ShellAction)
+    engine.register_lazy_action("summarize", SummarizeAction)
+    engine.register_lazy_action("crawl", CrawlAction, stream=True)
+    engine.register_lazy_action("reminder", ReminderAction)
+    engine.register_lazy_action("briefing", BriefingAction)
+    engine.register_lazy_action("news", NewsAction)
+    engine.register_lazy_action("email", EmailAction)
+    engine.register_lazy_action("calendar", CalendarAction)
+    engine.register_action(
+        "weather",
+        weather_action.execute,
+        cache_ttl=600,
+        cache_key=("location", "units", "provider"),
+        cache_per_user=False,
+    )
+    engine.register_lazy_action("blog", BlogAction)
+    engine.register_action(
+        "help", lambda **_: engine.get_help(), cache_ttl=float("inf"), cache_per_user=False
+    )
 
-    engine.register_action("files", files_action.execute)
-    engine.register_action("shell", shell_action.execute)
-    engine.register_action("summarize", summarize_action.execute)
-    engine.register_action("crawl", crawl_action.execute)
-    engine.register_action("reminder", reminder_action.execute)
-    engine.register_action("briefing", briefing_action.execute)
-    engine.register_action("news", news_action.execute)
-    engine.register_action("email", email_action.execute)
-    engine.register_action("calendar", calendar_action.execute)
-    engine.register_action("weather", weather_action.execute)
-    engine.register_action("blog", blog_action.execute)
-    engine.register_action("help", lambda **_: engine.get_help())
-
-    # Load plugins from plugins/official/ and plugins/community/
+    # Register plugins from plugins/official/ and plugins/community/; most
+    # are only imported when their intent is first used
     plugin_loader = PluginLoader()
     plugin_loader.load_all(engine)
 
@@ -119,6 +118,8 @@ def main(
 
 async def run_cli(config_path: Path | None = None) -> None:
     """Run interactive CLI."""
+    from safeclaw.channels.cli import CLIChannel
+
     engine = create_engine(config_path)
 
     # Add CLI channel
@@ -133,20 +134,46 @@ def run(
     config: Path | None = typer.Option(None, "--config", "-c"),
     webhook: bool = typer.Option(False, "--webhook", help="Enable webhook server"),
     telegram: bool = typer.Option(False, "--telegram", help="Enable Telegram bot"),
+    workers: int | None = typer.Option(
+        None, "--workers", "-w", help="Engine worker processes (default: supervisor.processes)"
+    ),
     verbose: bool = typer.Option(False, "--verbose"),
 ):
     """Start SafeClaw with configured channels."""
     setup_logging(verbose)
-    asyncio.run(_run_all(config, webhook, telegram))
+    asyncio.run(_run_all(config, webhook, telegram, workers))
 
 
 async def _run_all(
     config_path: Path | None,
     enable_webhook: bool,
     enable_telegram: bool,
+    workers: int | None = None,
 ) -> None:
-    """Run all configured channels."""
-    engine = create_engine(config_path)
+    """
+    Run all configured channels.
+
+    With more than one worker process, a supervisor keeps the channels and
+    routes each user's messages to one of the engine workers.
+    """
+    from safeclaw.channels.cli import CLIChannel
+    from safeclaw.core.supervisor import Supervisor, load_config_file
+
+    config = load_config_file(config_path or Path("config/config.yaml"))
+    supervisor_config = config.get("supervisor", {})
+    processes = workers if workers is not None else supervisor_config.get("processes", 1)
+
+    engine: SafeClaw | Supervisor
+    if processes > 1:
+        engine = Supervisor(
+            create_engine,
+            processes,
+            config_path=config_path,
+            virtual_nodes=supervisor_config.get("virtual_nodes", 64),
+            restart_delay=supervisor_config.get("restart_delay", 1.0),
+        )
+    else:
+        engine = create_engine(config_path)
 
     # Add CLI channel
     cli_channel = CLIChannel(engine)
@@ -160,7 +187,7 @@ async def _run_all(
 
     # Add Telegram if enabled
     if enable_telegram:
-        token = engine.config.get("telegram", {}).get("token")
+        token = config.get("telegram", {}).get("token")
         if token:
             from safeclaw.channels.telegram import TelegramChannel
             telegram_channel = TelegramChannel(engine, token)
@@ -168,7 +195,10 @@ async def _run_all(
         else:
             console.print("[yellow]Telegram token not configured[/yellow]")
 
-    await engine.start()
+    try:
+        await engine.start()
+    finally:
+        await engine.stop()
 
 
 @app.command()
@@ -185,6 +215,9 @@ def summarize(
 
 async def _summarize(target: str, sentences: int, method: str) -> None:
     """Run summarization."""
+    from safeclaw.core.crawler import Crawler
+    from safeclaw.core.summarizer import Summarizer, SummaryMethod
+
     summarizer = Summarizer()
 
     # Check if URL
@@ -233,6 +266,8 @@ async def _crawl(
     pattern: str | None,
 ) -> None:
     """Run crawler."""
+    from safeclaw.core.crawler import Crawler
+
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
 
@@ -303,6 +338,8 @@ async def _news(
     summarize: bool,
 ) -> None:
     """Run news commands."""
+    from safeclaw.core.feeds import PRESET_FEEDS, FeedReader
+
     feed_reader = FeedReader(
         summarize_items=summarize,
         max_items_per_feed=limit,
@@ -402,13 +439,16 @@ def analyze(
 
 async def _analyze(target: str, sentiment: bool, keywords: bool, readability: bool) -> None:
     """Run text analysis."""
+    from safeclaw.core.analyzer import TextAnalyzer
+    from safeclaw.core.documents import DocumentReader
+
     analyzer = TextAnalyzer()
 
     # Check if file path
     path = Path(target)
     if path.exists() and path.is_file():
         doc_reader = DocumentReader()
-        result = doc_reader.read(path)
+        result = await asyncio.to_thread(doc_reader.read, path)
         if result.error:
             console.print(f"[red]Error reading file: {result.error}[/red]")
             return
@@ -459,6 +499,9 @@ def document(
 
 async def _document(path: Path, output: Path | None, do_summarize: bool, sentences: int) -> None:
     """Read document."""
+    from safeclaw.core.documents import DocumentReader
+    from safeclaw.core.summarizer import Summarizer
+
     reader = DocumentReader()
 
     if not path.exists():
@@ -466,7 +509,7 @@ async def _document(path: Path, output: Path | None, do_summarize: bool, sentenc
         return
 
     console.print(f"[dim]Reading: {path}...[/dim]")
-    result = reader.read(path)
+    result = await asyncio.to_thread(reader.read, path)
 
     if result.error:
         console.print(f"[red]Error: {result.error}[/red]")
@@ -558,6 +601,8 @@ def blog(
 
 async def _blog(action: str, content: list[str] | None) -> None:
     """Run blog command."""
+    from safeclaw.actions.blog import BlogAction
+
     blog_action = BlogAction()
     user_id = "cli_user"
 
@@ -588,6 +633,161 @@ async def _blog(action: str, content: list[str] | None) -> None:
     console.print(result)
 
 
+@app.command()
+def compact(
+    config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
+    vacuum: bool = typer.Option(
+        False, "--vacuum", help="Rebuild the database first, enabling incremental vacuum (slow, needs free disk)"
+    ),
+    verbose: bool = typer.Option(False, "--verbose"),
+):
+    """Apply memory retention now and compact memory.db."""
+    setup_logging(verbose)
+    asyncio.run(_compact(config, vacuum))
+
+
+async def _compact(config_path: Path | None, vacuum: bool) -> None:
+    """Run memory retention and compaction once."""
+    from safeclaw.core.engine import SafeClaw
+    from safeclaw.core.retention import Compactor, RetentionPolicy
+
+    engine = SafeClaw(config_path=config_path)
+    engine.load_config()
+    compactor = Compactor(engine.memory, RetentionPolicy.from_config(engine.config.get("memory", {})))
+
+    await engine.memory.initialize()
+    try:
+        if vacuum:
+            console.print("[dim]Rebuilding memory.db...[/dim]")
+            await engine.memory.vacuum()
+        stats = await compactor.run()
+    finally:
+        await engine.memory.close()
+
+    console.print(
+        f"[green]Deleted {stats.messages} messages, {stats.crawl_cache} cached pages "
+        f"and {stats.keyvalue} expired values; freed {stats.freed_pages} pages "
+        f"in {stats.duration_ms:.0f}ms[/green]"
+    )
+
+
+debug_app = typer.Typer(help="Diagnostics and benchmarks.")
+app.add_typer(debug_app, name="debug")
+
+
+@debug_app.command("parser")
+def debug_parser(
+    rounds: int = typer.Option(3, "--rounds", "-r", help="Passes over the corpus per stage"),
+    learned: int = typer.Option(200, "--learned", help="Synthetic learned patterns for the bench user"),
+    json_output: bool = typer.Option(False, "--json", help="Print results as JSON"),
+    verbose: bool = typer.Option(False, "--verbose"),
+):
+    """Benchmark command parsing latency and throughput per stage."""
+    import json
+
+    from rich.table import Table
+
+    from safeclaw.core.benchmark import build_corpus, run_parser_benchmark
+    from safeclaw.core.parser import CommandParser
+
+    setup_logging(verbose)
+    parser = CommandParser()
+    corpus = build_corpus(parser)
+    if not json_output:
+        console.print(
+            f"[dim]Benchmarking {len(corpus['single'])} commands and "
+            f"{len(corpus['chains'])} chains x {rounds} rounds...[/dim]\n"
+        )
+
+    results = run_parser_benchmark(parser, rounds=rounds, corpus=corpus, learned_patterns=learned)
+
+    if json_output:
+        console.print_json(json.dumps([r.to_dict() for r in results]))
+        return
+
+    table = Table(title="Parser benchmark (µs per call)")
+    table.add_column("Stage")
+    table.add_column("Calls", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Calls/s", justify="right")
+    for r in results:
+        table.add_row(
+            r.name,
+            str(r.calls),
+            f"{r.p50_us:.1f}",
+            f"{r.p95_us:.1f}",
+            f"{r.p99_us:.1f}",
+            f"{r.throughput:,.0f}",
+        )
+    console.print(table)
+
+
+@debug_app.command("startup")
+def debug_startup(
+    top: int = typer.Option(20, "--top", "-n", help="Slowest modules to show"),
+    message: str = typer.Option("what can you do", "--message", "-m", help="Message to time the first reply to"),
+    config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
+    json_output: bool = typer.Option(False, "--json", help="Print results as JSON"),
+    check: bool = typer.Option(False, "--check", help="Exit with an error if a budget is exceeded"),
+):
+    """Profile CLI import time per module and time to first response."""
+    import json
+
+    from rich.table import Table
+
+    from safeclaw.core.startup import (
+        FIRST_RESPONSE_BUDGET_MS,
+        IMPORT_BUDGET_MS,
+        deferred_imports,
+        import_time_ms,
+        measure_first_response,
+        measure_imports,
+    )
+
+    timings = measure_imports()
+    import_ms = import_time_ms(timings)
+    first = measure_first_response(message, config_path=config)
+    deferred = sorted(set(deferred_imports([t.module for t in timings]) + deferred_imports(first["modules"])))
+    slowest = sorted(timings, key=lambda t: t.self_ms, reverse=True)[:top]
+    ok = import_ms <= IMPORT_BUDGET_MS and first["total_ms"] <= FIRST_RESPONSE_BUDGET_MS and not deferred
+
+    if json_output:
+        console.print_json(json.dumps({
+            "import_ms": round(import_ms, 1),
+            "first_response": {k: round(v, 1) for k, v in first.items() if k.endswith("_ms")},
+            "budgets": {"import_ms": IMPORT_BUDGET_MS, "first_response_ms": FIRST_RESPONSE_BUDGET_MS},
+            "deferred_imported": deferred,
+            "slowest": [t.to_dict() for t in slowest],
+        }))
+    else:
+        table = Table(title=f"Slowest imports for `import safeclaw.cli` ({import_ms:.0f}ms total)")
+        table.add_column("Module")
+        table.add_column("Self ms", justify="right")
+        table.add_column("Cumulative ms", justify="right")
+        for t in slowest:
+            table.add_row(t.module, f"{t.self_ms:.1f}", f"{t.cumulative_ms:.1f}")
+        console.print(table)
+
+        phases = Table(title=f"Time to first response ({message!r})")
+        phases.add_column("Phase")
+        phases.add_column("ms", justify="right")
+        for phase in ("import", "create_engine", "start", "response", "total"):
+            phases.add_row(phase, f"{first[f'{phase}_ms']:.1f}")
+        console.print(phases)
+
+        status = "[green]within budget[/green]" if ok else "[red]over budget[/red]"
+        console.print(
+            f"Budgets: import {IMPORT_BUDGET_MS}ms, first response {FIRST_RESPONSE_BUDGET_MS}ms - {status}"
+        )
+        if deferred:
+            console.print(f"[red]Imported at startup but should be deferred: {', '.join(deferred)}[/red]")
+
+    if check and not ok:
+        raise typer.Exit(1)
+
+
 @app.command()
 def init(
     path: Path = typer.Argument(Path("."), help="Directory to initialize"),
@@ -650,6 +850,87 @@ actions:
 memory:
   max_history: 1000
   retention_days: 365
+  read_connections: 4  # Read-only connections for queries, 0 to read on the writer connection
+  retention:  # Enforces max_history (per user) and retention_days
+    enabled: true
+    interval_minutes: 60
+    batch_size: 500  # Rows deleted per transaction, so other writes never wait long
+    vacuum_pages: 1000  # Free pages returned to the file system per step
+    checkpoint: passive  # WAL checkpoint after each run: passive or truncate (waits for readers)
+    archive: null  # Directory for gzipped JSONL of deleted messages, e.g. ~/.safeclaw/archive
+  message_log:  # How conversation history is written
+    durability: write_behind  # Or "sync" to commit each message before replying
+    batch_size: 100  # Messages per transaction
+    flush_ms: 200  # Max delay before queued messages are written
+
+# Command parser
+parser:
+  learned_patterns:  # Per-user cache of learned corrections
+    max_users: 1000
+    max_bytes: 16777216  # 16 MB
+    idle_seconds: 3600  # Evict users idle for an hour
+  cache:  # Memoized parse results
+    max_entries: 4096
+    ttl_seconds: 3600
+    temporal_ttl_seconds: 60  # For text with dates/times
+  intents:  # Custom intents, reloaded on change without a restart
+    file: intents.yaml  # Relative to this config file
+    watch: true
+    poll_seconds: 2
+
+# Message processing
+dispatcher:
+  workers: 8  # Jobs processed at once (one per user at a time)
+  max_queue: 1000  # Queued jobs per lane before new ones are turned away
+  max_per_user: 20  # Queued messages per user
+  interactive_target_ms: 500  # Defer lower lanes while chat latency is above this
+  drain_seconds: 30  # On shutdown, time running jobs get to finish before they are cancelled
+  lanes:  # Concurrency budgets, highest priority first
+    interactive:  # Chat messages (default: all workers)
+    scheduled:  # Reminders and other scheduled jobs
+      concurrency: 2
+    bulk:  # Webhook-triggered actions
+      concurrency: 2
+
+# Blocking and CPU-bound work
+executor:
+  threads: 8  # Pool for blocking I/O and sync action handlers
+  processes: 0  # Pool for CPU-bound work like summarization, 0 to use threads
+  timeout: 120  # Default seconds per action, 0 for no limit
+  timeouts: {}  # Per-action overrides, e.g. {summarize: 30}
+
+# Cached replies of actions that opt in (weather, news, help)
+response_cache:
+  enabled: true
+  max_entries: 1024
+  max_bytes: 16777216  # 16 MB
+  ttl: {}  # Per-action seconds, overriding the action's own, e.g. {weather: 300}; 0 disables
+
+# Tracing (OpenTelemetry spans for messages, parsing, memory, actions and HTTP)
+telemetry:
+  exporter: none  # none, console, file (JSON lines, for offline use) or otlp (pip install safeclaw[otlp])
+  file: ~/.safeclaw/traces.jsonl
+  endpoint: null  # otlp; default http://localhost:4318/v1/traces
+  service_name: safeclaw
+  sample_ratio: 1.0
+  batch:
+    max_queue_size: 2048
+    schedule_delay_ms: 5000
+    max_export_batch_size: 512
+    export_timeout_ms: 30000
+
+# Engine worker processes for `safeclaw run` (or --workers). With more
+# than one, a supervisor keeps the channels and routes each user's
+# messages to one worker by consistent hashing of the user id
+supervisor:
+  processes: 1
+  virtual_nodes: 64  # Points per worker on the hash ring
+  restart_delay: 1.0  # Seconds before restarting a worker that exited
+
+# Command chains
+chains:
+  max_concurrency: 4  # Steps of a sequence chain (a; b; c) run at once
+  step_timeout: 60  # Seconds per step, 0 for no limit
 
 # Optional API keys
 apis:
@@ -35,5 +35,11 @@ class Settings(BaseSettings):
     MCP_SERVER_NAME: str = "safeclaw-mcp"
     MCP_SERVER_PORT: int = 8000
 
+    # Tracing
+    OTEL_EXPORTER: Literal["none", "console", "file", "otlp"] = "none"
+    OTEL_EXPORTER_ENDPOINT: str | None = None  # otlp; default http://localhost:4318/v1/traces
+    OTEL_TRACES_FILE: str = "~/.safeclaw/traces.jsonl"
+    OTEL_SAMPLE_RATIO: float = 1.0
+
 
 settings = Settings()
@@ -1,32 +1,36 @@
 """Core SafeClaw components."""
 
-from safeclaw.core.analyzer import TextAnalyzer
-from safeclaw.core.documents import DocumentReader
-from safeclaw.core.engine import SafeClaw
-from safeclaw.core.memory import Memory
-from safeclaw.core.notifications import NotificationManager
-from safeclaw.core.parser import CommandParser
-from safeclaw.core.scheduler import Scheduler
+import importlib
 
-__all__ = [
-    "SafeClaw",
-    "CommandParser",
-    "Memory",
-    "Scheduler",
-    "TextAnalyzer",
-    "DocumentReader",
-    "NotificationManager",
-]
+# Components are imported on first access: several pull in heavy
+# dependencies (PyMuPDF, APScheduler, spaCy, YOLO) that most commands
+# never touch
+_LAZY = {
+    "SafeClaw": "safeclaw.core.engine",
+    "CommandParser": "safeclaw.core.parser",
+    "Memory": "safeclaw.core.memory",
+    "Scheduler": "safeclaw.core.scheduler",
+    "TextAnalyzer": "safeclaw.core.analyzer",
+    "DocumentReader": "safeclaw.core.documents",
+    "NotificationManager": "safeclaw.core.notifications",
+    # Optional ML components; their dependencies are checked on use
+    # (pip install safeclaw[nlp], safeclaw[vision])
+    "NLPProcessor": "safeclaw.core.nlp",
+    "VisionProcessor": "safeclaw.core.vision",
+    "ObjectDetector": "safeclaw.core.vision",
+    "OCRProcessor": "safeclaw.core.vision",
+}
 
-# Optional ML imports (heavy dependencies)
-try:
-    from safeclaw.core.nlp import NLPProcessor
-    __all__.append("NLPProcessor")
-except ImportError:
-    pass  # pip install safeclaw[nlp]
+__all__ = list(_LAZY)
 
-try:
-    from safeclaw.core.vision import ObjectDetector, OCRProcessor, VisionProcessor
-    __all__.extend(["VisionProcessor", "ObjectDetector", "OCRProcessor"])
-except ImportError:
-    pass  # pip install safeclaw[vision]
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,225 @@
+"""
+SafeClaw Parser Benchmarks - Latency and throughput for CommandParser.
+
+Builds a corpus from every intent example, every phrase variation, and
+synthetic chained/noisy inputs, then times:
+- parse and parse_chain end to end (with the result cache off and on)
+- each internal stage: chain tokenizing, learned patterns, phrase variations,
+  keyword/regex matching, param extraction and entity extraction
+
+Run with `safeclaw debug parser`.
+"""
+
+import random
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from safeclaw.core.parser import (
+    PHRASE_VARIATIONS,
+    CommandParser,
+    _parse_datetime,
+    tokenize_chain,
+)
+
+BENCH_USER = "bench_user"
+CHAIN_SEPARATORS = [" | ", " -> ", "; ", " and then ", " then "]
+
+
+@dataclass
+class StageResult:
+    """Timing results for one benchmarked stage."""
+    name: str
+    calls: int
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    mean_us: float
+    throughput: float  # calls per second
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "p50_us": round(self.p50_us, 2),
+            "p95_us": round(self.p95_us, 2),
+            "p99_us": round(self.p99_us, 2),
+            "mean_us": round(self.mean_us, 2),
+            "throughput": round(self.throughput, 1),
+        }
+
+
+def _add_noise(text: str, rng: random.Random) -> str:
+    """Introduce a typo, case change, or extra whitespace."""
+    choice = rng.randrange(4)
+    if choice == 0 and len(text) > 3:
+        i = rng.randrange(len(text))
+        return text[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[i + 1:]
+    if choice == 1 and len(text) > 3:
+        i = rng.randrange(len(text) - 1)
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if choice == 2:
+        return text.upper() if rng.random() < 0.5 else text.title()
+    return "  " + text.replace(" ", "  ") + " "
+
+
+def build_corpus(parser: CommandParser, seed: int = 42) -> dict[str, list[str]]:
+    """
+    Build the benchmark corpus.
+
+    Returns {"single": [...], "chains": [...]}: single commands (examples,
+    phrase variations and noisy variants) and synthetic command chains.
+    """
+    rng = random.Random(seed)
+
+    base: list[str] = []
+    for pattern in parser.intents.values():
+        base.extend(pattern.examples)
+    for phrases in PHRASE_VARIATIONS.values():
+        base.extend(phrases)
+
+    noisy = [_add_noise(text, rng) for text in base]
+
+    chains = []
+    for _ in range(max(len(base) // 2, 1)):
+        count = rng.randint(2, 3)
+        separator = rng.choice(CHAIN_SEPARATORS)
+        chains.append(separator.join(rng.choice(base) for _ in range(count)))
+
+    return {"single": base + noisy, "chains": chains}
+
+
+def _time_stage(
+    name: str,
+    func: Callable[[str], Any],
+    inputs: list[str],
+    rounds: int,
+    before_round: Callable[[], None] | None = None,
+) -> StageResult:
+    """Call func on every input for a number of rounds, recording per-call latency."""
+    samples: list[float] = []
+    total = 0.0
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        for text in inputs:
+            start = time.perf_counter()
+            func(text)
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed * 1_000_000)
+            total += elapsed
+
+    if not samples:
+        return StageResult(name, 0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = samples[0]
+
+    return StageResult(
+        name=name,
+        calls=len(samples),
+        p50_us=p50,
+        p95_us=p95,
+        p99_us=p99,
+        mean_us=statistics.fmean(samples),
+        throughput=len(samples) / total if total else 0.0,
+    )
+
+
+def run_parser_benchmark(
+    parser: CommandParser | None = None,
+    rounds: int = 3,
+    corpus: dict[str, list[str]] | None = None,
+    learned_patterns: int = 200,
+) -> list[StageResult]:
+    """
+    Benchmark the parser and each of its stages.
+
+    Args:
+        parser: Parser to benchmark (default: a fresh CommandParser)
+        rounds: Passes over the corpus per stage
+        corpus: Corpus from build_corpus (default: built from the parser)
+        learned_patterns: Synthetic learned corrections for the bench user
+
+    Returns:
+        One StageResult per stage
+    """
+    parser = parser or CommandParser()
+    corpus = corpus or build_corpus(parser)
+    single = corpus["single"]
+    chains = corpus["chains"]
+    normalized = [text.strip().lower() for text in single]
+
+    # Give the bench user a realistic set of learned corrections
+    rng = random.Random(7)
+    intents = parser.get_intents()
+    parser.learned_patterns.put(BENCH_USER, [
+        {
+            "phrase": _add_noise(rng.choice(single), rng).strip().lower(),
+            "intent": rng.choice(intents),
+            "params": None,
+            "use_count": learned_patterns - i,
+        }
+        for i in range(learned_patterns)
+    ])
+
+    # Pairs of (text, intent) for param extraction
+    matched = [(text, parser.parse(text).intent) for text in single]
+    intent_for = {text: intent for text, intent in matched if intent}
+    matched_inputs = [text for text, intent in matched if intent]
+
+    max_entries = parser.parse_cache.max_entries
+    results: list[StageResult] = []
+    try:
+        parser.parse_cache.configure(max_entries=0)
+        parser.parse_cache.clear()
+        results.append(_time_stage(
+            "parse", lambda t: parser.parse(t, BENCH_USER), single, rounds
+        ))
+        results.append(_time_stage(
+            "parse_chain", lambda t: parser.parse_chain(t, BENCH_USER), chains, rounds
+        ))
+    finally:
+        parser.parse_cache.configure(max_entries=max_entries)
+
+    parser.parse_cache.clear()
+    results.append(_time_stage(
+        "parse (cached)", lambda t: parser.parse(t, BENCH_USER), single, rounds
+    ))
+
+    results.append(_time_stage(
+        "chain_tokenize", tokenize_chain, single + chains, rounds
+    ))
+    results.append(_time_stage(
+        "learned_patterns",
+        lambda t: parser._match_learned_patterns(t, BENCH_USER),
+        normalized,
+        rounds,
+    ))
+    results.append(_time_stage(
+        "phrase_variations", parser._match_phrase_variations, normalized, rounds
+    ))
+    results.append(_time_stage(
+        "keyword_regex", parser._match_keywords, normalized, rounds
+    ))
+    results.append(_time_stage(
+        "param_extraction",
+        lambda t: parser._extract_params(t, parser.intents[intent_for[t]]),
+        matched_inputs,
+        rounds,
+    ))
+    results.append(_time_stage(
+        "entities",
+        parser._extract_entities,
+        matched_inputs,
+        rounds,
+        before_round=_parse_datetime.cache_clear,
+    ))
+
+    parser.learned_patterns.invalidate(BENCH_USER)
+    return results
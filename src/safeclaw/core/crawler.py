@@ -9,11 +9,16 @@ import ipaddress
 import logging
 import re
 import socket
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urljoin, urlparse
 
-import httpx
-from bs4 import BeautifulSoup
+from safeclaw.infra.telemetry import http_span
+
+# httpx and BeautifulSoup are imported on first fetch
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +116,9 @@ class Crawler:
     - Depth-limited crawling
     - Robots.txt respect (optional)
     - Rate limiting
+
+    HTML is parsed off the event loop with run_blocking (pass
+    engine.run_blocking from actions; defaults to asyncio.to_thread).
     """
 
     def __init__(
@@ -121,6 +129,7 @@ class Crawler:
         rate_limit: float = 1.0,
         respect_robots: bool = True,
         user_agent: str = "SafeClaw/0.1 (Privacy-first crawler)",
+        run_blocking: Callable[..., Awaitable[Any]] | None = None,
     ):
         self.max_depth = max_depth
         self.max_pages = max_pages
@@ -128,6 +137,7 @@ class Crawler:
         self.rate_limit = rate_limit
         self.respect_robots = respect_robots
         self.user_agent = user_agent
+        self._run_blocking = run_blocking or asyncio.to_thread
 
         self._visited: set[str] = set()
         self._robots_cache: dict[str, set[str]] = {}
@@ -135,12 +145,17 @@ class Crawler:
 
     MAX_REDIRECTS = 10
 
-    async def __aenter__(self):
-        self._client = httpx.AsyncClient(
+    def _new_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        return httpx.AsyncClient(
             timeout=self.timeout,
             headers={"User-Agent": self.user_agent},
             follow_redirects=False,
         )
+
+    async def __aenter__(self):
+        self._client = self._new_client()
         return self
 
     async def __aexit__(self, *args):
@@ -161,17 +176,17 @@ class Crawler:
                 return result
 
         if not self._client:
-            self._client = httpx.AsyncClient(
-                timeout=self.timeout,
-                headers={"User-Agent": self.user_agent},
-                follow_redirects=False,
-            )
+            self._client = self._new_client()
+
+        import httpx
 
         try:
             # Manually follow redirects with SSRF checks on each target
             current_url = url
             for _ in range(self.MAX_REDIRECTS):
-                response = await self._client.get(current_url)
+                with http_span("GET", current_url) as span:
+                    response = await self._client.get(current_url)
+                    span.set_attribute("http.response.status_code", response.status_code)
                 if response.status_code in (301, 302, 303, 307, 308):
                     location = response.headers.get("location")
                     if not location:
@@ -196,43 +211,7 @@ class Crawler:
                 result.error = f"HTTP {response.status_code}"
                 return result
 
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "lxml")
-
-            # Extract title
-            title_tag = soup.find("title")
-            if title_tag:
-                result.title = title_tag.get_text(strip=True)
-
-            # Remove script and style elements
-            for element in soup(["script", "style", "nav", "footer", "header"]):
-                element.decompose()
-
-            # Extract text
-            result.text = soup.get_text(separator="\n", strip=True)
-            # Clean up excessive whitespace
-            result.text = re.sub(r'\n{3,}', '\n\n', result.text)
-
-            # Extract links
-            base_url = url
-            for link in soup.find_all("a", href=True):
-                href = str(link["href"])
-                absolute_url = urljoin(base_url, href)
-                # Filter out non-http links
-                if absolute_url.startswith(("http://", "https://")):
-                    result.links.append(absolute_url)
-
-            # Deduplicate links
-            result.links = list(dict.fromkeys(result.links))
-
-            # Extract images
-            for img in soup.find_all("img", src=True):
-                src = str(img["src"])
-                absolute_url = urljoin(base_url, src)
-                if absolute_url.startswith(("http://", "https://")):
-                    result.images.append(absolute_url)
-
-            result.images = list(dict.fromkeys(result.images))
+            await self._run_blocking(self._parse_html, result, response.text)
 
         except httpx.TimeoutException:
             result.error = "Timeout"
@@ -244,6 +223,48 @@ class Crawler:
 
         return result
 
+    @staticmethod
+    def _parse_html(result: CrawlResult, html: str) -> None:
+        """Fill in a result's title, text, links and images from its HTML."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "lxml")
+
+        # Extract title
+        title_tag = soup.find("title")
+        if title_tag:
+            result.title = title_tag.get_text(strip=True)
+
+        # Remove script and style elements
+        for element in soup(["script", "style", "nav", "footer", "header"]):
+            element.decompose()
+
+        # Extract text
+        result.text = soup.get_text(separator="\n", strip=True)
+        # Clean up excessive whitespace
+        result.text = re.sub(r'\n{3,}', '\n\n', result.text)
+
+        # Extract links
+        base_url = result.url
+        for link in soup.find_all("a", href=True):
+            href = str(link["href"])
+            absolute_url = urljoin(base_url, href)
+            # Filter out non-http links
+            if absolute_url.startswith(("http://", "https://")):
+                result.links.append(absolute_url)
+
+        # Deduplicate links
+        result.links = list(dict.fromkeys(result.links))
+
+        # Extract images
+        for img in soup.find_all("img", src=True):
+            src = str(img["src"])
+            absolute_url = urljoin(base_url, src)
+            if absolute_url.startswith(("http://", "https://")):
+                result.images.append(absolute_url)
+
+        result.images = list(dict.fromkeys(result.images))
+
     async def crawl(
         self,
         start_url: str,
@@ -263,17 +284,35 @@ class Crawler:
         Returns:
             List of CrawlResults for all visited pages
         """
+        return [
+            result
+            async for result in self.iter_crawl(start_url, max_depth, same_domain, pattern)
+        ]
+
+    async def iter_crawl(
+        self,
+        start_url: str,
+        max_depth: int | None = None,
+        same_domain: bool = True,
+        pattern: str | None = None,
+    ) -> AsyncIterator[CrawlResult]:
+        """
+        Crawl like crawl(), yielding each page as soon as it is fetched.
+
+        The rate-limit delay runs after a page is yielded, so consumers can
+        process a page while the crawler waits to fetch the next one.
+        """
         max_depth = max_depth or self.max_depth
         start_domain = urlparse(start_url).netloc
 
-        results: list[CrawlResult] = []
+        pages = 0
         queue: list[tuple[str, int]] = [(start_url, 0)]
         self._visited = set()
 
         pattern_re = re.compile(pattern) if pattern else None
 
         async with self:
-            while queue and len(results) < self.max_pages:
+            while queue and pages < self.max_pages:
                 url, depth = queue.pop(0)
 
                 # Skip if already visited
@@ -296,11 +335,7 @@ class Crawler:
                 # Fetch page
                 result = await self.fetch(url)
                 result.depth = depth
-                results.append(result)
-
-                # Rate limiting
-                if self.rate_limit > 0:
-                    await asyncio.sleep(self.rate_limit)
+                pages += 1
 
                 # Add links to queue
                 if result.links and depth < max_depth:
@@ -308,7 +343,11 @@ class Crawler:
                         if link not in self._visited:
                             queue.append((link, depth + 1))
 
-        return results
+                yield result
+
+                # Rate limiting
+                if self.rate_limit > 0:
+                    await asyncio.sleep(self.rate_limit)
 
     async def get_links(
         self,
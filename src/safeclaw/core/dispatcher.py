@@ -0,0 +1,417 @@
+"""
+SafeClaw Dispatcher - Bounded, prioritized, per-user ordered processing.
+
+Channels hand every message to the engine, which queues it here instead
+of processing it inline. Scheduled jobs and webhook-triggered actions go
+through the same worker pool in their own lanes:
+- interactive: chat messages from channels (highest priority)
+- scheduled: reminders and other scheduler jobs
+- bulk: webhook-triggered actions and other background work
+
+How work is shared:
+- A fixed pool of workers bounds how much runs at once, and each lane has
+  its own concurrency budget and queue limit, so a webhook burst can't take
+  every worker or crowd chat messages out of the queue
+- Free workers always serve the highest-priority lane that has work
+- While interactive latency is above its target, lower lanes are deferred:
+  they run at most one job at a time until interactive traffic recovers
+- Work with the same key (a user id for messages) runs one at a time, in
+  arrival order; keys take turns, so one user's backlog or slow deep crawl
+  holds at most one worker while everyone else keeps being served
+- When a lane is full, new work is turned away immediately instead of
+  piling up; messages get a busy reply
+- On stop, queued work is turned away with a shutdown reply, while work
+  already running (a half-sent email) gets a grace period to finish
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import Any
+
+from safeclaw.infra.telemetry import (
+    DISPATCH_LATENCY_SECONDS,
+    DISPATCH_QUEUE_DEPTH,
+    DISPATCH_REJECTED_TOTAL,
+    DISPATCH_WAIT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+SCHEDULED = "scheduled"
+BULK = "bulk"
+
+# In priority order
+LANES = (INTERACTIVE, SCHEDULED, BULK)
+
+BUSY_REPLY = "I'm busy with other requests right now. Please try again in a moment."
+USER_BUSY_REPLY = "I'm still working on your earlier messages. Please wait for those to finish."
+SHUTDOWN_REPLY = "SafeClaw is shutting down. Please try again later."
+
+# Default concurrency budgets; None means the whole pool
+DEFAULT_CONCURRENCY: dict[str, int | None] = {INTERACTIVE: None, SCHEDULED: 2, BULK: 2}
+
+# Seconds running jobs get to finish on stop before they are cancelled
+DEFAULT_DRAIN_SECONDS = 30.0
+
+# Weight of the newest sample in the interactive latency average
+LATENCY_SMOOTHING = 0.2
+
+# Set while a worker runs a job, so nested calls (e.g. a voice command
+# re-entering the engine) run inline instead of queueing behind the job
+# that issued them
+_in_worker: ContextVar[bool] = ContextVar("safeclaw_dispatch_worker", default=False)
+
+Handler = Callable[[str, str, str, dict], Coroutine[Any, Any, str]]
+
+
+class DispatcherBusyError(Exception):
+    """Raised when a lane, or a key's share of it, is full."""
+
+    def __init__(self, lane: str, reason: str):
+        super().__init__(f"{lane} lane is full ({reason})")
+        self.lane = lane
+        self.reason = reason
+
+
+class DispatcherStoppedError(Exception):
+    """Raised for queued work when the dispatcher stops, and for running work it cancels."""
+
+
+@dataclass
+class Job:
+    """Work waiting for a worker."""
+    key: str
+    # A coroutine function; the job runs as its own task
+    run: Callable[[], Coroutine[Any, Any, Any]]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # The submitter's context (request id, current span), which the job runs in
+    context: Context = field(default_factory=copy_context)
+
+
+@dataclass
+class Lane:
+    """A priority class with its own queue and concurrency budget."""
+    name: str
+    concurrency: int | None
+    max_queue: int
+    # Pending jobs per key; a key is present while queued or running
+    pending: dict[str, deque[Job]] = field(default_factory=dict)
+    # Keys with pending jobs that aren't running, in turn order
+    ready: deque[str] = field(default_factory=deque)
+    size: int = 0
+    running: int = 0
+
+
+class Dispatcher:
+    """
+    Prioritized worker pool with per-key ordering and bounded lanes.
+
+    Each key has a FIFO of pending jobs. A key with pending jobs is placed
+    on its lane's ready queue; a worker takes the key, runs its oldest job,
+    and puts it back at the end of the ready queue if more are waiting. A
+    key is never on the ready queue and in a worker at the same time, which
+    keeps its jobs in order.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        workers: int = 8,
+        max_queue: int = 1000,
+        max_per_user: int = 20,
+        interactive_target_ms: float = 500,
+        drain_seconds: float = DEFAULT_DRAIN_SECONDS,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_per_user = max_per_user
+        self.interactive_target_ms = interactive_target_ms
+        self.drain_seconds = drain_seconds
+        self.lanes = {
+            name: Lane(name=name, concurrency=DEFAULT_CONCURRENCY[name], max_queue=max_queue)
+            for name in LANES
+        }
+        self._changed = asyncio.Condition()
+        self._tasks: list[asyncio.Task] = []
+        # Set while stop() lets running jobs finish
+        self._draining = False
+        # Smoothed queue-to-reply time of interactive messages, in seconds
+        self.interactive_latency = 0.0
+        self.rejected = 0
+
+    def configure(
+        self,
+        workers: int | None = None,
+        max_queue: int | None = None,
+        max_per_user: int | None = None,
+        lanes: dict[str, dict[str, int]] | None = None,
+        interactive_target_ms: float | None = None,
+        drain_seconds: float | None = None,
+    ) -> None:
+        """
+        Update pool size, lane budgets and queue limits.
+
+        Lanes map a lane name to {"concurrency": n, "max_queue": n}; max_queue
+        is the default limit for every lane. The pool size takes effect on
+        the next start().
+        """
+        if workers is not None:
+            self.workers = max(1, workers)
+        if max_queue is not None:
+            for lane in self.lanes.values():
+                lane.max_queue = max_queue
+        if max_per_user is not None:
+            self.max_per_user = max_per_user
+        if interactive_target_ms is not None:
+            self.interactive_target_ms = interactive_target_ms
+        if drain_seconds is not None:
+            self.drain_seconds = max(0.0, drain_seconds)
+        for name, settings in (lanes or {}).items():
+            if name not in self.lanes:
+                raise ValueError(f"Unknown lane '{name}', expected one of {LANES}")
+            lane = self.lanes[name]
+            settings = settings or {}
+            if settings.get("concurrency") is not None:
+                lane.concurrency = max(1, settings["concurrency"])
+            if settings.get("max_queue") is not None:
+                lane.max_queue = settings["max_queue"]
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def degraded(self) -> bool:
+        """True while interactive messages are in flight and slower than the target."""
+        lane = self.lanes[INTERACTIVE]
+        return (
+            self.interactive_latency * 1000 > self.interactive_target_ms
+            and bool(lane.size or lane.running)
+        )
+
+    def __len__(self) -> int:
+        """Number of jobs waiting for a worker, across all lanes."""
+        return sum(lane.size for lane in self.lanes.values())
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "queued": len(self),
+            "workers": len(self._tasks),
+            "rejected": self.rejected,
+            "interactive_latency_ms": round(self.interactive_latency * 1000, 1),
+            "degraded": self.degraded,
+            "lanes": {
+                lane.name: {
+                    "queued": lane.size,
+                    "running": lane.running,
+                    "concurrency": lane.concurrency,
+                    "keys": len(lane.pending),
+                }
+                for lane in self.lanes.values()
+            },
+        }
+
+    async def submit(
+        self,
+        text: str,
+        channel: str,
+        user_id: str,
+        metadata: dict | None = None,
+        lane: str = INTERACTIVE,
+    ) -> str:
+        """
+        Queue a message and wait for its reply.
+
+        Returns a busy reply right away if the lane or the user's share of
+        it is full.
+        """
+        metadata = metadata or {}
+        try:
+            return await self.run(
+                user_id,
+                lambda: self.handler(text, channel, user_id, metadata),
+                lane=lane,
+            )
+        except DispatcherBusyError as e:
+            return USER_BUSY_REPLY if e.reason == "key_limit" else BUSY_REPLY
+        except DispatcherStoppedError:
+            return SHUTDOWN_REPLY
+
+    async def run(
+        self, key: str, func: Callable[[], Coroutine[Any, Any, Any]], lane: str = INTERACTIVE
+    ) -> Any:
+        """
+        Queue func in a lane and return its result.
+
+        Jobs with the same key run in order. Calls made while not running,
+        or from inside a worker, run inline.
+
+        Raises:
+            DispatcherBusyError: The lane or the key's share of it is full
+            DispatcherStoppedError: The dispatcher stopped before the job ran,
+                or cancelled it after the drain timeout
+        """
+        if _in_worker.get():
+            return await func()
+        if not self.running and not self._draining:
+            return await func()
+
+        target = self.lanes[lane]
+        job = Job(key=key, run=func, future=asyncio.get_running_loop().create_future())
+        async with self._changed:
+            # Checked under the lock: a worker may finish the key's last job
+            # (and drop its entry) while we wait for it
+            if self._draining:
+                raise DispatcherStoppedError()
+            waiting = target.pending.get(key)
+            if waiting is not None and len(waiting) >= self.max_per_user:
+                self._reject(target, "key_limit", key)
+            if target.size >= target.max_queue:
+                self._reject(target, "queue_full", key)
+            if waiting is None:
+                # Not queued or running: give the key a turn
+                target.pending[key] = deque([job])
+                target.ready.append(key)
+            else:
+                waiting.append(job)
+            target.size += 1
+            DISPATCH_QUEUE_DEPTH.labels(lane=lane).set(target.size)
+            self._changed.notify()
+        return await job.future
+
+    def _reject(self, lane: Lane, reason: str, key: str) -> None:
+        self.rejected += 1
+        DISPATCH_REJECTED_TOTAL.labels(lane=lane.name, reason=reason).inc()
+        logger.warning(f"Rejected {lane.name} job for {key}: {reason} ({lane.size} queued)")
+        raise DispatcherBusyError(lane.name, reason)
+
+    def _next_lane(self) -> Lane | None:
+        """Return the highest-priority lane with a job it may start now."""
+        degraded = self.degraded
+        for lane in self.lanes.values():
+            limit = lane.concurrency or self.workers
+            if degraded and lane.name != INTERACTIVE:
+                limit = 1
+            if lane.ready and lane.running < limit:
+                return lane
+        return None
+
+    async def start(self) -> None:
+        """Start the worker pool."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"safeclaw-worker-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def stop(self, drain_seconds: float | None = None) -> None:
+        """
+        Stop the workers.
+
+        Queued jobs fail with DispatcherStoppedError right away, as does new
+        work. Running jobs get drain_seconds (default: the configured
+        value) to finish; any still running after that are cancelled.
+        """
+        if not self._tasks:
+            return
+        timeout = self.drain_seconds if drain_seconds is None else drain_seconds
+
+        async with self._changed:
+            self._draining = True
+            for lane in self.lanes.values():
+                for waiting in lane.pending.values():
+                    for job in waiting:
+                        if not job.future.done():
+                            job.future.set_exception(DispatcherStoppedError())
+                    # Running keys keep their entry until their worker is done
+                    waiting.clear()
+                lane.ready.clear()
+                lane.size = 0
+                DISPATCH_QUEUE_DEPTH.labels(lane=lane.name).set(0)
+            # Idle workers exit; busy ones exit after their current job
+            self._changed.notify_all()
+
+        tasks = self._tasks
+        try:
+            _, unfinished = await asyncio.wait(tasks, timeout=timeout)
+            if unfinished:
+                logger.warning(f"Cancelling {len(unfinished)} jobs still running after {timeout}s")
+            for task in unfinished:
+                task.cancel()
+            for task in unfinished:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        finally:
+            self._tasks = []
+            self._draining = False
+            for lane in self.lanes.values():
+                lane.pending.clear()
+                lane.running = 0
+
+    async def _worker(self) -> None:
+        """Serve ready keys one job at a time, highest-priority lane first."""
+        while True:
+            async with self._changed:
+                ready = await self._changed.wait_for(lambda: self._draining or self._next_lane())
+                if not isinstance(ready, Lane):
+                    # Draining: finished the last job
+                    return
+                lane = ready
+                key = lane.ready.popleft()
+                waiting = lane.pending[key]
+                job = waiting.popleft()
+                lane.size -= 1
+                lane.running += 1
+                DISPATCH_QUEUE_DEPTH.labels(lane=lane.name).set(lane.size)
+
+            try:
+                await self._process(lane, job)
+            finally:
+                await self._finish(lane, key, waiting)
+
+    async def _finish(self, lane: Lane, key: str, waiting: deque[Job]) -> None:
+        """Give the key another turn if it has more jobs, under the lock."""
+        async with self._changed:
+            lane.running -= 1
+            if waiting:
+                lane.ready.append(key)
+            else:
+                lane.pending.pop(key, None)
+            self._changed.notify_all()
+
+    async def _process(self, lane: Lane, job: Job) -> None:
+        """Run one job and deliver its result."""
+        started = time.monotonic()
+        DISPATCH_WAIT_SECONDS.labels(lane=lane.name).observe(started - job.enqueued_at)
+        if job.future.done():
+            # The caller stopped waiting (e.g. the channel disconnected)
+            return
+
+        job.context.run(_in_worker.set, True)
+        try:
+            result: Any = await asyncio.create_task(job.run(), context=job.context)
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.set_exception(DispatcherStoppedError())
+            raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        finally:
+            latency = time.monotonic() - job.enqueued_at
+            DISPATCH_LATENCY_SECONDS.labels(lane=lane.name).observe(latency)
+            if lane.name == INTERACTIVE:
+                self.interactive_latency += LATENCY_SMOOTHING * (latency - self.interactive_latency)
+
+        if not job.future.done():
+            job.future.set_result(result)
@@ -12,28 +12,16 @@ Supports:
 import logging
 import re
 from dataclasses import dataclass
+from importlib.util import find_spec
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
-# Try imports
-try:
-    import fitz  # PyMuPDF
-    HAS_PYMUPDF = True
-except ImportError:
-    HAS_PYMUPDF = False
-
-try:
-    from docx import Document as DocxDocument
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
-
-try:
-    from bs4 import BeautifulSoup
-    HAS_BS4 = True
-except ImportError:
-    HAS_BS4 = False
+# Check what's installed without importing it; the parsers are imported
+# when a document of their format is read
+HAS_PYMUPDF = find_spec("fitz") is not None
+HAS_DOCX = find_spec("docx") is not None
+HAS_BS4 = find_spec("bs4") is not None
 
 
 @dataclass
@@ -190,6 +178,8 @@ class DocumentReader:
                 error="PyMuPDF not installed. Run: pip install pymupdf",
             )
 
+        import fitz  # PyMuPDF
+
         doc = fitz.open(path)
         text_parts = []
         page_count = len(doc)
@@ -232,6 +222,8 @@ class DocumentReader:
                 error="python-docx not installed. Run: pip install python-docx",
             )
 
+        from docx import Document as DocxDocument
+
         doc = DocxDocument(str(path))
         text_parts = []
 
@@ -287,6 +279,8 @@ class DocumentReader:
         with open(path, encoding='utf-8', errors='ignore') as f:
             content = f.read()
 
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(content, 'html.parser')
 
         # Get title
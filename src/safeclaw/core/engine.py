@@ -12,12 +12,58 @@ from typing import Any
 
 import yaml  # type: ignore
 
+from safeclaw.actions.base import ActionResult, BaseAction
+from safeclaw.core.dispatcher import (
+    BULK,
+    INTERACTIVE,
+    SCHEDULED,
+    Dispatcher,
+    DispatcherBusyError,
+)
+from safeclaw.core.executor import ActionPolicy, ActionTimeoutError, Executor
+from safeclaw.core.intents import IntentsLoader
 from safeclaw.core.memory import Memory
-from safeclaw.core.parser import CommandParser
+from safeclaw.core.parser import CommandChain, CommandParser, ParsedCommand
+from safeclaw.core.registry import LazyAction
+from safeclaw.core.response_cache import ResponseCache, make_cache_key
+from safeclaw.core.retention import COMPACTION_JOB, Compactor, RetentionPolicy
 from safeclaw.core.scheduler import Scheduler
+from safeclaw.infra.telemetry import (
+    ACTION_TIMEOUTS_TOTAL,
+    configure_telemetry,
+    request_scope,
+    shutdown_telemetry,
+    start_span,
+    traced,
+)
 
 logger = logging.getLogger(__name__)
 
+# Items buffered between the steps of a streaming pipe
+STREAM_BUFFER = 8
+
+# Marks the end of a step's output in a streaming pipe
+_END = object()
+
+
+def _to_action_result(value: Any) -> ActionResult:
+    """Normalize an action's reply (a string or ActionResult) to an ActionResult."""
+    if isinstance(value, ActionResult):
+        return value
+    return ActionResult(text=value)
+
+
+def _chain_step_span(index: int, action: str, chain_type: str | None) -> Any:
+    """Span for one step of a command chain."""
+    return start_span(
+        "safeclaw.chain_step",
+        attributes={
+            "safeclaw.chain.index": index,
+            "safeclaw.chain.type": chain_type or "none",
+            "safeclaw.action": action,
+        },
+    )
+
 
 class SafeClaw:
     """
@@ -43,15 +89,26 @@ class SafeClaw:
         self.config: dict[str, Any] = {}
         self.channels: dict[str, Any] = {}
         self.actions: dict[str, Callable] = {}
+        self.action_streams: dict[str, Callable] = {}
+        self.action_policies: dict[str, ActionPolicy] = {}
         self.running = False
 
         # Core components
-        self.parser = CommandParser()
         self.memory = Memory(self.data_dir / "memory.db")
+        self.parser = CommandParser(memory=self.memory)
+        self.custom_intents = IntentsLoader(self.parser, self.config_path.parent / "intents.yaml")
         self.scheduler = Scheduler()
-
-        # Event queue for async message processing
-        self._message_queue: asyncio.Queue = asyncio.Queue()
+        self.executor = Executor()
+        self.response_cache = ResponseCache()
+        # Parser intents version the cached replies were made with
+        self._cached_intents_version = self.parser.intents_version
+        self.compactor = Compactor(self.memory)
+
+        # Prioritized, per-user ordered worker pool for messages and jobs
+        self._message_queue = Dispatcher(self._process_message)
+        self.scheduler.runner = self._run_scheduled
+        self._webhook_tasks: set[asyncio.Task] = set()
+        self._tracing = False
 
     def load_config(self) -> None:
         """Load configuration from YAML file."""
@@ -86,37 +143,241 @@ class SafeClaw:
             },
         }
 
+    def _configure_memory(self) -> None:
+        """Apply message logging and read pool settings from config."""
+        memory_config = self.config.get("memory", {})
+        log_config = memory_config.get("message_log", {})
+        self.memory.configure(
+            durability=log_config.get("durability"),
+            batch_size=log_config.get("batch_size"),
+            flush_ms=log_config.get("flush_ms"),
+            max_pending=log_config.get("max_pending"),
+            read_connections=memory_config.get("read_connections"),
+        )
+
+    def _configure_retention(self) -> None:
+        """Schedule memory retention and compaction from config."""
+        memory_config = self.config.get("memory", {})
+        self.compactor.policy = RetentionPolicy.from_config(memory_config)
+        retention_config = memory_config.get("retention", {})
+        if retention_config.get("enabled", True):
+            self.scheduler.add_interval(
+                COMPACTION_JOB,
+                self.compactor.run,
+                minutes=retention_config.get("interval_minutes", 60),
+            )
+
+    def _configure_executor(self) -> None:
+        """Apply executor pool settings from config."""
+        executor_config = self.config.get("executor", {})
+        self.executor.configure(
+            threads=executor_config.get("threads"),
+            processes=executor_config.get("processes"),
+        )
+
+    def _configure_response_cache(self) -> None:
+        """Apply response cache limits from config."""
+        cache_config = self.config.get("response_cache", {})
+        self.response_cache.configure(
+            max_entries=cache_config.get("max_entries"),
+            max_bytes=cache_config.get("max_bytes"),
+        )
+
+    def _configure_telemetry(self) -> None:
+        """Start span export if a tracing exporter is configured."""
+        if self._tracing:
+            return
+        telemetry_config = self.config.get("telemetry", {})
+        self._tracing = configure_telemetry(
+            exporter=telemetry_config.get("exporter", "none"),
+            endpoint=telemetry_config.get("endpoint"),
+            file_path=telemetry_config.get("file"),
+            service_name=telemetry_config.get("service_name", "safeclaw"),
+            sample_ratio=telemetry_config.get("sample_ratio", 1.0),
+            batch=telemetry_config.get("batch"),
+        )
+
+    def _configure_dispatcher(self) -> None:
+        """Apply worker pool settings from config."""
+        dispatch_config = self.config.get("dispatcher", {})
+        self._message_queue.configure(
+            workers=dispatch_config.get("workers"),
+            max_queue=dispatch_config.get("max_queue"),
+            max_per_user=dispatch_config.get("max_per_user"),
+            lanes=dispatch_config.get("lanes"),
+            interactive_target_ms=dispatch_config.get("interactive_target_ms"),
+            drain_seconds=dispatch_config.get("drain_seconds"),
+        )
+
+    def _configure_parser(self) -> None:
+        """Apply parser settings from config."""
+        parser_config = self.config.get("parser", {})
+
+        learned_config = parser_config.get("learned_patterns", {})
+        self.parser.learned_patterns.configure(
+            max_users=learned_config.get("max_users"),
+            max_bytes=learned_config.get("max_bytes"),
+            idle_seconds=learned_config.get("idle_seconds"),
+        )
+
+        cache_config = parser_config.get("cache", {})
+        self.parser.parse_cache.configure(
+            max_entries=cache_config.get("max_entries"),
+            ttl_seconds=cache_config.get("ttl_seconds"),
+            temporal_ttl_seconds=cache_config.get("temporal_ttl_seconds"),
+        )
+
+        intents_config = parser_config.get("intents", {})
+        intents_file = intents_config.get("file")
+        self.custom_intents.configure(
+            path=self.config_path.parent / intents_file if intents_file else None,
+            poll_seconds=intents_config.get("poll_seconds"),
+        )
+
     def register_channel(self, name: str, channel: Any) -> None:
         """Register a communication channel."""
         self.channels[name] = channel
         logger.info(f"Registered channel: {name}")
 
-    def register_action(self, name: str, handler: Callable) -> None:
-        """Register an action handler."""
+    def register_action(
+        self,
+        name: str,
+        handler: Callable,
+        stream: Callable | None = None,
+        workload: str | None = None,
+        timeout: float | None = None,
+        cache_ttl: float | None = None,
+        cache_key: tuple[str, ...] | None = None,
+        cache_per_user: bool | None = None,
+    ) -> None:
+        """
+        Register an action handler.
+
+        Args:
+            name: Action name
+            handler: Called with (params, user_id, channel, engine), returns the reply
+            stream: Optional async generator with the same signature, used in
+                pipe chains to pass items downstream as they are produced
+            workload: "io" or "cpu", for sync handlers run off the event loop
+                (default: the action's declared workload, else "io"). Sync
+                "cpu" handlers sent to the process pool get engine=None,
+                since the engine can't be pickled
+            timeout: Seconds before the action is abandoned (default: the
+                action's declared timeout, else executor.timeout)
+            cache_ttl: Seconds to cache replies, None to not cache
+            cache_key: Params that identify a cached reply
+            cache_per_user: Whether cached replies differ per user (default True)
+
+        The defaults for the cache settings are also taken from the action's
+        declaration, when the handler is a BaseAction method.
+        """
+        policy = ActionPolicy()
+        owner = getattr(handler, "__self__", None)
+        declared = owner.action_class if isinstance(owner, LazyAction) else owner
+        if owner is not None and (
+            isinstance(declared, BaseAction)
+            or (isinstance(declared, type) and issubclass(declared, BaseAction))
+        ):
+            policy = ActionPolicy(
+                workload=declared.workload,
+                timeout=declared.timeout,
+                cache_ttl=declared.cache_ttl,
+                cache_key=tuple(declared.cache_key),
+                cache_per_user=declared.cache_per_user,
+                should_cache=owner.should_cache,
+            )
+        if workload is not None:
+            policy.workload = workload
+        if timeout is not None:
+            policy.timeout = timeout
+        if cache_ttl is not None:
+            policy.cache_ttl = cache_ttl
+        if cache_key is not None:
+            policy.cache_key = tuple(cache_key)
+        if cache_per_user is not None:
+            policy.cache_per_user = cache_per_user
+
         self.actions[name] = handler
+        self.action_policies[name] = policy
+        # Cached replies may be stale now (e.g. help lists the actions)
+        self.response_cache.invalidate()
+        if stream is not None:
+            self.action_streams[name] = stream
+        else:
+            self.action_streams.pop(name, None)
         logger.info(f"Registered action: {name}")
 
+    def register_lazy_action(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        stream: bool = False,
+        **options: Any,
+    ) -> LazyAction:
+        """
+        Register an action that is built on first use.
+
+        Args:
+            name: Action name
+            factory: Builds the action (an object with execute(), and stream()
+                if stream is set). Pass the action class itself so its
+                declared workload, timeout and cache settings apply.
+            stream: Whether to register the action's stream() for pipe chains
+            **options: Same as register_action (workload, timeout, cache_*)
+        """
+        lazy = LazyAction(name, factory)
+        self.register_action(name, lazy.execute, stream=lazy.stream if stream else None, **options)
+        return lazy
+
     async def handle_message(
         self,
         text: str,
         channel: str,
         user_id: str,
         metadata: dict | None = None,
+        lane: str = INTERACTIVE,
     ) -> str:
         """
         Process an incoming message and return a response.
 
-        This is the main entry point for all channels.
-        Supports command chaining with pipes (|) and sequences (;, "and then").
+        This is the main entry point for all channels. While the engine is
+        running, messages go through the worker pool: each user's messages
+        are handled in order, and a busy reply is returned when the lane
+        is full. Background senders can pass a lower-priority lane.
+
+        The message is handled under metadata["request_id"] if the channel
+        passes one; it's attached to spans, logs and audit events.
         """
         metadata = metadata or {}
+        with request_scope(metadata.get("request_id")) as request_id:
+            with start_span(
+                "safeclaw.handle_message",
+                attributes={"safeclaw.channel": channel, "safeclaw.lane": lane, "safeclaw.request_id": request_id},
+            ):
+                return await self._message_queue.submit(text, channel, user_id, metadata, lane=lane)
+
+    @traced("safeclaw.process_message")
+    async def _process_message(
+        self,
+        text: str,
+        channel: str,
+        user_id: str,
+        metadata: dict,
+    ) -> str:
+        """
+        Parse and execute a message.
 
-        # Check for command chains
-        if self.parser.is_chain(text):
-            return await self._handle_chain(text, channel, user_id, metadata)
+        Supports command chaining with pipes (|) and sequences (;, "and then").
+        """
+        # Load the user's learned corrections on their first message
+        await self.parser.ensure_user_patterns(user_id)
 
-        # Parse the command
-        parsed = self.parser.parse(text, user_id)
+        # Parse the command, splitting chains in the same pass
+        chain = self.parser.parse_chain(text, user_id)
+        if len(chain.commands) > 1:
+            return await self._handle_chain(chain, channel, user_id, metadata)
+
+        parsed = chain.commands[0]
         logger.debug(f"Parsed command: {parsed}")
 
         # Store in memory
@@ -129,18 +390,20 @@ class SafeClaw:
         )
 
         # Execute the action
-        if parsed.intent and parsed.intent in self.actions:
+        resolved = self._resolve_action(parsed)
+        if resolved:
+            action, params = resolved
             try:
                 # Include raw input text in params for actions that need it
-                params_with_raw = dict(parsed.params)
+                params_with_raw = dict(params)
                 params_with_raw["raw_input"] = text
                 result = await self._execute_action(
-                    action=parsed.intent,
+                    action=action,
                     params=params_with_raw,
                     user_id=user_id,
                     channel=channel,
                 )
-                return result
+                return result.text
             except Exception as e:
                 logger.error(f"Action failed: {e}")
                 return f"Sorry, that action failed: {e}"
@@ -153,76 +416,245 @@ class SafeClaw:
 
     async def _handle_chain(
         self,
-        text: str,
+        chain: CommandChain,
         channel: str,
         user_id: str,
         metadata: dict,
     ) -> str:
         """
-        Execute a chain of commands.
+        Execute a parsed chain of commands.
 
         For pipes (|, ->): passes output from one command to the next
-        For sequences (;, "and then"): runs commands independently
+        For sequences (;, "and then"): runs commands independently and concurrently
         """
-        chain = self.parser.parse_chain(text, user_id)
         logger.info(f"Executing command chain: {len(chain.commands)} commands ({chain.chain_type})")
 
+        # Store each command in memory, in chain order
+        await self.memory.store_messages([
+            {
+                "user_id": user_id,
+                "channel": channel,
+                "text": cmd.raw_text,
+                "parsed": cmd,
+                "metadata": {**metadata, "chain_index": i, "chain_type": chain.chain_type},
+            }
+            for i, cmd in enumerate(chain.commands)
+        ])
+
+        if chain.chain_type == "pipe":
+            steps = self._streaming_steps(chain)
+            if steps is not None:
+                return await self._run_streaming_pipe(steps, channel, user_id)
+            results = await self._run_pipe(chain, channel, user_id)
+            # For pipes, return only the final result
+            return results[-1] if results else "No output"
+
+        # For sequences, return all results
+        results = await self._run_sequence(chain, channel, user_id)
+        if len(results) == 1:
+            return results[0]
+        return "\n\n---\n\n".join(results)
+
+    async def _run_pipe(self, chain: CommandChain, channel: str, user_id: str) -> list[str]:
+        """
+        Run piped commands in order, feeding each output to the next command.
+
+        The next command gets the previous reply text and, if the action
+        returned one, its structured artifact (see ActionResult).
+        """
         results: list[str] = []
-        previous_output: str | None = None
+        previous: ActionResult | None = None
 
         for i, cmd in enumerate(chain.commands):
-            # Store each command in memory
-            await self.memory.store_message(
-                user_id=user_id,
-                channel=channel,
-                text=cmd.raw_text,
-                parsed=cmd,
-                metadata={**metadata, "chain_index": i, "chain_type": chain.chain_type},
-            )
-
             if not cmd.intent:
                 results.append(f"[{i+1}] Could not understand: {cmd.raw_text}")
                 continue
 
-            if cmd.intent not in self.actions:
+            resolved = self._resolve_action(cmd)
+            if not resolved:
                 results.append(f"[{i+1}] Unknown action: {cmd.intent}")
                 continue
 
             try:
-                # For piped commands, inject previous output
-                params = dict(cmd.params)
-                if chain.chain_type == "pipe" and previous_output and cmd.use_previous_output:
-                    # Add previous output as input for this command
-                    params["_previous_output"] = previous_output
-                    # If no target specified, use previous output as target
-                    if params.get("_use_previous") or not params.get("target"):
-                        params["target"] = previous_output
-
-                result = await self._execute_action(
-                    action=cmd.intent,
-                    params=params,
-                    user_id=user_id,
-                    channel=channel,
-                )
-                previous_output = result
-                results.append(result)
+                action, params = resolved
+                params = self._pipe_params(cmd, params, previous)
+                with _chain_step_span(i, action, chain.chain_type):
+                    result = await self._execute_action(
+                        action=action,
+                        params=params,
+                        user_id=user_id,
+                        channel=channel,
+                    )
+                previous = result
+                results.append(result.text)
 
             except Exception as e:
                 logger.error(f"Chain action {i+1} failed: {e}")
                 results.append(f"[{i+1}] Failed: {e}")
                 # For pipes, stop on error
-                if chain.chain_type == "pipe":
-                    break
+                break
 
-        # Format output based on chain type
-        if chain.chain_type == "pipe":
-            # For pipes, return only the final result
-            return results[-1] if results else "No output"
-        else:
-            # For sequences, return all results
-            if len(results) == 1:
-                return results[0]
-            return "\n\n---\n\n".join(results)
+        return results
+
+    @staticmethod
+    def _pipe_params(
+        cmd: ParsedCommand,
+        params: dict[str, Any],
+        previous: ActionResult | None,
+    ) -> dict[str, Any]:
+        """Params for a pipe step, with the previous step's output injected."""
+        params = dict(params)
+        if previous and cmd.use_previous_output:
+            # Add previous output as input for this command
+            params["_previous_output"] = previous.text
+            if previous.artifact is not None:
+                params["_previous_artifact"] = previous.artifact
+            # If no target specified, use previous output as target
+            if params.get("_use_previous") or not params.get("target"):
+                params["target"] = previous.text
+        return params
+
+    def _streaming_steps(
+        self, chain: CommandChain
+    ) -> list[tuple[ParsedCommand, str, dict[str, Any]]] | None:
+        """
+        Resolve a pipe's steps for streaming.
+
+        Returns (command, action, params) per step if every step maps to an
+        action and at least one step streams, otherwise None.
+        """
+        steps = []
+        for cmd in chain.commands:
+            resolved = self._resolve_action(cmd)
+            if resolved is None:
+                return None
+            steps.append((cmd, *resolved))
+        if not any(action in self.action_streams for _, action, _ in steps):
+            return None
+        return steps
+
+    async def _run_streaming_pipe(
+        self,
+        steps: list[tuple[ParsedCommand, str, dict[str, Any]]],
+        channel: str,
+        user_id: str,
+    ) -> str:
+        """
+        Run a pipe item by item, with every step running at once.
+
+        Steps are tasks joined by bounded queues. Each item a step yields
+        goes to the next step right away, so a depth-2 crawl piped into
+        summarize starts summarizing after the first page, while the
+        crawler waits out its rate limit. Steps without a stream run once
+        per incoming item. Returns the last step's outputs in order. On
+        failure, returns the outputs so far and the error.
+        """
+        queues: list[asyncio.Queue] = [asyncio.Queue(maxsize=STREAM_BUFFER) for _ in steps]
+        outputs: list[str] = []
+        failures: list[str] = []
+
+        async def emit(action: str, params: dict[str, Any], outbox: asyncio.Queue) -> None:
+            stream = self.action_streams.get(action)
+            if stream is None:
+                await outbox.put(await self._execute_action(action, params, user_id, channel))
+                return
+            async for item in stream(params=params, user_id=user_id, channel=channel, engine=self):
+                await outbox.put(_to_action_result(item))
+
+        async def run_step(i: int, cmd: ParsedCommand, action: str, params: dict[str, Any]) -> None:
+            outbox = queues[i]
+            try:
+                with _chain_step_span(i, action, "pipe"):
+                    if i == 0:
+                        await emit(action, params, outbox)
+                    else:
+                        inbox = queues[i - 1]
+                        while (previous := await inbox.get()) is not _END:
+                            await emit(action, self._pipe_params(cmd, params, previous), outbox)
+            except Exception as e:
+                logger.error(f"Chain action {i+1} failed: {e}")
+                failures.append(f"[{i+1}] Failed: {e}")
+                raise
+            await outbox.put(_END)
+
+        async def collect() -> None:
+            while (result := await queues[-1].get()) is not _END:
+                outputs.append(result.text)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for i, (cmd, action, params) in enumerate(steps):
+                    group.create_task(run_step(i, cmd, action, params))
+                group.create_task(collect())
+        except* Exception:
+            outputs.extend(failures)
+
+        return "\n\n".join(outputs) if outputs else "No output"
+
+    async def _run_sequence(self, chain: CommandChain, channel: str, user_id: str) -> list[str]:
+        """
+        Run independent commands concurrently.
+
+        At most chains.max_concurrency steps run at once, each limited to
+        chains.step_timeout seconds. Results keep the chain's order, and a
+        failing or timed-out step doesn't affect the others.
+        """
+        chains_config = self.config.get("chains", {})
+        semaphore = asyncio.Semaphore(max(1, chains_config.get("max_concurrency", 4)))
+        timeout = chains_config.get("step_timeout", 60) or None
+
+        results: list[str] = [""] * len(chain.commands)
+
+        async def run_step(i: int, action: str, params: dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    with _chain_step_span(i, action, chain.chain_type):
+                        async with asyncio.timeout(timeout):
+                            result = await self._execute_action(
+                                action=action,
+                                params=params,
+                                user_id=user_id,
+                                channel=channel,
+                            )
+                    results[i] = result.text
+                except TimeoutError:
+                    logger.error(f"Chain action {i+1} timed out after {timeout}s")
+                    results[i] = f"[{i+1}] Timed out after {timeout}s"
+                except Exception as e:
+                    logger.error(f"Chain action {i+1} failed: {e}")
+                    results[i] = f"[{i+1}] Failed: {e}"
+
+        async with asyncio.TaskGroup() as group:
+            for i, cmd in enumerate(chain.commands):
+                if not cmd.intent:
+                    results[i] = f"[{i+1}] Could not understand: {cmd.raw_text}"
+                    continue
+
+                resolved = self._resolve_action(cmd)
+                if not resolved:
+                    results[i] = f"[{i+1}] Unknown action: {cmd.intent}"
+                    continue
+
+                group.create_task(run_step(i, *resolved))
+
+        return results
+
+    def _resolve_action(self, parsed: ParsedCommand) -> tuple[str, dict[str, Any]] | None:
+        """
+        Map a parsed command to a registered action and its params.
+
+        Built-in intents map to the action of the same name. Custom intents
+        from intents.yaml name their action and default params.
+        """
+        if not parsed.intent:
+            return None
+        if parsed.intent in self.actions:
+            return (parsed.intent, dict(parsed.params))
+
+        custom = self.custom_intents.get(parsed.intent)
+        if custom and custom.action in self.actions:
+            return (custom.action, {**custom.params, **parsed.params})
+        return None
 
     async def _execute_action(
         self,
@@ -230,15 +662,152 @@ class SafeClaw:
         params: dict[str, Any],
         user_id: str,
         channel: str,
-    ) -> str:
-        """Execute a registered action."""
+    ) -> ActionResult:
+        """
+        Execute a registered action, normalizing its reply to an ActionResult.
+
+        Replies of actions that opt into caching are served from the
+        response cache when possible. Sync handlers run on the executor so
+        they can't block the event loop. Raises ActionTimeoutError if the
+        action runs past its timeout.
+        """
+        policy = self.action_policies.get(action, ActionPolicy())
+        with start_span(
+            "safeclaw.action",
+            attributes={"safeclaw.action": action, "safeclaw.channel": channel},
+        ):
+            ttl = self._cache_ttl(action, policy, params)
+            if not ttl:
+                return await self._run_action(action, policy, params, user_id, channel)
+            self._drop_replies_for_old_intents()
+
+            key = make_cache_key(
+                action, params, policy.cache_key, user_id if policy.cache_per_user else None
+            )
+            return await self.response_cache.get_or_run(
+                key, ttl, lambda: self._run_action(action, policy, params, user_id, channel)
+            )
+
+    def _drop_replies_for_old_intents(self) -> None:
+        """
+        Drop cached replies if intents changed since they were made.
+
+        Plugins and intents.yaml reloads change intents through the parser,
+        not register_action, and replies such as help list them.
+        """
+        if self._cached_intents_version != self.parser.intents_version:
+            self.response_cache.invalidate()
+            self._cached_intents_version = self.parser.intents_version
+
+    def _cache_ttl(self, action: str, policy: ActionPolicy, params: dict[str, Any]) -> float | None:
+        """Seconds to cache this call's reply, or None if it isn't cacheable."""
+        cache_config = self.config.get("response_cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        ttl = cache_config.get("ttl", {}).get(action, policy.cache_ttl)
+        if not ttl:
+            return None
+        # Piped input isn't part of the cache key
+        if "_previous_output" in params:
+            return None
+        if policy.should_cache is not None and not policy.should_cache(params):
+            return None
+        return ttl
+
+    async def _run_action(
+        self,
+        action: str,
+        policy: ActionPolicy,
+        params: dict[str, Any],
+        user_id: str,
+        channel: str,
+    ) -> ActionResult:
+        """Run an action's handler with its timeout."""
         handler = self.actions[action]
+        timeout = self._action_timeout(action, policy)
 
-        # Check if handler is async
-        if asyncio.iscoroutinefunction(handler):
-            return await handler(params=params, user_id=user_id, channel=channel, engine=self)
-        else:
-            return handler(params=params, user_id=user_id, channel=channel, engine=self)
+        scope = asyncio.timeout(timeout)
+        try:
+            async with scope:
+                if asyncio.iscoroutinefunction(handler):
+                    result = await handler(params=params, user_id=user_id, channel=channel, engine=self)
+                else:
+                    # The engine can't be pickled into another process
+                    in_process_pool = self.executor.in_process_pool(policy.workload)
+                    result = await self.executor.run(
+                        handler,
+                        workload=policy.workload,
+                        params=params,
+                        user_id=user_id,
+                        channel=channel,
+                        engine=None if in_process_pool else self,
+                    )
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            ACTION_TIMEOUTS_TOTAL.labels(action=action).inc()
+            raise ActionTimeoutError(f"{action} timed out after {timeout}s") from None
+
+        return _to_action_result(result)
+
+    def _action_timeout(self, action: str, policy: ActionPolicy) -> float | None:
+        """Seconds an action may run: config override, then declared, then default."""
+        executor_config = self.config.get("executor", {})
+        timeout = executor_config.get("timeouts", {}).get(action)
+        if timeout is None:
+            timeout = policy.timeout
+        if timeout is None:
+            timeout = executor_config.get("timeout", 120)
+        return timeout or None
+
+    async def run_blocking(self, func: Callable, *args: Any, workload: str = "io", **kwargs: Any) -> Any:
+        """
+        Run blocking or CPU-bound work off the event loop.
+
+        For use inside async actions, e.g. a sumy summarization or an
+        imaplib call. "cpu" work goes to the process pool if one is
+        configured, so func and its arguments must then be picklable.
+        """
+        return await self.executor.run(func, *args, workload=workload, **kwargs)
+
+    async def _run_scheduled(self, name: str, func: Callable) -> Any:
+        """Run a scheduler job in the scheduled lane, as its own request."""
+        with request_scope() as request_id:
+            with start_span(
+                "safeclaw.scheduled_job",
+                attributes={"safeclaw.job": name, "safeclaw.request_id": request_id},
+            ):
+                return await self._message_queue.run(name, func, lane=SCHEDULED)
+
+    async def _process_webhooks(self, server: Any) -> None:
+        """Run the actions of incoming webhook events in the bulk lane."""
+        while True:
+            event = await server.get_event()
+            handler = server.handlers.get(event.name)
+            if handler is None or handler.action not in self.actions:
+                logger.warning(f"No action configured for webhook: {event.name}")
+                continue
+            task = asyncio.create_task(self._run_webhook(handler.action, event))
+            self._webhook_tasks.add(task)
+            task.add_done_callback(self._webhook_tasks.discard)
+
+    async def _run_webhook(self, action: str, event: Any) -> None:
+        """Execute one webhook-triggered action."""
+        params = {"webhook": event.name, "payload": event.payload}
+        try:
+            with request_scope() as request_id, start_span(
+                "safeclaw.webhook",
+                attributes={"safeclaw.webhook": event.name, "safeclaw.request_id": request_id},
+            ):
+                await self._message_queue.run(
+                    f"webhook:{event.name}",
+                    lambda: self._execute_action(action, params, user_id="webhook", channel="webhook"),
+                    lane=BULK,
+                )
+        except DispatcherBusyError:
+            logger.warning(f"Dropped webhook event {event.name}: bulk lane is full")
+        except Exception as e:
+            logger.error(f"Webhook action {action} failed: {e}")
 
     async def start(self) -> None:
         """Start the SafeClaw engine."""
@@ -247,8 +816,19 @@ class SafeClaw:
 
         # Initialize components
         self.load_config()
+        self._configure_memory()
+        self._configure_parser()
+        self._configure_dispatcher()
+        self._configure_executor()
+        self._configure_response_cache()
+        self._configure_telemetry()
+        self.custom_intents.reload()
         await self.memory.initialize()
+        await self._message_queue.start()
         await self.scheduler.start()
+        self._configure_retention()
+        if self.config.get("parser", {}).get("intents", {}).get("watch", True):
+            await self.custom_intents.start()
 
         # Start all enabled channels
         channel_tasks = []
@@ -256,6 +836,8 @@ class SafeClaw:
             if hasattr(channel, "start"):
                 channel_tasks.append(asyncio.create_task(channel.start()))
                 logger.info(f"Started channel: {name}")
+            if hasattr(channel, "get_event"):
+                channel_tasks.append(asyncio.create_task(self._process_webhooks(channel)))
 
         # Main event loop
         try:
@@ -268,8 +850,12 @@ class SafeClaw:
         logger.info("Stopping SafeClaw...")
         self.running = False
 
-        # Stop scheduler
+        # Stop scheduler and intents watcher
         await self.scheduler.stop()
+        await self.custom_intents.stop()
+
+        # Let running jobs finish, answer anything still queued
+        await self._message_queue.stop()
 
         # Stop all channels
         for name, channel in self.channels.items():
@@ -277,9 +863,15 @@ class SafeClaw:
                 await channel.stop()
                 logger.info(f"Stopped channel: {name}")
 
-        # Close memory connection
+        # Release executor pools and close memory connection
+        self.executor.shutdown()
         await self.memory.close()
 
+        # Export the last spans
+        if self._tracing:
+            shutdown_telemetry()
+            self._tracing = False
+
         logger.info("SafeClaw stopped.")
 
     def get_help(self) -> str:
@@ -0,0 +1,103 @@
+"""
+SafeClaw Executor - Runs blocking and CPU-bound work off the event loop.
+
+Everything in SafeClaw shares one event loop, so a blocking call (imaplib,
+smtplib, a long sumy summarization) stalls every channel until it returns.
+The executor gives that work somewhere else to run:
+- "io" work (blocking network and file calls, sync action handlers) runs
+  on a thread pool
+- "cpu" work runs on a process pool when one is configured, otherwise on
+  the thread pool. Functions sent to the process pool, and their arguments,
+  must be picklable.
+
+Timeouts stop the engine waiting, not the work itself: a thread can't be
+interrupted, so it finishes in the background and its result is dropped.
+Queued process pool work that hasn't started yet is cancelled.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor as PoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WORKLOADS = ("io", "cpu")
+
+
+class ActionTimeoutError(Exception):
+    """Raised when an action runs longer than its timeout."""
+
+
+@dataclass
+class ActionPolicy:
+    """How the engine runs a registered action."""
+    workload: str = "io"
+    # Seconds, None for the engine default
+    timeout: float | None = None
+    # Response caching: seconds to keep replies (None to not cache), the
+    # params that identify a reply, and whether replies differ per user
+    cache_ttl: float | None = None
+    cache_key: tuple[str, ...] = field(default_factory=tuple)
+    cache_per_user: bool = True
+    # Optional check that a call's params are cacheable
+    should_cache: Callable[[dict[str, Any]], bool] | None = None
+
+
+class Executor:
+    """Thread and process pools for work that would block the event loop."""
+
+    def __init__(self, threads: int = 8, processes: int = 0):
+        self.threads = threads
+        self.processes = processes
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+
+    def configure(self, threads: int | None = None, processes: int | None = None) -> None:
+        """Update pool sizes. Pools already running keep their size until shutdown()."""
+        if threads is not None:
+            self.threads = max(1, threads)
+        if processes is not None:
+            self.processes = max(0, processes)
+
+    def _pool(self, workload: str) -> PoolExecutor:
+        """Return the pool for a workload, creating it on first use."""
+        if workload not in WORKLOADS:
+            raise ValueError(f"Unknown workload '{workload}', expected one of {WORKLOADS}")
+        if workload == "cpu" and self.processes:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix="safeclaw-exec"
+            )
+        return self._thread_pool
+
+    def in_process_pool(self, workload: str) -> bool:
+        """Whether work of this kind runs in another process."""
+        return workload == "cpu" and bool(self.processes)
+
+    async def run(self, func: Callable, *args: Any, workload: str = "io", **kwargs: Any) -> Any:
+        """Run a blocking function on the pool for its workload and return its result."""
+        loop = asyncio.get_running_loop()
+        pool = self._pool(workload)
+        call = functools.partial(func, *args, **kwargs)
+        if isinstance(pool, ThreadPoolExecutor):
+            # Threads see the caller's context (request id, current span);
+            # it can't be sent to another process
+            call = functools.partial(contextvars.copy_context().run, call)
+        return await loop.run_in_executor(pool, call)
+
+    def shutdown(self) -> None:
+        """Stop the pools without waiting for running work."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
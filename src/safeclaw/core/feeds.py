@@ -12,11 +12,9 @@ from datetime import datetime, timedelta
 from html import unescape
 from typing import Any
 
-import feedparser
-import httpx
-
 from safeclaw.core.crawler import Crawler
 from safeclaw.core.summarizer import Summarizer, SummaryMethod
+from safeclaw.infra.telemetry import http_span
 
 logger = logging.getLogger(__name__)
 
@@ -175,6 +173,8 @@ class FeedReader:
 
         new_items: list[FeedItem] = []
 
+        import httpx
+
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 headers = {}
@@ -183,7 +183,9 @@ class FeedReader:
                 if feed.modified:
                     headers["If-Modified-Since"] = feed.modified
 
-                response = await client.get(feed.url, headers=headers)
+                with http_span("GET", feed.url) as span:
+                    response = await client.get(feed.url, headers=headers)
+                    span.set_attribute("http.response.status_code", response.status_code)
 
                 # Not modified
                 if response.status_code == 304:
@@ -202,6 +204,8 @@ class FeedReader:
                     feed.modified = response.headers["last-modified"]
 
                 # Parse feed
+                import feedparser
+
                 parsed = feedparser.parse(response.text)
 
                 for entry in parsed.entries[:self.max_items_per_feed]:
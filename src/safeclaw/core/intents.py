@@ -0,0 +1,218 @@
+"""
+SafeClaw Custom Intents - User-defined commands from config/intents.yaml.
+
+The engine loads the file at startup and polls it for changes while
+running. On a change only the intents whose definition changed are
+recompiled and swapped into the parser, so warm caches, learned patterns
+and scheduled jobs survive the reload.
+
+File format:
+
+    intents:
+      deploy:
+        keywords: ["deploy", "release"]
+        patterns:
+          - "deploy to (production|staging)"
+        examples:
+          - "deploy to production"
+        slots: ["env"]
+        action: "webhook"        # Registered action to run
+        params:                  # Default params for the action
+          webhook_name: "deploy"
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore
+
+from safeclaw.core.parser import CommandParser, IntentPattern
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CustomIntent:
+    """A user-defined intent and the action it maps to."""
+    pattern: IntentPattern
+    action: str | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+    # Raw definition from the file, for change detection
+    spec: dict[str, Any] = field(default_factory=dict)
+
+
+def _string_list(value: Any) -> list[str]:
+    """Coerce a YAML scalar or list into a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def parse_intents(data: Any) -> tuple[dict[str, CustomIntent], list[str]]:
+    """
+    Build custom intents from a loaded intents.yaml document.
+
+    Returns (intents, invalid) where invalid lists the names of entries
+    that were skipped (not a mapping, or a regex that doesn't compile).
+    """
+    entries = data.get("intents") if isinstance(data, dict) else None
+    intents: dict[str, CustomIntent] = {}
+    invalid: list[str] = []
+
+    for name, spec in (entries or {}).items():
+        name = str(name)
+        if not isinstance(spec, dict):
+            logger.error(f"Invalid intent '{name}': expected a mapping")
+            invalid.append(name)
+            continue
+
+        pattern = IntentPattern(
+            intent=name,
+            # The parser matches keywords against lowercased text
+            keywords=[keyword.lower() for keyword in _string_list(spec.get("keywords"))],
+            patterns=_string_list(spec.get("patterns")),
+            examples=_string_list(spec.get("examples")),
+            slots=_string_list(spec.get("slots")),
+        )
+        try:
+            for regex in pattern.patterns:
+                re.compile(regex, re.IGNORECASE)
+        except re.error as e:
+            logger.error(f"Invalid pattern in intent '{name}': {e}")
+            invalid.append(name)
+            continue
+
+        intents[name] = CustomIntent(
+            pattern=pattern,
+            action=spec.get("action"),
+            params=dict(spec.get("params") or {}),
+            spec=spec,
+        )
+
+    return intents, invalid
+
+
+class IntentsLoader:
+    """
+    Loads custom intents into a parser and reloads them when the file changes.
+
+    The file is polled by modification time and size, which needs no extra
+    dependencies and costs one stat() per interval. Entries that fail to
+    load keep their previous definition. Custom intents may override
+    built-in ones; removing the override restores the built-in intent.
+    """
+
+    def __init__(self, parser: CommandParser, path: Path, poll_seconds: float = 2.0):
+        self.parser = parser
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.intents: dict[str, CustomIntent] = {}
+        self._overridden: dict[str, IntentPattern] = {}
+        self._stamp: tuple[int, int] | None = None
+        self._task: asyncio.Task | None = None
+
+    def configure(self, path: Path | None = None, poll_seconds: float | None = None) -> None:
+        """Update the file location and polling interval."""
+        if path is not None and path != self.path:
+            self.path = path
+            self._stamp = None
+        if poll_seconds is not None:
+            self.poll_seconds = poll_seconds
+
+    def _stat(self) -> tuple[int, int] | None:
+        """Return (mtime_ns, size) of the file, or None if it doesn't exist."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the file if it changed since the last load.
+
+        Returns True if any intents were added, changed or removed.
+        """
+        stamp = self._stat()
+        if stamp == self._stamp and not force:
+            return False
+        self._stamp = stamp
+
+        data: Any = {}
+        if stamp is not None:
+            try:
+                with open(self.path) as f:
+                    data = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError) as e:
+                logger.error(f"Failed to load intents from {self.path}: {e}")
+                return False
+
+        loaded, invalid = parse_intents(data)
+        for name in invalid:
+            if name in self.intents:
+                loaded[name] = self.intents[name]
+        return self._apply(loaded)
+
+    def _apply(self, loaded: dict[str, CustomIntent]) -> bool:
+        """Swap changed and removed intents into the parser."""
+        changed = [
+            custom for name, custom in loaded.items()
+            if name not in self.intents or self.intents[name].spec != custom.spec
+        ]
+        removed = [name for name in self.intents if name not in loaded]
+        if not changed and not removed:
+            self.intents = loaded
+            return False
+
+        for custom in changed:
+            name = custom.pattern.intent
+            if name not in self.intents and name in self.parser.intents:
+                self._overridden[name] = self.parser.intents[name]
+        restored = [self._overridden.pop(name) for name in removed if name in self._overridden]
+        restored_names = {pattern.intent for pattern in restored}
+
+        self.parser.update_intents(
+            patterns=[custom.pattern for custom in changed] + restored,
+            removed=[name for name in removed if name not in restored_names],
+        )
+        self.intents = loaded
+        logger.info(
+            f"Loaded custom intents from {self.path}: "
+            f"{len(changed)} changed, {len(removed)} removed, {len(loaded)} total"
+        )
+        return True
+
+    def get(self, intent: str | None) -> CustomIntent | None:
+        """Return the custom intent with this name, if any."""
+        if intent is None:
+            return None
+        return self.intents.get(intent)
+
+    async def start(self) -> None:
+        """Start polling the file for changes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _watch(self) -> None:
+        """Poll loop."""
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Failed to reload intents: {e}")
@@ -0,0 +1,303 @@
+"""
+SafeClaw Learned Patterns - Per-user index and bounded cache of learned corrections.
+
+User corrections live in Memory.user_patterns. The parser loads a user's
+patterns on their first message into a LearnedPatternIndex (exact lookup
+plus a length index for fuzzy candidates) and keeps it in a cache bounded by:
+- Number of users (least recently used are evicted first)
+- Approximate memory budget in bytes
+- Idle time since the user's last message
+"""
+
+import bisect
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+# Rough per-pattern overhead (dict + index entries) on top of its strings
+PATTERN_OVERHEAD_BYTES = 256
+
+# Learned patterns need a closer match than built-in intents
+LEARNED_THRESHOLD = 0.90
+
+
+def estimate_patterns_size(patterns: list[dict[str, Any]]) -> int:
+    """Approximate memory used by a user's learned patterns, in bytes."""
+    size = 0
+    for pattern in patterns:
+        size += PATTERN_OVERHEAD_BYTES
+        size += sys.getsizeof(pattern.get("phrase", ""))
+        size += sys.getsizeof(pattern.get("intent", ""))
+        if pattern.get("params"):
+            size += sys.getsizeof(str(pattern["params"]))
+    return size
+
+
+def length_window(length: int) -> tuple[float, float]:
+    """
+    Lengths a phrase can have and still score above the threshold vs length.
+
+    ratio = 2 * LCS / (a + b) <= 2 * min / (a + b), which exceeds t only if
+    max * t < (2 - t) * min. Bounds are inclusive (with a small epsilon) so
+    float rounding never drops a real match; rapidfuzz does the exact check.
+    """
+    t = LEARNED_THRESHOLD
+    return (length * t / (2 - t) - 1e-9, length * (2 - t) / t + 1e-9)
+
+
+class LearnedPatternIndex:
+    """
+    Lookup index over one user's learned patterns.
+
+    - Exact phrases resolve through a dict.
+    - Fuzzy candidates are the phrases whose length can reach a ratio above
+      0.90, found by bisecting a length-sorted array. Only that slice is
+      scored, in one rapidfuzz call with a score cutoff.
+
+    Patterns keep their load order (most used first), which breaks ties.
+    """
+
+    def __init__(self, patterns: list[dict[str, Any]] | None = None):
+        self.patterns: list[dict[str, Any]] = []
+        self._by_phrase: dict[str, int] = {}
+        # Parallel arrays sorted by phrase length
+        self._lengths: list[int] = []
+        self._phrases: list[str] = []
+        self._positions: list[int] = []
+        for pattern in patterns or []:
+            self._append(pattern)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _append(self, pattern: dict[str, Any]) -> None:
+        """Add a pattern to the end of the index."""
+        position = len(self.patterns)
+        phrase = pattern["phrase"]
+        self.patterns.append(pattern)
+        self._by_phrase.setdefault(phrase, position)
+
+        slot = bisect.bisect_right(self._lengths, len(phrase))
+        self._lengths.insert(slot, len(phrase))
+        self._phrases.insert(slot, phrase)
+        self._positions.insert(slot, position)
+
+    def add(self, phrase: str, intent: str, params: dict | None = None) -> dict[str, Any]:
+        """Add or update a learned pattern (phrase is normalized by the caller)."""
+        position = self._by_phrase.get(phrase)
+        if position is not None:
+            existing = self.patterns[position]
+            existing["intent"] = intent
+            existing["params"] = params
+            existing["use_count"] = existing.get("use_count", 0) + 1
+            return existing
+
+        pattern = {"phrase": phrase, "intent": intent, "params": params, "use_count": 1}
+        self._append(pattern)
+        return pattern
+
+    def match(self, text: str) -> dict[str, Any] | None:
+        """
+        Return the pattern matching text exactly, or the best fuzzy match
+        with a ratio above 0.90 (earliest pattern wins ties), or None.
+        """
+        position = self._by_phrase.get(text)
+        if position is not None:
+            return self.patterns[position]
+
+        low, high = length_window(len(text))
+        start = bisect.bisect_left(self._lengths, low)
+        stop = bisect.bisect_right(self._lengths, high)
+        if start >= stop:
+            return None
+
+        best_position = -1
+        best_score = 0.0
+        for _, score, index in process.extract(
+            text,
+            self._phrases[start:stop],
+            scorer=fuzz.ratio,
+            score_cutoff=LEARNED_THRESHOLD * 100,
+            limit=None,
+        ):
+            ratio = score / 100.0
+            if ratio <= LEARNED_THRESHOLD:
+                continue
+            position = self._positions[start + index]
+            if ratio > best_score or (ratio == best_score and position < best_position):
+                best_score = ratio
+                best_position = position
+
+        if best_position < 0:
+            return None
+        return self.patterns[best_position]
+
+    def estimate_size(self) -> int:
+        """Approximate memory used by this index, in bytes."""
+        return estimate_patterns_size(self.patterns)
+
+
+@dataclass
+class CacheEntry:
+    """Cached learned-pattern index for one user."""
+    index: LearnedPatternIndex
+    size: int
+    last_access: float
+
+
+class LearnedPatternCache:
+    """
+    LRU cache of learned patterns per user, with a memory budget and idle eviction.
+
+    Users with no learned patterns are cached too (as empty entries), so
+    their messages don't hit the database on every parse.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        idle_seconds: float = 3600.0,
+    ):
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+
+    def configure(
+        self,
+        max_users: int | None = None,
+        max_bytes: int | None = None,
+        idle_seconds: float | None = None,
+    ) -> None:
+        """Update limits and evict anything now over budget."""
+        if max_users is not None:
+            self.max_users = max_users
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if idle_seconds is not None:
+            self.idle_seconds = idle_seconds
+        self.evict_idle()
+        self._enforce_limits()
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate bytes used by all cached patterns."""
+        return self._size
+
+    def get(self, user_id: str) -> LearnedPatternIndex | None:
+        """Return a user's cached index (marking it recently used), or None."""
+        now = time.monotonic()
+        self._maybe_sweep(now)
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        entry.last_access = now
+        self._entries.move_to_end(user_id)
+        return entry.index
+
+    def put(self, user_id: str, patterns: list[dict[str, Any]]) -> LearnedPatternIndex:
+        """Index and cache a user's patterns, evicting others to stay within limits."""
+        self.invalidate(user_id)
+
+        index = LearnedPatternIndex(patterns)
+        size = index.estimate_size()
+        self._entries[user_id] = CacheEntry(
+            index=index,
+            size=size,
+            last_access=time.monotonic(),
+        )
+        self._size += size
+        self._enforce_limits(keep=user_id)
+        return index
+
+    def resize(self, user_id: str) -> None:
+        """Recompute a user's size after their index changed in place."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        new_size = entry.index.estimate_size()
+        self._size += new_size - entry.size
+        entry.size = new_size
+        self._enforce_limits(keep=user_id)
+
+    def invalidate(self, user_id: str) -> bool:
+        """Drop a user's cached patterns. Returns True if they were cached."""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        self._size -= entry.size
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached patterns."""
+        self._entries.clear()
+        self._size = 0
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Evict users idle for longer than idle_seconds. Returns count evicted."""
+        now = now if now is not None else time.monotonic()
+        self._last_sweep = now
+        cutoff = now - self.idle_seconds
+
+        evicted = 0
+        # Entries are in access order, so stop at the first recent one
+        while self._entries:
+            user_id, entry = next(iter(self._entries.items()))
+            if entry.last_access > cutoff:
+                break
+            self.invalidate(user_id)
+            evicted += 1
+
+        if evicted:
+            self.evictions += evicted
+            logger.debug(f"Evicted {evicted} idle learned-pattern entries")
+        return evicted
+
+    def _maybe_sweep(self, now: float) -> None:
+        """Run idle eviction at most every tenth of the idle timeout."""
+        if now - self._last_sweep >= self.idle_seconds / 10:
+            self.evict_idle(now)
+
+    def _enforce_limits(self, keep: str | None = None) -> None:
+        """Evict least recently used users until within max_users and max_bytes."""
+        while self._entries and (
+            len(self._entries) > self.max_users or self._size > self.max_bytes
+        ):
+            user_id = next(iter(self._entries))
+            if user_id == keep:
+                # A single user over budget stays cached rather than thrashing
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(user_id)
+                continue
+            self.invalidate(user_id)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "users": len(self._entries),
+            "bytes": self._size,
+            "max_users": self.max_users,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,303 @@
+"""
+SafeClaw Intent Matcher - Compiled keyword, phrase and regex index for the parser.
+
+Built incrementally as intents are registered, so parsing a message does not
+loop over every intent, keyword and word in Python:
+- One compiled alternation finds every exact keyword/phrase hit in a single scan
+- Regex patterns are compiled once per intent
+- Fuzzy scoring only sees keywords whose length makes a match possible
+- Phrase variations are fuzzy-scored in one batched rapidfuzz call
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from rapidfuzz import fuzz, process
+
+if TYPE_CHECKING:
+    from safeclaw.core.parser import IntentPattern
+
+logger = logging.getLogger(__name__)
+
+# Scores assigned by each matching strategy (kept in sync with the parser)
+KEYWORD_SCORE = 0.9
+PATTERN_SCORE = 0.95
+FUZZY_THRESHOLD = 0.8
+PHRASE_SCORE = 0.92
+PHRASE_THRESHOLD = 0.85
+
+
+class SubstringScanner:
+    """
+    Finds every literal term that occurs in a text with one regex scan.
+
+    Terms are compiled into a longest-first alternation inside a lookahead,
+    so each position reports its longest matching term. Any other term
+    matching at that position is a prefix of it, which the precomputed
+    prefix closure adds back.
+    """
+
+    def __init__(self, terms: list[str]) -> None:
+        ordered = sorted({t for t in terms if t}, key=len, reverse=True)
+        self._regex: re.Pattern | None = None
+        if ordered:
+            alternation = "|".join(re.escape(t) for t in ordered)
+            self._regex = re.compile(f"(?=({alternation}))")
+        self._prefix_closure = {
+            term: tuple(t for t in ordered if term.startswith(t)) for term in ordered
+        }
+
+    def scan(self, text: str) -> set[str]:
+        """Return every term that occurs as a substring of text."""
+        if self._regex is None:
+            return set()
+
+        hits: set[str] = set()
+        for match in self._regex.finditer(text):
+            hits.update(self._prefix_closure[match.group(1)])
+        return hits
+
+
+@dataclass
+class CompiledIntent:
+    """Compiled form of a single IntentPattern."""
+    pattern: "IntentPattern"
+    regexes: list[re.Pattern] = field(default_factory=list)
+    # All regexes as one alternation, for "does any pattern match" checks
+    combined: re.Pattern | None = None
+
+
+def _compile_intent(pattern: "IntentPattern") -> CompiledIntent:
+    """Compile an intent's regexes individually and as one alternation."""
+    regexes = [re.compile(regex, re.IGNORECASE) for regex in pattern.patterns]
+    combined = None
+    if regexes:
+        try:
+            combined = re.compile(
+                "|".join(f"(?:{regex})" for regex in pattern.patterns), re.IGNORECASE
+            )
+        except re.error:
+            # e.g. inline global flags that are only valid at the start
+            combined = None
+    return CompiledIntent(pattern=pattern, regexes=regexes, combined=combined)
+
+
+class IntentMatcher:
+    """
+    Compiled keyword/regex index over registered intents.
+
+    Per-intent regexes are compiled when the intent is added. The shared
+    keyword alternation and length buckets are rebuilt lazily on the next
+    match after any change, so registering many intents costs one rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._intents: dict[str, CompiledIntent] = {}
+        self._dirty = True
+
+        # Shared keyword structures (rebuilt when dirty)
+        self._scanner = SubstringScanner([])
+        self._keyword_intents: dict[str, tuple[str, ...]] = {}
+        self._keywords_by_length: dict[int, list[str]] = {}
+        self._candidates_by_length: dict[int, list[str]] = {}
+
+    def add(self, pattern: "IntentPattern") -> None:
+        """Compile and index an intent, replacing any previous definition."""
+        self._intents[pattern.intent] = _compile_intent(pattern)
+        self._dirty = True
+
+    def remove(self, intent: str) -> bool:
+        """Remove an intent from the index. Returns True if it was present."""
+        if self._intents.pop(intent, None) is None:
+            return False
+        self._dirty = True
+        return True
+
+    def copy(self) -> "IntentMatcher":
+        """Return a matcher sharing this one's compiled intents, for copy-on-write updates."""
+        matcher = IntentMatcher()
+        matcher._intents = dict(self._intents)
+        return matcher
+
+    def build(self) -> None:
+        """Rebuild the shared keyword structures now rather than on the next match."""
+        if self._dirty:
+            self._rebuild()
+
+    def regexes_for(self, pattern: "IntentPattern") -> list[re.Pattern]:
+        """Return compiled regexes for a pattern, compiling if not indexed."""
+        compiled = self._intents.get(pattern.intent)
+        if compiled is not None and compiled.pattern is pattern:
+            return compiled.regexes
+        return [re.compile(regex, re.IGNORECASE) for regex in pattern.patterns]
+
+    def _rebuild(self) -> None:
+        """Rebuild the shared keyword alternation and length buckets."""
+        keyword_intents: dict[str, list[str]] = {}
+        for name, compiled in self._intents.items():
+            for keyword in compiled.pattern.keywords:
+                if not keyword:
+                    continue
+                owners = keyword_intents.setdefault(keyword, [])
+                if name not in owners:
+                    owners.append(name)
+
+        self._keyword_intents = {k: tuple(v) for k, v in keyword_intents.items()}
+        keywords = list(self._keyword_intents)
+        self._scanner = SubstringScanner(keywords)
+
+        self._keywords_by_length = {}
+        for keyword in keywords:
+            self._keywords_by_length.setdefault(len(keyword), []).append(keyword)
+        self._candidates_by_length = {}
+        self._dirty = False
+        logger.debug(f"Rebuilt intent matcher: {len(keywords)} keywords")
+
+    def _fuzzy_candidates(self, length: int) -> list[str]:
+        """
+        Keywords that can score above the fuzzy threshold against a word.
+
+        ratio = 2 * LCS / (len_a + len_b) and LCS <= min(len_a, len_b), so a
+        ratio above 0.8 needs max(len_a, len_b) < 1.5 * min(len_a, len_b).
+        """
+        cached = self._candidates_by_length.get(length)
+        if cached is not None:
+            return cached
+
+        candidates = [
+            keyword
+            for kw_len, keywords in self._keywords_by_length.items()
+            if max(kw_len, length) < 1.5 * min(kw_len, length)
+            for keyword in keywords
+        ]
+        self._candidates_by_length[length] = candidates
+        return candidates
+
+    def exact_hits(self, text: str) -> set[str]:
+        """Return every keyword that occurs as a substring of text."""
+        if self._dirty:
+            self._rebuild()
+        return self._scanner.scan(text)
+
+    @staticmethod
+    def _search_any(compiled: CompiledIntent, text: str) -> bool:
+        """Return True if any of the intent's regexes matches text."""
+        if compiled.combined is not None:
+            return compiled.combined.search(text) is not None
+        return any(regex.search(text) for regex in compiled.regexes)
+
+    def match(self, text: str) -> tuple[str, float] | None:
+        """
+        Score text against all intents and return the best (intent, score).
+
+        Scoring matches the original per-intent loop: exact keyword hits score
+        0.9, fuzzy word matches score their ratio when above 0.8 (only for
+        keywords without an exact hit), and regex hits score 0.95. Ties go to
+        the intent registered first.
+        """
+        if self._dirty:
+            self._rebuild()
+
+        scores: dict[str, float] = {}
+        hits = self.exact_hits(text)
+        for keyword in hits:
+            for name in self._keyword_intents[keyword]:
+                scores[name] = KEYWORD_SCORE
+
+        for word in set(text.split()):
+            candidates = self._fuzzy_candidates(len(word))
+            if not candidates:
+                continue
+            for keyword, score, _ in process.extract(
+                word,
+                candidates,
+                scorer=fuzz.ratio,
+                score_cutoff=FUZZY_THRESHOLD * 100,
+                limit=None,
+            ):
+                ratio = score / 100.0
+                if ratio <= FUZZY_THRESHOLD or keyword in hits:
+                    continue
+                for name in self._keyword_intents[keyword]:
+                    if ratio > scores.get(name, 0.0):
+                        scores[name] = ratio
+
+        best_intent = None
+        best_score = 0.0
+        for name in self._intents:
+            score = scores.get(name, 0.0)
+            if score > best_score:
+                best_score = score
+                best_intent = name
+
+        # A regex hit scores 0.95, so regexes only matter when nothing scored
+        # higher. Walking intents in registration order, the first intent that
+        # reaches 0.95 (by keyword or regex) is then the winner.
+        if best_score <= PATTERN_SCORE:
+            for name, compiled in self._intents.items():
+                if scores.get(name, 0.0) >= PATTERN_SCORE:
+                    return (name, scores[name])
+                if self._search_any(compiled, text):
+                    return (name, PATTERN_SCORE)
+
+        if best_intent and best_score >= 0.6:
+            return (best_intent, best_score)
+
+        return None
+
+
+class PhraseMatcher:
+    """
+    Batched matcher for common phrase variations.
+
+    Phrases are flattened into one table with a parallel intent lookup
+    array. Exact substring hits are found with a single scan; the rest are
+    scored in one rapidfuzz call with a score cutoff.
+    """
+
+    def __init__(self, variations: dict[str, list[str]]) -> None:
+        self.phrases: list[str] = []
+        self.phrase_intents: list[str] = []
+        for intent, phrases in variations.items():
+            for phrase in phrases:
+                self.phrases.append(phrase)
+                self.phrase_intents.append(intent)
+
+        self._scanner = SubstringScanner(self.phrases)
+
+    def match(self, text: str) -> tuple[str, float] | None:
+        """
+        Return the best (intent, score) for text, or None.
+
+        Phrases contained in text score 0.92; others score their
+        partial_ratio when above 0.85. Ties go to the earliest phrase.
+        """
+        if not self.phrases:
+            return None
+
+        hits = self._scanner.scan(text)
+        best_index = len(self.phrases)
+        best_score = 0.0
+
+        # With an exact hit in hand, only fuzzy scores of 0.92+ can compete
+        cutoff = PHRASE_SCORE if hits else PHRASE_THRESHOLD
+        for phrase, score, index in process.extract(
+            text,
+            self.phrases,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=cutoff * 100,
+            limit=None,
+        ):
+            ratio = PHRASE_SCORE if phrase in hits else score / 100.0
+            if ratio <= PHRASE_THRESHOLD:
+                continue
+            if ratio > best_score or (ratio == best_score and index < best_index):
+                best_score = ratio
+                best_index = index
+
+        if best_score >= PHRASE_THRESHOLD:
+            return (self.phrase_intents[best_index], best_score)
+
+        return None
@@ -5,16 +5,109 @@ SQLite-based with async support. No cloud required.
 Uses prepared statements with named parameters for SQL injection safety.
 """
 
+import asyncio
+import contextlib
+import gzip
 import json
 import logging
-from datetime import datetime, timedelta
+import time
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import aiosqlite
 
+from safeclaw.infra.telemetry import (
+    MEMORY_READ_CONNECTIONS_IN_USE,
+    MEMORY_READ_WAIT_SECONDS,
+    MEMORY_WRITE_WAIT_SECONDS,
+    traced,
+)
+
 logger = logging.getLogger(__name__)
 
+# Attributes of the span around each query
+DB_SPAN = {"db.system": "sqlite"}
+
+
+def _now() -> str:
+    """Current time in the format expires_at is stored in (local, ISO 8601)."""
+    return datetime.now().isoformat()
+
+
+def _message_row(
+    user_id: str,
+    channel: str,
+    text: str,
+    parsed: Any,
+    metadata: dict | None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "channel": channel,
+        "text": text,
+        "intent": parsed.intent if parsed else None,
+        "params": json.dumps(parsed.params) if parsed else None,
+        "metadata": json.dumps(metadata) if metadata else None,
+    }
+
+
+def _reminder_row(
+    user_id: str,
+    channel: str,
+    task: str,
+    trigger_at: datetime,
+    repeat: str | None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "channel": channel,
+        "task": task,
+        "trigger_at": trigger_at.isoformat(),
+        "repeat": repeat,
+    }
+
+
+def _crawl_row(
+    url: str,
+    content: str,
+    links: list[str],
+    summary: str | None,
+    expires_at: datetime,
+) -> dict[str, Any]:
+    return {
+        "url": url,
+        "content": content,
+        "links": json.dumps(links),
+        "summary": summary,
+        "expires_at": expires_at.isoformat(),
+    }
+
+
+def _message_from_row(row: aiosqlite.Row) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "user_id": row["user_id"],
+        "channel": row["channel"],
+        "text": row["text"],
+        "intent": row["intent"],
+        "params": json.loads(row["params"]) if row["params"] else None,
+        "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
+        "created_at": row["created_at"],
+    }
+
+
+def _archive_messages(archive_dir: Path, messages: list[dict[str, Any]]) -> None:
+    """Append messages to this month's gzipped JSONL archive."""
+    archive_dir = archive_dir.expanduser()
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"messages-{date.today():%Y-%m}.jsonl.gz"
+    # Each append adds a gzip member; readers see one continuous stream
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps(message) + "\n")
+
 
 class PreparedStatements:
     """
@@ -41,13 +134,13 @@ class PreparedStatements:
     SELECT_MESSAGES_WITH_CHANNEL = """
         SELECT id, user_id, channel, text, intent, params, metadata, created_at
         FROM messages WHERE user_id = :user_id AND channel = :channel
-        ORDER BY created_at DESC LIMIT :limit
+        ORDER BY created_at DESC, id DESC LIMIT :limit
     """
 
     SELECT_MESSAGES_NO_CHANNEL = """
         SELECT id, user_id, channel, text, intent, params, metadata, created_at
         FROM messages WHERE user_id = :user_id
-        ORDER BY created_at DESC LIMIT :limit
+        ORDER BY created_at DESC, id DESC LIMIT :limit
     """
 
     # Preferences
@@ -102,7 +195,7 @@ class PreparedStatements:
     SELECT_CRAWL_CACHE = """
         SELECT url, content, links, summary, fetched_at, expires_at
         FROM crawl_cache
-        WHERE url = :url AND expires_at > CURRENT_TIMESTAMP
+        WHERE url = :url AND expires_at > :now
     """
 
     # Key-value store
@@ -113,7 +206,7 @@ class PreparedStatements:
 
     SELECT_KEYVALUE = """
         SELECT value FROM keyvalue
-        WHERE key = :key AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
+        WHERE key = :key AND (expires_at IS NULL OR expires_at > :now)
     """
 
     # User-learned patterns
@@ -140,6 +233,47 @@ class PreparedStatements:
         WHERE user_id = :user_id AND phrase = :phrase
     """
 
+    # Retention
+    SELECT_MESSAGES_OLDER_THAN = """
+        SELECT id, user_id, channel, text, intent, params, metadata, created_at
+        FROM messages WHERE created_at < datetime('now', :age)
+        ORDER BY id LIMIT :limit
+    """
+
+    SELECT_USERS_OVER_HISTORY = """
+        SELECT user_id FROM messages
+        GROUP BY user_id HAVING COUNT(*) > :max_history
+    """
+
+    # Newest message of a user that is past max_history
+    SELECT_HISTORY_CUTOFF = """
+        SELECT id FROM messages WHERE user_id = :user_id
+        ORDER BY id DESC LIMIT 1 OFFSET :max_history
+    """
+
+    SELECT_USER_MESSAGES_UP_TO = """
+        SELECT id, user_id, channel, text, intent, params, metadata, created_at
+        FROM messages WHERE user_id = :user_id AND id <= :max_id
+        ORDER BY id LIMIT :limit
+    """
+
+    DELETE_MESSAGE = """
+        DELETE FROM messages WHERE id = :id
+    """
+
+    DELETE_EXPIRED_CRAWL_CACHE = """
+        DELETE FROM crawl_cache WHERE rowid IN (
+            SELECT rowid FROM crawl_cache WHERE expires_at <= :now LIMIT :limit
+        )
+    """
+
+    DELETE_EXPIRED_KEYVALUE = """
+        DELETE FROM keyvalue WHERE rowid IN (
+            SELECT rowid FROM keyvalue
+            WHERE expires_at IS NOT NULL AND expires_at <= :now LIMIT :limit
+        )
+    """
+
 
 class Memory:
     """
@@ -151,11 +285,76 @@ class Memory:
     - Scheduled tasks
     - Webhook configurations
     - Crawl cache
+
+    Message logging has two durability modes:
+    - "sync": each message is inserted and committed before store_message returns
+    - "write_behind": messages are queued and a background task commits them
+      in batches (by size or every flush_ms), with synchronous=NORMAL. Up to
+      one batch can be lost on a crash; close() flushes everything pending.
+
+    Writes go through one writer connection. Queries use a pool of read-only
+    connections, each on its own thread, so reads don't queue behind writes
+    and commits; WAL mode lets them run while a write is in progress. They
+    see committed data only.
+
+    Each write method commits on its own, unless it runs inside
+    `async with memory.transaction():`, which commits everything at once.
+    The bulk methods (store_messages, add_reminders, cache_crawl_many)
+    insert many rows with one statement and one commit.
     """
 
-    def __init__(self, db_path: Path):
+    DURABILITY_MODES = ("sync", "write_behind")
+
+    def __init__(
+        self,
+        db_path: Path,
+        durability: str = "sync",
+        batch_size: int = 100,
+        flush_ms: int = 200,
+        max_pending: int = 10000,
+        read_connections: int = 4,
+    ):
         self.db_path = db_path
+        # The writer; also used for reads when there is no read pool
         self._connection: aiosqlite.Connection | None = None
+        self.read_connections = read_connections
+        self._readers: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._reader_connections: list[aiosqlite.Connection] = []
+        # Held for each write, or for a whole transaction() by the task running it
+        self._write_lock = asyncio.Lock()
+        self._transaction_task: asyncio.Task | None = None
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self.max_pending = max_pending
+        self._write_queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._flush_requested = asyncio.Event()
+
+    def configure(
+        self,
+        durability: str | None = None,
+        batch_size: int | None = None,
+        flush_ms: int | None = None,
+        max_pending: int | None = None,
+        read_connections: int | None = None,
+    ) -> None:
+        """Update message logging and read pool settings (before initialize())."""
+        if durability is not None:
+            if durability not in self.DURABILITY_MODES:
+                raise ValueError(
+                    f"Unknown durability mode: {durability} "
+                    f"(expected one of {', '.join(self.DURABILITY_MODES)})"
+                )
+            self.durability = durability
+        if batch_size is not None:
+            self.batch_size = max(1, batch_size)
+        if flush_ms is not None:
+            self.flush_ms = flush_ms
+        if max_pending is not None:
+            self.max_pending = max_pending
+        if read_connections is not None:
+            self.read_connections = max(0, read_connections)
 
     async def initialize(self) -> None:
         """Initialize database and create tables."""
@@ -163,12 +362,119 @@ class Memory:
             self.db_path,
             timeout=30.0,  # Wait up to 30 seconds for locks
         )
+        # Let the compactor return free pages to the file system in steps;
+        # only takes effect on a new database, or after vacuum()
+        await self._connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
         # Enable WAL mode for better concurrency (allows reads during writes)
         await self._connection.execute("PRAGMA journal_mode=WAL")
         # Use row_factory for named column access (safer than positional indexing)
         self._connection.row_factory = aiosqlite.Row
         await self._create_tables()
-        logger.info(f"Memory initialized at {self.db_path}")
+
+        if self.durability == "write_behind":
+            # Commits no longer fsync; WAL keeps the database consistent
+            await self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._write_queue = asyncio.Queue(maxsize=self.max_pending)
+            self._writer_task = asyncio.create_task(self._message_writer())
+
+        if self.read_connections and str(self.db_path) != ":memory:":
+            await self._open_readers()
+
+        logger.info(
+            f"Memory initialized at {self.db_path} ({self.durability}, "
+            f"{len(self._reader_connections)} read connections)"
+        )
+
+    async def _open_readers(self) -> None:
+        """Open the read-only connection pool."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._readers = asyncio.Queue()
+        for _ in range(self.read_connections):
+            connection = await aiosqlite.connect(uri, uri=True, timeout=30.0)
+            connection.row_factory = aiosqlite.Row
+            self._reader_connections.append(connection)
+            self._readers.put_nowait(connection)
+
+    @contextlib.asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a connection for a query: from the read pool, or the writer without one."""
+        if self._readers is None:
+            assert self._connection is not None
+            yield self._connection
+            return
+
+        start = time.perf_counter()
+        connection = await self._readers.get()
+        MEMORY_READ_WAIT_SECONDS.observe(time.perf_counter() - start)
+        MEMORY_READ_CONNECTIONS_IN_USE.inc()
+        try:
+            yield connection
+        finally:
+            MEMORY_READ_CONNECTIONS_IN_USE.dec()
+            self._readers.put_nowait(connection)
+
+    @contextlib.asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        The writer connection for one write, committed on exit (rolled back
+        on error). Inside transaction(), the transaction commits instead.
+        """
+        assert self._connection is not None
+        if self._in_transaction():
+            yield self._connection
+            return
+
+        start = time.perf_counter()
+        async with self._write_lock:
+            MEMORY_WRITE_WAIT_SECONDS.observe(time.perf_counter() - start)
+            try:
+                yield self._connection
+            except BaseException:
+                await self._connection.rollback()
+                raise
+            await self._connection.commit()
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Memory"]:
+        """
+        Run several writes in one transaction: one commit (one fsync) on
+        exit, or a rollback if the block raises.
+
+        Writes from other tasks, including ones it starts, wait until the
+        transaction ends, so keep it short. Queries on the read pool see its
+        writes only after the commit. Nested transactions are part of the
+        outer one.
+
+            async with memory.transaction():
+                await memory.set("a", 1)
+                await memory.cache_crawl(url, content, links)
+        """
+        if self._in_transaction():
+            yield self
+            return
+
+        async with self._write() as connection:
+            self._transaction_task = asyncio.current_task()
+            try:
+                await connection.execute("BEGIN IMMEDIATE")
+                yield self
+            finally:
+                self._transaction_task = None
+
+    def _in_transaction(self) -> bool:
+        """Whether the current task is inside transaction()."""
+        return self._transaction_task is not None and self._transaction_task is asyncio.current_task()
+
+    async def _fetchall(self, query: str, params: dict[str, Any] | None = None) -> list[aiosqlite.Row]:
+        """Run a query on a read connection and return all rows."""
+        async with self._reader() as connection:
+            return list(await connection.execute_fetchall(query, params or {}))
+
+    async def _fetchone(self, query: str, params: dict[str, Any]) -> aiosqlite.Row | None:
+        """Run a query on a read connection and return the first row."""
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            return await cursor.fetchone()
 
     async def _create_tables(self) -> None:
         """Create database tables if they don't exist."""
@@ -259,13 +565,27 @@ class Memory:
         await self._connection.commit()
 
     async def close(self) -> None:
-        """Close database connection."""
+        """Flush pending messages and close database connection."""
+        if self._writer_task:
+            await self.flush()
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
+
+        for connection in self._reader_connections:
+            await connection.close()
+        self._reader_connections = []
+        self._readers = None
+
         if self._connection:
             await self._connection.close()
             self._connection = None
             logger.info("Memory connection closed")
 
     # Message storage
+    @traced("memory.store_message", DB_SPAN)
     async def store_message(
         self,
         user_id: str,
@@ -274,23 +594,88 @@ class Memory:
         parsed: Any,
         metadata: dict | None = None,
     ) -> int:
-        """Store a message in history using prepared statement."""
-        assert self._connection is not None
+        """
+        Store a message in history using prepared statement.
 
-        cursor = await self._connection.execute(
-            PreparedStatements.INSERT_MESSAGE,
-            {
-                "user_id": user_id,
-                "channel": channel,
-                "text": text,
-                "intent": parsed.intent if parsed else None,
-                "params": json.dumps(parsed.params) if parsed else None,
-                "metadata": json.dumps(metadata) if metadata else None,
-            },
-        )
-        await self._connection.commit()
+        Returns the new row id, or 0 in write-behind mode, where the row
+        is queued and written by the background writer.
+        """
+        row = _message_row(user_id, channel, text, parsed, metadata)
+
+        if self._write_queue is not None:
+            # Waits only if max_pending messages are already queued
+            await self._write_queue.put(row)
+            return 0
+
+        async with self._write() as connection:
+            cursor = await connection.execute(PreparedStatements.INSERT_MESSAGE, row)
         return cursor.lastrowid or 0
 
+    @traced("memory.store_messages", DB_SPAN)
+    async def store_messages(self, messages: Iterable[dict[str, Any]]) -> int:
+        """
+        Store several messages with one insert and one commit.
+
+        Each message has the arguments of store_message (user_id, channel,
+        text, parsed, and optionally metadata). In write-behind mode they
+        are queued like single messages. Returns the number stored.
+        """
+        rows = [
+            _message_row(m["user_id"], m["channel"], m["text"], m["parsed"], m.get("metadata"))
+            for m in messages
+        ]
+        if self._write_queue is not None:
+            for row in rows:
+                await self._write_queue.put(row)
+        elif rows:
+            await self._write_messages(rows)
+        return len(rows)
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued message has been written (write-behind mode).
+
+        Inside transaction() this returns at once: the background writer
+        can't write until the transaction ends.
+        """
+        if self._write_queue is None or self._writer_task is None or self._in_transaction():
+            return
+        self._flush_requested.set()
+        await self._write_queue.join()
+
+    async def _message_writer(self) -> None:
+        """Background task committing queued messages, one transaction per batch."""
+        assert self._write_queue is not None
+        queue = self._write_queue
+
+        while True:
+            batch = [await queue.get()]
+
+            # Give the batch time to fill, unless it is full or a flush was asked for
+            if queue.qsize() < self.batch_size - 1 and not self._flush_requested.is_set():
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._flush_requested.wait(), self.flush_ms / 1000)
+
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            if queue.empty():
+                self._flush_requested.clear()
+
+            try:
+                await self._write_messages(batch)
+            except Exception:
+                logger.exception(f"Failed to write {len(batch)} queued messages")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @traced("memory.write_messages", DB_SPAN)
+    async def _write_messages(self, rows: list[dict[str, Any]]) -> None:
+        """Insert messages in a single transaction."""
+        async with self._write() as connection:
+            await connection.executemany(PreparedStatements.INSERT_MESSAGE, rows)
+
+    @traced("memory.get_history", DB_SPAN)
     async def get_history(
         self,
         user_id: str,
@@ -298,7 +683,8 @@ class Memory:
         channel: str | None = None,
     ) -> list[dict[str, Any]]:
         """Retrieve conversation history using prepared statement."""
-        assert self._connection is not None
+        # Include messages still waiting in the write-behind queue
+        await self.flush()
 
         # Use pre-defined prepared statements to avoid dynamic query construction
         if channel:
@@ -308,56 +694,38 @@ class Memory:
             query = PreparedStatements.SELECT_MESSAGES_NO_CHANNEL
             params = {"user_id": user_id, "limit": limit}
 
-        cursor = await self._connection.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(query, params)
 
         # Use named column access via row_factory for safer data retrieval
-        return [
-            {
-                "id": row["id"],
-                "user_id": row["user_id"],
-                "channel": row["channel"],
-                "text": row["text"],
-                "intent": row["intent"],
-                "params": json.loads(row["params"]) if row["params"] else None,
-                "metadata": json.loads(row["metadata"]) if row["metadata"] else None,
-                "created_at": row["created_at"],
-            }
-            for row in reversed(list(rows))
-        ]
+        return [_message_from_row(row) for row in reversed(rows)]
 
     # Preferences
+    @traced("memory.set_preference", DB_SPAN)
     async def set_preference(self, user_id: str, key: str, value: Any) -> None:
         """Set a user preference using prepared statement."""
-        assert self._connection is not None
-
-        # Get existing preferences using prepared statement
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_PREFERENCES, {"user_id": user_id}
-        )
-        row = await cursor.fetchone()
-
-        if row:
-            prefs = json.loads(row["data"])
-        else:
-            prefs = {}
-
-        prefs[key] = value
-
-        await self._connection.execute(
-            PreparedStatements.UPSERT_PREFERENCES,
-            {"user_id": user_id, "data": json.dumps(prefs)},
-        )
-        await self._connection.commit()
-
+        async with self._write() as connection:
+            # Get existing preferences using prepared statement
+            cursor = await connection.execute(
+                PreparedStatements.SELECT_PREFERENCES, {"user_id": user_id}
+            )
+            row = await cursor.fetchone()
+
+            if row:
+                prefs = json.loads(row["data"])
+            else:
+                prefs = {}
+
+            prefs[key] = value
+
+            await connection.execute(
+                PreparedStatements.UPSERT_PREFERENCES,
+                {"user_id": user_id, "data": json.dumps(prefs)},
+            )
+
+    @traced("memory.get_preference", DB_SPAN)
     async def get_preference(self, user_id: str, key: str, default: Any = None) -> Any:
         """Get a user preference using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_PREFERENCES, {"user_id": user_id}
-        )
-        row = await cursor.fetchone()
+        row = await self._fetchone(PreparedStatements.SELECT_PREFERENCES, {"user_id": user_id})
 
         if row:
             prefs = json.loads(row["data"])
@@ -366,6 +734,7 @@ class Memory:
         return default
 
     # Reminders
+    @traced("memory.add_reminder", DB_SPAN)
     async def add_reminder(
         self,
         user_id: str,
@@ -375,32 +744,47 @@ class Memory:
         repeat: str | None = None,
     ) -> int:
         """Add a reminder using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.INSERT_REMINDER,
-            {
-                "user_id": user_id,
-                "channel": channel,
-                "task": task,
-                "trigger_at": trigger_at.isoformat(),
-                "repeat": repeat,
-            },
-        )
-        await self._connection.commit()
+        async with self._write() as connection:
+            cursor = await connection.execute(
+                PreparedStatements.INSERT_REMINDER,
+                _reminder_row(user_id, channel, task, trigger_at, repeat),
+            )
         return cursor.lastrowid or 0
 
+    @traced("memory.add_reminders", DB_SPAN)
+    async def add_reminders(self, reminders: Iterable[dict[str, Any]]) -> list[int]:
+        """
+        Add several reminders with one insert and one commit.
+
+        Each reminder has the arguments of add_reminder (user_id, channel,
+        task, trigger_at, and optionally repeat). Returns their ids, in order.
+        """
+        rows = [
+            _reminder_row(r["user_id"], r["channel"], r["task"], r["trigger_at"], r.get("repeat"))
+            for r in reminders
+        ]
+        if not rows:
+            return []
+        async with self._write() as connection:
+            await connection.executemany(PreparedStatements.INSERT_REMINDER, rows)
+            cursor = await connection.execute("SELECT last_insert_rowid()")
+            row = await cursor.fetchone()
+        assert row is not None
+        # The ids are consecutive: _write() holds this process's writer, and
+        # the open transaction holds SQLite's write lock against other
+        # processes until the commit
+        last_id = row[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    @traced("memory.get_pending_reminders", DB_SPAN)
     async def get_pending_reminders(self, before: datetime | None = None) -> list[dict]:
         """Get reminders that are due using prepared statement."""
-        assert self._connection is not None
-
         before = before or datetime.now()
 
-        cursor = await self._connection.execute(
+        rows = await self._fetchall(
             PreparedStatements.SELECT_PENDING_REMINDERS,
             {"before": before.isoformat()},
         )
-        rows = await cursor.fetchall()
 
         return [
             {
@@ -416,17 +800,17 @@ class Memory:
             for row in rows
         ]
 
+    @traced("memory.complete_reminder", DB_SPAN)
     async def complete_reminder(self, reminder_id: int) -> None:
         """Mark a reminder as completed using prepared statement."""
-        assert self._connection is not None
-
-        await self._connection.execute(
-            PreparedStatements.UPDATE_REMINDER_COMPLETED,
-            {"reminder_id": reminder_id},
-        )
-        await self._connection.commit()
+        async with self._write() as connection:
+            await connection.execute(
+                PreparedStatements.UPDATE_REMINDER_COMPLETED,
+                {"reminder_id": reminder_id},
+            )
 
     # Webhooks
+    @traced("memory.add_webhook", DB_SPAN)
     async def add_webhook(
         self,
         name: str,
@@ -435,27 +819,21 @@ class Memory:
         secret: str | None = None,
     ) -> None:
         """Register a webhook using prepared statement."""
-        assert self._connection is not None
-
-        await self._connection.execute(
-            PreparedStatements.UPSERT_WEBHOOK,
-            {
-                "name": name,
-                "secret": secret,
-                "action": action,
-                "params": json.dumps(params) if params else None,
-            },
-        )
-        await self._connection.commit()
-
+        async with self._write() as connection:
+            await connection.execute(
+                PreparedStatements.UPSERT_WEBHOOK,
+                {
+                    "name": name,
+                    "secret": secret,
+                    "action": action,
+                    "params": json.dumps(params) if params else None,
+                },
+            )
+
+    @traced("memory.get_webhook", DB_SPAN)
     async def get_webhook(self, name: str) -> dict | None:
         """Get a webhook by name using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_WEBHOOK, {"name": name}
-        )
-        row = await cursor.fetchone()
+        row = await self._fetchone(PreparedStatements.SELECT_WEBHOOK, {"name": name})
 
         if row:
             return {
@@ -470,12 +848,10 @@ class Memory:
 
         return None
 
+    @traced("memory.list_webhooks", DB_SPAN)
     async def list_webhooks(self) -> list[dict]:
         """List all webhooks using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(PreparedStatements.SELECT_ALL_WEBHOOKS)
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(PreparedStatements.SELECT_ALL_WEBHOOKS)
 
         return [
             {
@@ -491,6 +867,7 @@ class Memory:
         ]
 
     # Crawl cache
+    @traced("memory.cache_crawl", DB_SPAN)
     async def cache_crawl(
         self,
         url: str,
@@ -500,30 +877,36 @@ class Memory:
         ttl_hours: int = 24,
     ) -> None:
         """Cache crawl results using prepared statement."""
-        assert self._connection is not None
-
         expires_at = datetime.now() + timedelta(hours=ttl_hours)
 
-        await self._connection.execute(
-            PreparedStatements.UPSERT_CRAWL_CACHE,
-            {
-                "url": url,
-                "content": content,
-                "links": json.dumps(links),
-                "summary": summary,
-                "expires_at": expires_at.isoformat(),
-            },
-        )
-        await self._connection.commit()
+        async with self._write() as connection:
+            await connection.execute(
+                PreparedStatements.UPSERT_CRAWL_CACHE,
+                _crawl_row(url, content, links, summary, expires_at),
+            )
+
+    @traced("memory.cache_crawl_many", DB_SPAN)
+    async def cache_crawl_many(self, pages: Iterable[dict[str, Any]], ttl_hours: int = 24) -> int:
+        """
+        Cache several crawled pages with one statement and one commit.
+
+        Each page has url, content, links and optionally summary. Returns
+        the number cached.
+        """
+        expires_at = datetime.now() + timedelta(hours=ttl_hours)
+        rows = [
+            _crawl_row(page["url"], page["content"], page["links"], page.get("summary"), expires_at)
+            for page in pages
+        ]
+        if rows:
+            async with self._write() as connection:
+                await connection.executemany(PreparedStatements.UPSERT_CRAWL_CACHE, rows)
+        return len(rows)
 
+    @traced("memory.get_cached_crawl", DB_SPAN)
     async def get_cached_crawl(self, url: str) -> dict | None:
         """Get cached crawl result if not expired using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_CRAWL_CACHE, {"url": url}
-        )
-        row = await cursor.fetchone()
+        row = await self._fetchone(PreparedStatements.SELECT_CRAWL_CACHE, {"url": url, "now": _now()})
 
         if row:
             return {
@@ -538,28 +921,23 @@ class Memory:
         return None
 
     # Key-value store
+    @traced("memory.set", DB_SPAN)
     async def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
         """Set a key-value pair using prepared statement."""
-        assert self._connection is not None
-
         expires_at = None
         if ttl_seconds:
             expires_at = (datetime.now() + timedelta(seconds=ttl_seconds)).isoformat()
 
-        await self._connection.execute(
-            PreparedStatements.UPSERT_KEYVALUE,
-            {"key": key, "value": json.dumps(value), "expires_at": expires_at},
-        )
-        await self._connection.commit()
+        async with self._write() as connection:
+            await connection.execute(
+                PreparedStatements.UPSERT_KEYVALUE,
+                {"key": key, "value": json.dumps(value), "expires_at": expires_at},
+            )
 
+    @traced("memory.get", DB_SPAN)
     async def get(self, key: str, default: Any = None) -> Any:
         """Get a value by key using prepared statement."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_KEYVALUE, {"key": key}
-        )
-        row = await cursor.fetchone()
+        row = await self._fetchone(PreparedStatements.SELECT_KEYVALUE, {"key": key, "now": _now()})
 
         if row:
             return json.loads(row["value"])
@@ -567,6 +945,7 @@ class Memory:
         return default
 
     # User-learned patterns
+    @traced("memory.learn_pattern", DB_SPAN)
     async def learn_pattern(
         self,
         user_id: str,
@@ -580,28 +959,22 @@ class Memory:
         When a user corrects a misunderstood command, store the mapping
         so future similar phrases can be matched correctly.
         """
-        assert self._connection is not None
-
-        await self._connection.execute(
-            PreparedStatements.UPSERT_PATTERN,
-            {
-                "user_id": user_id,
-                "phrase": phrase.lower().strip(),
-                "intent": intent,
-                "params": json.dumps(params) if params else None,
-            },
-        )
-        await self._connection.commit()
+        async with self._write() as connection:
+            await connection.execute(
+                PreparedStatements.UPSERT_PATTERN,
+                {
+                    "user_id": user_id,
+                    "phrase": phrase.lower().strip(),
+                    "intent": intent,
+                    "params": json.dumps(params) if params else None,
+                },
+            )
         logger.debug(f"Learned pattern: '{phrase}' -> {intent}")
 
+    @traced("memory.get_user_patterns", DB_SPAN)
     async def get_user_patterns(self, user_id: str) -> list[dict]:
         """Get all learned patterns for a user, ordered by usage frequency."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
-            PreparedStatements.SELECT_USER_PATTERNS, {"user_id": user_id}
-        )
-        rows = await cursor.fetchall()
+        rows = await self._fetchall(PreparedStatements.SELECT_USER_PATTERNS, {"user_id": user_id})
 
         return [
             {
@@ -613,17 +986,15 @@ class Memory:
             for row in rows
         ]
 
+    @traced("memory.match_learned_pattern", DB_SPAN)
     async def match_learned_pattern(
         self, user_id: str, phrase: str
     ) -> dict | None:
         """Check if we have an exact learned pattern match for this phrase."""
-        assert self._connection is not None
-
-        cursor = await self._connection.execute(
+        row = await self._fetchone(
             PreparedStatements.SELECT_PATTERN_MATCH,
             {"user_id": user_id, "phrase": phrase.lower().strip()},
         )
-        row = await cursor.fetchone()
 
         if row:
             return {
@@ -633,3 +1004,153 @@ class Memory:
             }
 
         return None
+
+    # Retention
+    @traced("memory.prune_messages", DB_SPAN)
+    async def prune_messages(
+        self,
+        retention_days: int | None = None,
+        max_history: int | None = None,
+        batch_size: int = 500,
+        archive_dir: Path | None = None,
+    ) -> int:
+        """
+        Delete messages older than retention_days, and each user's messages
+        beyond their newest max_history.
+
+        Deletes batch_size rows per transaction, so other writes never wait
+        long. With archive_dir, deleted messages are first appended to a
+        gzipped JSONL file there (one per month). Returns the number deleted.
+        """
+        await self.flush()
+        deleted = 0
+        if retention_days:
+            deleted += await self._prune_messages(
+                PreparedStatements.SELECT_MESSAGES_OLDER_THAN,
+                {"age": f"-{int(retention_days)} days"},
+                batch_size,
+                archive_dir,
+            )
+        if max_history:
+            users = await self._fetchall(
+                PreparedStatements.SELECT_USERS_OVER_HISTORY, {"max_history": max_history}
+            )
+            for user in users:
+                cutoff = await self._fetchone(
+                    PreparedStatements.SELECT_HISTORY_CUTOFF,
+                    {"user_id": user["user_id"], "max_history": max_history},
+                )
+                if cutoff is None:
+                    continue
+                deleted += await self._prune_messages(
+                    PreparedStatements.SELECT_USER_MESSAGES_UP_TO,
+                    {"user_id": user["user_id"], "max_id": cutoff["id"]},
+                    batch_size,
+                    archive_dir,
+                )
+        return deleted
+
+    async def _prune_messages(
+        self,
+        query: str,
+        params: dict[str, Any],
+        batch_size: int,
+        archive_dir: Path | None,
+    ) -> int:
+        """Delete the messages a query selects, a batch at a time."""
+        deleted = 0
+        while rows := await self._fetchall(query, {**params, "limit": batch_size}):
+            if archive_dir is not None:
+                messages = [_message_from_row(row) for row in rows]
+                await asyncio.to_thread(_archive_messages, archive_dir, messages)
+            async with self._write() as connection:
+                await connection.executemany(
+                    PreparedStatements.DELETE_MESSAGE, [{"id": row["id"]} for row in rows]
+                )
+            deleted += len(rows)
+            # Let writes waiting for the writer go between batches
+            await asyncio.sleep(0)
+        return deleted
+
+    @traced("memory.prune_expired", DB_SPAN)
+    async def prune_expired(self, batch_size: int = 500) -> dict[str, int]:
+        """
+        Delete expired crawl cache entries and key-value pairs, which reads
+        already skip. Returns the number deleted per table.
+        """
+        return {
+            "crawl_cache": await self._delete_batches(
+                PreparedStatements.DELETE_EXPIRED_CRAWL_CACHE, batch_size
+            ),
+            "keyvalue": await self._delete_batches(
+                PreparedStatements.DELETE_EXPIRED_KEYVALUE, batch_size
+            ),
+        }
+
+    async def _delete_batches(self, statement: str, batch_size: int) -> int:
+        """Run an expiry DELETE (:now, :limit) until it deletes less than a batch."""
+        deleted = 0
+        while True:
+            async with self._write() as connection:
+                cursor = await connection.execute(statement, {"limit": batch_size, "now": _now()})
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted
+            await asyncio.sleep(0)
+
+    @traced("memory.incremental_vacuum", DB_SPAN)
+    async def incremental_vacuum(self, pages: int = 1000) -> int:
+        """
+        Return free pages to the file system, pages at a time.
+
+        Needs auto_vacuum=INCREMENTAL (new databases, or after vacuum());
+        otherwise frees nothing. Not for use inside transaction(), which it
+        would commit. Returns the number of pages freed.
+        """
+        freed = 0
+        while True:
+            async with self._write() as connection:
+                free_pages = await self._pragma(connection, "freelist_count")
+                if not free_pages or await self._pragma(connection, "auto_vacuum") != 2:
+                    return freed
+                # execute() would only run the first step, which frees one page
+                await connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                freed += free_pages - await self._pragma(connection, "freelist_count")
+            if free_pages <= pages:
+                return freed
+            await asyncio.sleep(0)
+
+    @traced("memory.checkpoint", DB_SPAN)
+    async def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int]:
+        """
+        Checkpoint the WAL into the database file.
+
+        PASSIVE doesn't wait for readers; TRUNCATE waits for them and then
+        empties the WAL file. Returns (busy, WAL pages, pages checkpointed).
+        """
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+        async with self._write() as connection:
+            rows = await connection.execute_fetchall(f"PRAGMA wal_checkpoint({mode})")
+        busy, log_pages, checkpointed = next(iter(rows))
+        return busy, log_pages, checkpointed
+
+    @traced("memory.vacuum", DB_SPAN)
+    async def vacuum(self) -> None:
+        """
+        Rebuild the database file, switching it to incremental auto-vacuum.
+
+        Blocks all writes while it runs and needs free disk space for a copy
+        of the database; meant to be run once, e.g. `safeclaw compact --vacuum`.
+        """
+        async with self._write() as connection:
+            await connection.commit()
+            await connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            await connection.execute("VACUUM")
+
+    @staticmethod
+    async def _pragma(connection: aiosqlite.Connection, name: str) -> int:
+        cursor = await connection.execute(f"PRAGMA {name}")
+        row = await cursor.fetchone()
+        return row[0] if row else 0
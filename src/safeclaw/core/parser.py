@@ -9,14 +9,22 @@ No GenAI needed! Uses:
 - User-learned patterns from corrections
 """
 
+import copy
 import logging
+import os
 import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Optional
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Optional, overload
 
-import dateparser  # type: ignore
-from rapidfuzz import fuzz
+from safeclaw.core.learned import LearnedPatternCache
+from safeclaw.core.matcher import IntentMatcher, PhraseMatcher
+from safeclaw.infra.telemetry import PARSE_CACHE_REQUESTS_TOTAL, start_span, traced
 
 if TYPE_CHECKING:
     from safeclaw.core.memory import Memory
@@ -155,15 +163,125 @@ PHRASE_VARIATIONS = {
 }
 
 
-# Patterns for detecting command chains
-# Order matters - more specific patterns first
-CHAIN_PATTERNS = [
-    (r'\s*\|\s*', 'pipe'),              # Unix-style pipe: "crawl url | summarize"
-    (r'\s*->\s*', 'pipe'),              # Arrow pipe: "crawl url -> summarize"
-    (r'\s+and\s+then\s+', 'sequence'),  # "crawl url and then summarize" (must be before "then")
-    (r'\s+then\s+', 'sequence'),        # "crawl url then summarize"
-    (r'\s*;\s*', 'sequence'),           # Semicolon: "crawl url; summarize"
-]
+# Tokenizer for command chains, scanned once per message. Quoted strings
+# and URLs are matched first so separators inside them are skipped.
+# - pipe: "crawl url | summarize", "crawl url -> summarize"
+# - sequence: "check email; news", "crawl url then summarize",
+#   "crawl url and then summarize"
+CHAIN_TOKEN_PATTERN = re.compile(
+    r'(?P<quoted>"[^"]*"|“[^”]*”|'
+    r"(?<!\w)'[^']*'(?!\w))"
+    r'|(?P<url>https?://\S+?(?=[;|]?(?:\s|$)))'
+    r'|(?P<pipe>\||->)'
+    r'|(?P<sequence>;|(?<=\s)and\s+then(?=\s)|(?<=\s)then(?=\s))',
+    re.IGNORECASE,
+)
+
+# Chain types in order of precedence: pipes bind looser than sequences,
+# so "a; b | c" pipes "a; b" into "c"
+CHAIN_TYPES = ("pipe", "sequence")
+
+
+def tokenize_chain(text: str) -> tuple[list[str], str]:
+    """
+    Split text into chain segments in a single scan.
+
+    Returns (segments, chain_type), where chain_type is 'pipe', 'sequence'
+    or 'none' (a single segment holding the whole text).
+    """
+    separators: dict[str, list[tuple[int, int]]] = {t: [] for t in CHAIN_TYPES}
+    for match in CHAIN_TOKEN_PATTERN.finditer(text):
+        # Other groups (quoted strings, URLs) are skipped over, not split on
+        group = match.lastgroup
+        if group is not None and group in separators:
+            separators[group].append(match.span())
+
+    for chain_type in CHAIN_TYPES:
+        spans = separators[chain_type]
+        if not spans:
+            continue
+        parts = []
+        start = 0
+        for sep_start, sep_end in spans:
+            parts.append(text[start:sep_start])
+            start = sep_end
+        parts.append(text[start:])
+        segments = [part.strip() for part in parts if part.strip()]
+        if len(segments) > 1:
+            return (segments, chain_type)
+
+    return ([text], "none")
+
+
+# Entity extraction patterns
+URL_PATTERN = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+NUMBER_PATTERN = re.compile(r'\b(\d+(?:\.\d+)?)\b')
+
+# Cheap pre-filter for date parsing: dateparser only runs when the text has
+# a digit or an (English) temporal word. Without one it returns None anyway,
+# after tens of milliseconds to seconds of language detection.
+TEMPORAL_HINT_PATTERN = re.compile(
+    r"\d|\b(?:"
+    r"now|today|tonight|tomorrow|yesterday|noon|midnight|"
+    r"morning|afternoon|evening|night|weekend|ago|"
+    r"sec|secs|second|seconds|min|mins|minute|minutes|hr|hrs|hour|hours|"
+    r"day|days|week|weeks|fortnight|month|months|year|years|am|pm|"
+    r"mon|monday|tue|tues|tuesday|wed|wednesday|thu|thur|thurs|thursday|"
+    r"fri|friday|sat|saturday|sun|sunday|"
+    r"jan|january|feb|february|mar|march|apr|april|may|jun|june|"
+    r"jul|july|aug|august|sep|sept|september|oct|october|nov|november|dec|december"
+    r")\b",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_datetime(text: str, relative_base: datetime) -> datetime | None:
+    """
+    Parse a date/time from normalized text, cached per (text, base minute).
+
+    The relative base is truncated to the minute by the caller, so relative
+    expressions ("in 2 hours") resolve against the start of that minute.
+    """
+    # Imported here: dateparser takes ~300ms to import
+    import dateparser  # type: ignore
+
+    return dateparser.parse(
+        text,
+        settings={
+            'PREFER_DATES_FROM': 'future',
+            'RELATIVE_BASE': relative_base,
+        }
+    )
+
+
+class _LazyEntities:
+    """
+    Descriptor for ParsedCommand.entities.
+
+    Entities passed in or assigned are kept as is; otherwise they are
+    extracted on first access by the command's entity loader.
+    """
+
+    @overload
+    def __get__(self, obj: None, objtype: Any = None) -> None: ...
+
+    @overload
+    def __get__(self, obj: "ParsedCommand", objtype: Any = None) -> dict[str, Any]: ...
+
+    def __get__(self, obj: "ParsedCommand | None", objtype: Any = None) -> dict[str, Any] | None:
+        if obj is None:
+            # @dataclass reads this as the default: not given
+            return None
+        if obj._entities is None:
+            obj._entities = obj._entity_loader() if obj._entity_loader else {}
+            obj._entity_loader = None
+        return obj._entities
+
+    def __set__(self, obj: "ParsedCommand", value: dict[str, Any] | None) -> None:
+        obj._entities = value
+        obj._entity_loader = None
 
 
 @dataclass
@@ -173,10 +291,16 @@ class ParsedCommand:
     intent: str | None = None
     confidence: float = 0.0
     params: dict[str, Any] = field(default_factory=dict)
-    entities: dict[str, Any] = field(default_factory=dict)
     # For command chaining
     chain_type: str | None = None  # 'pipe' or 'sequence' or None
     use_previous_output: bool = False  # True if this command should receive previous output
+    # Storage for `entities`; declared before it so __init__ sets them first
+    _entities: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _entity_loader: Callable[[], dict[str, Any]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Extracted entities (URLs, emails, datetime, numbers), computed lazily
+    entities: _LazyEntities = _LazyEntities()
 
 
 @dataclass
@@ -196,6 +320,106 @@ class IntentPattern:
     slots: list[str] = field(default_factory=list)
 
 
+def _copy_entities(template: ParsedCommand) -> dict[str, Any]:
+    """Entities for a cached result, extracted once on the cached template."""
+    return copy.deepcopy(template.entities)
+
+
+def _copy_parsed(template: ParsedCommand) -> ParsedCommand:
+    """Copy a cached result so callers can mutate it freely."""
+    parsed = ParsedCommand(
+        raw_text=template.raw_text,
+        intent=template.intent,
+        confidence=template.confidence,
+        params=copy.deepcopy(template.params),
+    )
+    parsed._entity_loader = partial(_copy_entities, template)
+    return parsed
+
+
+class ParseCache:
+    """
+    LRU cache of parse results.
+
+    Keys are (parser version, user scope, stripped text). Entries for text
+    with temporal words get a short TTL, since their datetime entity is
+    relative to when it was extracted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 3600.0,
+        temporal_ttl_seconds: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.temporal_ttl_seconds = temporal_ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[ParsedCommand, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        temporal_ttl_seconds: float | None = None,
+    ) -> None:
+        """Update limits."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        if temporal_ttl_seconds is not None:
+            self.temporal_ttl_seconds = temporal_ttl_seconds
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> ParsedCommand | None:
+        """Return a copy of the cached result for key, or None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            PARSE_CACHE_REQUESTS_TOTAL.labels(result="miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        PARSE_CACHE_REQUESTS_TOTAL.labels(result="hit").inc()
+        return _copy_parsed(entry[0])
+
+    def put(self, key: tuple, result: ParsedCommand, temporal: bool = False) -> None:
+        """Cache a result (the caller should not mutate it afterwards)."""
+        if self.max_entries <= 0:
+            return
+        ttl = self.temporal_ttl_seconds if temporal else self.ttl_seconds
+        self._entries[key] = (result, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
 class CommandParser:
     """
     Rule-based command parser with fuzzy matching.
@@ -208,7 +432,15 @@ class CommandParser:
     def __init__(self, memory: Optional["Memory"] = None):
         self.intents: dict[str, IntentPattern] = {}
         self.memory = memory
-        self._learned_patterns_cache: dict[str, list[dict]] = {}
+        self._matcher = IntentMatcher()
+        self._phrase_matcher: PhraseMatcher | None = None
+        self.learned_patterns = LearnedPatternCache()
+        self.parse_cache = ParseCache()
+        # Bumped whenever intents or learned patterns change, so cached
+        # parse results from before the change are never returned
+        self.version = 0
+        # Bumped only when intents change (replies such as help list them)
+        self.intents_version = 0
         self._setup_default_intents()
 
     def _setup_default_intents(self) -> None:
@@ -548,8 +780,53 @@ class CommandParser:
     def register_intent(self, pattern: IntentPattern) -> None:
         """Register a new intent pattern."""
         self.intents[pattern.intent] = pattern
+        self._matcher.add(pattern)
+        self._phrase_matcher = None
+        self.version += 1
+        self.intents_version += 1
         logger.debug(f"Registered intent: {pattern.intent}")
 
+    def unregister_intent(self, intent: str) -> bool:
+        """Remove an intent pattern. Returns True if it was registered."""
+        if self.intents.pop(intent, None) is None:
+            return False
+        self._matcher.remove(intent)
+        self._phrase_matcher = None
+        self.version += 1
+        self.intents_version += 1
+        logger.debug(f"Unregistered intent: {intent}")
+        return True
+
+    def update_intents(
+        self,
+        patterns: Iterable[IntentPattern] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """
+        Add, replace and remove intents in one step.
+
+        Only the given patterns are compiled; unchanged intents are shared
+        with the current matcher. The new index is built off to the side and
+        swapped in at once, so a parse sees either the old or the new set of
+        intents, never a mix.
+        """
+        intents = dict(self.intents)
+        matcher = self._matcher.copy()
+        for name in removed:
+            if intents.pop(name, None) is not None:
+                matcher.remove(name)
+        for pattern in patterns:
+            intents[pattern.intent] = pattern
+            matcher.add(pattern)
+        matcher.build()
+
+        # Phrase variations only depend on which intents are registered
+        phrase_matcher = self._phrase_matcher if intents.keys() == self.intents.keys() else None
+
+        self.intents, self._matcher, self._phrase_matcher = intents, matcher, phrase_matcher
+        self.version += 1
+        self.intents_version += 1
+
     def parse(self, text: str, user_id: str | None = None) -> ParsedCommand:
         """
         Parse user input into a structured command.
@@ -561,22 +838,104 @@ class CommandParser:
             user_id: Optional user ID for checking learned patterns
         """
         text = text.strip()
-        result = ParsedCommand(raw_text=text)
-
         if not text:
-            return result
+            return ParsedCommand(raw_text=text)
+
+        with start_span("parser.parse") as span:
+            key = (self.version, self._learned_scope(user_id), text)
+            cached = self.parse_cache.get(key)
+            if cached is not None:
+                span.set_attributes({"safeclaw.cache": "hit", "safeclaw.intent": cached.intent or ""})
+                return cached
+
+            result = self._parse(text, user_id)
+            self.parse_cache.put(key, result, temporal=bool(TEMPORAL_HINT_PATTERN.search(text)))
+            span.set_attributes({"safeclaw.cache": "miss", "safeclaw.intent": result.intent or ""})
+            return _copy_parsed(result)
+
+    def parse_many(
+        self,
+        texts: Iterable[str],
+        user_id: str | None = None,
+        workers: int | None = None,
+        chunk_size: int = 256,
+    ) -> list[ParsedCommand]:
+        """
+        Parse a batch of texts, in order, across a process pool.
+
+        Intended for bulk work such as replaying message history or load-test
+        corpora. Worker processes get a copy of the registered intents and
+        the user's cached learned patterns. Batches no larger than one chunk
+        (or workers=1) are parsed inline.
+
+        This call blocks; from async code, run it with asyncio.to_thread.
+
+        Args:
+            texts: Inputs to parse
+            user_id: Optional user ID for learned pattern matching
+            workers: Worker processes (default: CPU count)
+            chunk_size: Texts sent to a worker per task
+        """
+        texts = list(texts)
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, chunk_size)
+
+        if workers <= 1 or len(texts) <= chunk_size:
+            return [self.parse(text, user_id) for text in texts]
+
+        learned: list[dict] = []
+        index = self.learned_patterns.get(user_id) if user_id else None
+        if index:
+            learned = index.patterns
+
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results: list[ParsedCommand] = []
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_parse_worker,
+            initargs=(list(self.intents.values()), user_id, learned),
+        ) as executor:
+            for chunk, parsed in zip(chunks, executor.map(_parse_chunk, chunks), strict=True):
+                for text, (intent, confidence, params) in zip(chunk, parsed, strict=True):
+                    result = ParsedCommand(
+                        raw_text=text.strip(),
+                        intent=intent,
+                        confidence=confidence,
+                        params=params,
+                    )
+                    if intent:
+                        result._entity_loader = partial(self._extract_entities, result.raw_text)
+                    results.append(result)
+
+        logger.debug(f"Parsed {len(results)} texts in {len(chunks)} chunks")
+        return results
+
+    def _learned_scope(self, user_id: str | None) -> str | None:
+        """
+        User part of the parse cache key.
+
+        Only users with learned patterns can parse differently from everyone
+        else, so all other users share cached results.
+        """
+        if user_id and self.learned_patterns.get(user_id):
+            return user_id
+        return None
+
+    def _parse(self, text: str, user_id: str | None) -> ParsedCommand:
+        """Parse stripped, non-empty text without the result cache."""
+        result = ParsedCommand(raw_text=text)
 
         # Normalize text
         normalized = text.lower()
 
         # 1. Check learned patterns first (user corrections have highest priority)
-        if user_id and user_id in self._learned_patterns_cache:
+        if user_id:
             learned_match = self._match_learned_patterns(normalized, user_id)
             if learned_match:
                 result.intent = learned_match["intent"]
                 result.confidence = 0.98  # Very high - user explicitly corrected this
                 result.params = learned_match.get("params") or {}
-                result.entities = self._extract_entities(text)
+                result._entity_loader = partial(self._extract_entities, text)
                 logger.debug(f"Matched learned pattern: '{text}' -> {result.intent}")
                 return result
 
@@ -588,7 +947,7 @@ class CommandParser:
 
             intent_pattern = self.intents[result.intent]
             result.params = self._extract_params(text, intent_pattern)
-            result.entities = self._extract_entities(text)
+            result._entity_loader = partial(self._extract_entities, text)
             return result
 
         # 3. Fall back to keyword/pattern matching
@@ -601,54 +960,22 @@ class CommandParser:
             # Extract params using regex patterns
             intent_pattern = self.intents[result.intent]
             result.params = self._extract_params(text, intent_pattern)
-            result.entities = self._extract_entities(text)
+            result._entity_loader = partial(self._extract_entities, text)
 
         return result
 
+    @traced("parser.keywords")
     def _match_keywords(self, text: str) -> tuple[str, float] | None:
-        """Match text against intent keywords using fuzzy matching."""
-        best_intent = None
-        best_score = 0.0
-
-        words = text.split()
-
-        for intent_name, pattern in self.intents.items():
-            # Check for keyword matches
-            for keyword in pattern.keywords:
-                # Exact match in text
-                if keyword in text:
-                    score = 0.9
-                    if score > best_score:
-                        best_score = score
-                        best_intent = intent_name
-                    continue
-
-                # Fuzzy match against words
-                for word in words:
-                    ratio = fuzz.ratio(keyword, word) / 100.0
-                    if ratio > 0.8 and ratio > best_score:
-                        best_score = ratio
-                        best_intent = intent_name
-
-            # Check regex patterns
-            for regex in pattern.patterns:
-                if re.search(regex, text, re.IGNORECASE):
-                    score = 0.95
-                    if score > best_score:
-                        best_score = score
-                        best_intent = intent_name
-
-        if best_intent and best_score >= 0.6:
-            return (best_intent, best_score)
-
-        return None
+        """Match text against intent keywords and regexes via the compiled index."""
+        return self._matcher.match(text)
 
+    @traced("parser.extract_params")
     def _extract_params(self, text: str, pattern: IntentPattern) -> dict[str, Any]:
         """Extract parameters from text using regex patterns."""
         params: dict[str, Any] = {}
 
-        for regex in pattern.patterns:
-            match = re.search(regex, text, re.IGNORECASE)
+        for regex in self._matcher.regexes_for(pattern):
+            match = regex.search(text)
             if match:
                 groups = match.groups()
                 # Map groups to slots
@@ -659,42 +986,50 @@ class CommandParser:
 
         return params
 
+    @traced("parser.entities")
     def _extract_entities(self, text: str) -> dict[str, Any]:
         """Extract common entities (dates, times, URLs, emails)."""
         entities: dict[str, Any] = {}
 
         # Extract URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
+        urls = URL_PATTERN.findall(text)
         if urls:
             entities["urls"] = urls
 
         # Extract emails
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
+        emails = EMAIL_PATTERN.findall(text)
         if emails:
             entities["emails"] = emails
 
         # Extract dates/times using dateparser
         # Remove URLs first to avoid confusion
-        text_no_urls = re.sub(url_pattern, '', text)
-        parsed_date = dateparser.parse(
-            text_no_urls,
-            settings={
-                'PREFER_DATES_FROM': 'future',
-                'RELATIVE_BASE': datetime.now(),
-            }
-        )
+        parsed_date = self._extract_datetime(URL_PATTERN.sub('', text))
         if parsed_date:
             entities["datetime"] = parsed_date
 
         # Extract numbers
-        numbers = re.findall(r'\b(\d+(?:\.\d+)?)\b', text)
+        numbers = NUMBER_PATTERN.findall(text)
         if numbers:
             entities["numbers"] = [float(n) if '.' in n else int(n) for n in numbers]
 
         return entities
 
+    def _extract_datetime(self, text: str) -> datetime | None:
+        """
+        Extract a date/time with dateparser, skipping text with no temporal hint.
+
+        Results are cached by normalized text and the current minute.
+        """
+        if not TEMPORAL_HINT_PATTERN.search(text):
+            return None
+
+        normalized = " ".join(text.lower().split())
+        if not normalized:
+            return None
+
+        relative_base = datetime.now().replace(second=0, microsecond=0)
+        return _parse_datetime(normalized, relative_base)
+
     def get_intents(self) -> list[str]:
         """Return list of registered intent names."""
         return list(self.intents.keys())
@@ -705,40 +1040,23 @@ class CommandParser:
             return self.intents[intent].examples
         return []
 
+    @traced("parser.phrase_variations")
     def _match_phrase_variations(self, text: str) -> tuple[str, float] | None:
         """
         Match text against common phrase variations using fuzzy matching.
 
         This provides day-one natural language understanding without training.
+        Phrases for registered intents are scored in one batch.
         """
-        best_intent = None
-        best_score = 0.0
-
-        for intent, phrases in PHRASE_VARIATIONS.items():
-            if intent not in self.intents:
-                continue
-
-            for phrase in phrases:
-                # Check if phrase is contained in text
-                if phrase in text:
-                    score = 0.92
-                    if score > best_score:
-                        best_score = score
-                        best_intent = intent
-                    continue
-
-                # Fuzzy match - check if any part of text matches phrase
-                # Use partial_ratio for substring matching
-                ratio = fuzz.partial_ratio(phrase, text) / 100.0
-                if ratio > 0.85 and ratio > best_score:
-                    best_score = ratio
-                    best_intent = intent
-
-        if best_intent and best_score >= 0.85:
-            return (best_intent, best_score)
-
-        return None
-
+        if self._phrase_matcher is None:
+            self._phrase_matcher = PhraseMatcher({
+                intent: phrases
+                for intent, phrases in PHRASE_VARIATIONS.items()
+                if intent in self.intents
+            })
+        return self._phrase_matcher.match(text)
+
+    @traced("parser.learned_patterns")
     def _match_learned_patterns(
         self, text: str, user_id: str
     ) -> dict[str, Any] | None:
@@ -746,45 +1064,40 @@ class CommandParser:
         Match text against user's learned patterns using fuzzy matching.
 
         Returns the best matching pattern if found with high confidence.
+        Uses the user's cached index (exact lookup, then fuzzy scoring of
+        only the phrases in a length window found by bisect), so cost does
+        not grow with every stored phrase.
         """
-        if user_id not in self._learned_patterns_cache:
+        index = self.learned_patterns.get(user_id)
+        if not index:
             return None
 
-        patterns = self._learned_patterns_cache[user_id]
-        if not patterns:
-            return None
-
-        best_match = None
-        best_score = 0.0
-
-        for pattern in patterns:
-            phrase = pattern["phrase"]
-
-            # Exact match (normalized)
-            if text == phrase:
-                return pattern
-
-            # Fuzzy match - higher threshold for learned patterns
-            ratio = fuzz.ratio(phrase, text) / 100.0
-            if ratio > 0.90 and ratio > best_score:
-                best_score = ratio
-                best_match = pattern
-
-        return best_match
+        return index.match(text)
 
     async def load_user_patterns(self, user_id: str) -> None:
         """
         Load learned patterns for a user from memory.
 
-        Call this when a user session starts to enable learned pattern matching.
+        Replaces any cached patterns for the user.
         """
         if not self.memory:
             return
 
         patterns = await self.memory.get_user_patterns(user_id)
-        self._learned_patterns_cache[user_id] = patterns
+        self.learned_patterns.put(user_id, patterns)
         logger.debug(f"Loaded {len(patterns)} learned patterns for user {user_id}")
 
+    async def ensure_user_patterns(self, user_id: str) -> None:
+        """
+        Load a user's learned patterns on first use.
+
+        Called by the engine before parsing each message. Cached users
+        (including those with no patterns) don't touch the database.
+        """
+        if not self.memory or user_id in self.learned_patterns:
+            return
+        await self.load_user_patterns(user_id)
+
     async def learn_correction(
         self,
         user_id: str,
@@ -811,57 +1124,14 @@ class CommandParser:
         # Store in database
         await self.memory.learn_pattern(user_id, phrase, correct_intent, params)
 
-        # Update cache
-        if user_id not in self._learned_patterns_cache:
-            self._learned_patterns_cache[user_id] = []
-
-        # Check if already in cache and update, or add new
-        normalized = phrase.lower().strip()
-        for existing in self._learned_patterns_cache[user_id]:
-            if existing["phrase"] == normalized:
-                existing["intent"] = correct_intent
-                existing["params"] = params
-                existing["use_count"] = existing.get("use_count", 0) + 1
-                logger.info(f"Updated learned pattern: '{phrase}' -> {correct_intent}")
-                return
-
-        # Add new pattern to cache
-        self._learned_patterns_cache[user_id].append({
-            "phrase": normalized,
-            "intent": correct_intent,
-            "params": params,
-            "use_count": 1,
-        })
-        logger.info(f"Learned new pattern: '{phrase}' -> {correct_intent}")
-
-    def _detect_chain(self, text: str) -> tuple[str, str] | None:
-        """
-        Detect if text contains a command chain pattern.
-
-        Returns tuple of (pattern, chain_type) or None if no chain detected.
-        """
-        for pattern, chain_type in CHAIN_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return (pattern, chain_type)
-        return None
-
-    def _split_chain(self, text: str) -> tuple[list[str], str]:
-        """
-        Split text into chain segments.
-
-        Returns tuple of (segments, chain_type).
-        """
-        # Try each pattern in order
-        for pattern, chain_type in CHAIN_PATTERNS:
-            parts = re.split(pattern, text, flags=re.IGNORECASE)
-            if len(parts) > 1:
-                # Clean up parts and filter empty ones
-                segments = [p.strip() for p in parts if p.strip()]
-                if len(segments) > 1:
-                    return (segments, chain_type)
-
-        # No chain found - return single segment
-        return ([text], "none")
+        # Update the cached index in place if the user is active; otherwise
+        # the pattern is picked up when the user's patterns are next loaded
+        index = self.learned_patterns.get(user_id)
+        if index is not None:
+            index.add(phrase.lower().strip(), correct_intent, params)
+            self.learned_patterns.resize(user_id)
+        self.version += 1
+        logger.info(f"Learned pattern: '{phrase}' -> {correct_intent}")
 
     def parse_chain(
         self, text: str, user_id: str | None = None
@@ -875,6 +1145,8 @@ class CommandParser:
         - Sequence: "check email; remind me to reply" - runs independently
         - Natural: "crawl url and then summarize it" - contextual chaining
 
+        Separators inside quoted strings and URLs are not split on.
+
         Args:
             text: User input that may contain multiple chained commands
             user_id: Optional user ID for learned pattern matching
@@ -885,7 +1157,8 @@ class CommandParser:
         text = text.strip()
 
         # Split into segments
-        segments, chain_type = self._split_chain(text)
+        with start_span("parser.tokenize_chain"):
+            segments, chain_type = tokenize_chain(text)
 
         if len(segments) == 1:
             # Single command - no chaining
@@ -904,7 +1177,7 @@ class CommandParser:
             if chain_type == "pipe" and i > 0:
                 cmd.use_previous_output = True
                 # Handle implicit targets like "summarize it", "summarize that"
-                if not cmd.params.get("target") and not cmd.entities.get("urls"):
+                if not cmd.params.get("target") and not URL_PATTERN.search(cmd.raw_text):
                     cmd.params["_use_previous"] = True
 
             commands.append(cmd)
@@ -914,4 +1187,42 @@ class CommandParser:
 
     def is_chain(self, text: str) -> bool:
         """Check if text contains a command chain."""
-        return self._detect_chain(text) is not None
+        return tokenize_chain(text.strip())[1] != "none"
+
+
+# Process-pool workers for CommandParser.parse_many
+_worker_parser: CommandParser | None = None
+_worker_user_id: str | None = None
+
+
+def _init_parse_worker(
+    intents: list[IntentPattern],
+    user_id: str | None,
+    learned: list[dict],
+) -> None:
+    """Build a worker-local parser mirroring the parent's intents."""
+    global _worker_parser, _worker_user_id
+
+    parser = CommandParser()
+    wanted = {pattern.intent for pattern in intents}
+    for name in list(parser.intents):
+        if name not in wanted:
+            parser.unregister_intent(name)
+    for pattern in intents:
+        parser.register_intent(pattern)
+
+    if user_id and learned:
+        parser.learned_patterns.put(user_id, learned)
+
+    _worker_parser = parser
+    _worker_user_id = user_id
+
+
+def _parse_chunk(texts: list[str]) -> list[tuple[str | None, float, dict[str, Any]]]:
+    """Parse a chunk in a worker, returning (intent, confidence, params) per text."""
+    assert _worker_parser is not None
+    results = []
+    for text in texts:
+        parsed = _worker_parser.parse(text, _worker_user_id)
+        results.append((parsed.intent, parsed.confidence, parsed.params))
+    return results
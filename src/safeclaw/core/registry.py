@@ -0,0 +1,70 @@
+"""
+SafeClaw Action Registry - Actions built on first use.
+
+Constructing every action at startup is slow: summarizers build all the
+sumy algorithms and load stop words, plugins import their dependencies
+and probe for hardware. A LazyAction stands in for the real action and
+builds it from a factory the first time it is executed, so a CLI
+invocation or a fresh MCP container only pays for what it uses.
+"""
+
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LazyAction:
+    """
+    Placeholder for an action that is built by its factory on first use.
+
+    If the factory is a class, its class attributes (workload, timeout,
+    cache settings, ...) are available as action_class without building it.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self.action_class = factory if isinstance(factory, type) else None
+        self._instance: Any = None
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        """Return the action, building it if needed."""
+        if self._instance is None:
+            start = time.perf_counter()
+            self._instance = self.factory()
+            elapsed = (time.perf_counter() - start) * 1000
+            logger.info(f"Loaded action {self.name} in {elapsed:.0f}ms")
+        return self._instance
+
+    async def execute(
+        self,
+        params: dict[str, Any],
+        user_id: str,
+        channel: str,
+        engine: Any,
+    ) -> Any:
+        """Build the action if needed and execute it."""
+        return await self.get().execute(params=params, user_id=user_id, channel=channel, engine=engine)
+
+    async def stream(
+        self,
+        params: dict[str, Any],
+        user_id: str,
+        channel: str,
+        engine: Any,
+    ) -> AsyncIterator[Any]:
+        """Build the action if needed and stream its results."""
+        async for item in self.get().stream(params=params, user_id=user_id, channel=channel, engine=engine):
+            yield item
+
+    def should_cache(self, params: dict[str, Any]) -> bool:
+        """Delegate the action's cacheability check."""
+        check = getattr(self.get(), "should_cache", None)
+        return check(params) if check is not None else True
@@ -0,0 +1,198 @@
+"""
+SafeClaw Response Cache - Reuses action replies for repeated requests.
+
+Actions opt in by declaring how long a reply stays valid and which params
+identify it (see BaseAction.cache_ttl and cache_key), e.g. weather by
+location and units for 10 minutes. On a hit the action doesn't run at all.
+
+- LRU bounded by entry count and approximate bytes, with per-entry TTL
+- Single-flight: concurrent identical requests share one execution
+- Failed executions, and replies marked not cacheable, are never cached
+- Invalidation also covers executions still running: their replies are
+  returned to the requests waiting on them but not cached
+"""
+
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from opentelemetry import trace
+
+from safeclaw.actions.base import ActionResult, artifact_text
+from safeclaw.infra.telemetry import RESPONSE_CACHE_REQUESTS_TOTAL
+
+
+def estimate_result_size(result: ActionResult) -> int:
+    """Approximate memory used by a cached reply, in bytes."""
+    size = sys.getsizeof(result.text)
+    if result.artifact is not None:
+        size += sys.getsizeof(artifact_text(result.artifact))
+    return size
+
+
+def make_cache_key(
+    action: str,
+    params: dict[str, Any],
+    fields: tuple[str, ...],
+    user_id: str | None = None,
+) -> tuple:
+    """Build a cache key from an action name, its key params and optional user."""
+    return (action, user_id, tuple(repr(params.get(name)) for name in fields))
+
+
+class _AbandonedError(Exception):
+    """The execution a request was waiting on was cancelled."""
+
+
+class ResponseCache:
+    """LRU cache of action replies with TTLs and single-flight execution."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[ActionResult, float, int]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def configure(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Update limits."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def size_bytes(self) -> int:
+        """Approximate bytes used by all cached replies."""
+        return self._bytes
+
+    def get(self, key: tuple) -> ActionResult | None:
+        """Return the cached reply for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, result: ActionResult, ttl: float) -> None:
+        """Cache a reply for ttl seconds (float("inf") to keep it until evicted)."""
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        size = estimate_result_size(result)
+        self._entries[key] = (result, time.monotonic() + ttl, size)
+        self._bytes += size
+        self._evict()
+
+    async def get_or_run(
+        self,
+        key: tuple,
+        ttl: float,
+        run: Callable[[], Awaitable[ActionResult]],
+    ) -> ActionResult:
+        """
+        Return the cached reply for key, or run and cache it.
+
+        If the same key is already running, waits for that execution
+        instead of starting another.
+        """
+        action = key[0]
+        span = trace.get_current_span()
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            RESPONSE_CACHE_REQUESTS_TOTAL.labels(action=action, result="hit").inc()
+            span.set_attribute("safeclaw.cache", "hit")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            RESPONSE_CACHE_REQUESTS_TOTAL.labels(action=action, result="shared").inc()
+            span.set_attribute("safeclaw.cache", "shared")
+            try:
+                return await asyncio.shield(inflight)
+            except _AbandonedError:
+                return await self.get_or_run(key, ttl, run)
+
+        self.misses += 1
+        RESPONSE_CACHE_REQUESTS_TOTAL.labels(action=action, result="miss").inc()
+        span.set_attribute("safeclaw.cache", "miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except asyncio.CancelledError:
+            future.set_exception(_AbandonedError())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            # Gone or replaced if invalidated while running
+            current = self._inflight.get(key) is future
+            if current:
+                del self._inflight[key]
+            # Waiters retrieve the outcome; don't warn if there were none
+            if future.done() and not future.cancelled():
+                future.exception()
+
+        if result.cacheable and current:
+            self.put(key, result, ttl)
+        future.set_result(result)
+        return result
+
+    def invalidate(self, action: str | None = None, user_id: str | None = None) -> int:
+        """
+        Drop cached replies.
+
+        With no arguments drops everything; otherwise only replies of the
+        action, and/or for the user. Matching executions still running
+        won't cache their replies, and new requests don't wait on them.
+        Returns the number of cached replies dropped.
+        """
+        def matches(key: tuple) -> bool:
+            return (action is None or key[0] == action) and (user_id is None or key[1] == user_id)
+
+        for key in [key for key in self._inflight if matches(key)]:
+            del self._inflight[key]
+        keys = [key for key in self._entries if matches(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        lookups = self.hits + self.misses + self.shared
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "hit_ratio": (self.hits + self.shared) / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Drop least recently used replies until within limits."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
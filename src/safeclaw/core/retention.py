@@ -0,0 +1,113 @@
+"""
+SafeClaw Retention - Enforces memory.max_history and memory.retention_days.
+
+Without it, messages, the crawl cache and the key-value store grow
+forever, and expired rows are only skipped at read time. The engine runs
+a Compactor as a scheduled job; `safeclaw compact` runs it once. Each run:
+- deletes messages older than retention_days, and each user's messages
+  beyond their newest max_history, optionally archiving them first to
+  gzipped JSONL
+- deletes expired crawl cache entries and key-value pairs
+- returns freed pages to the file system (incremental vacuum)
+- checkpoints the WAL
+
+Deletes go in small batches, each its own transaction, so the writer is
+never held for long and messages keep being logged while it runs.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from safeclaw.core.memory import Memory
+from safeclaw.infra.telemetry import MEMORY_COMPACTION_SECONDS, MEMORY_ROWS_PRUNED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Scheduler job name
+COMPACTION_JOB = "memory_compaction"
+
+
+@dataclass
+class RetentionPolicy:
+    """What the compactor keeps, and how it deletes."""
+    # Newest messages kept per user, None to keep all
+    max_history: int | None = 1000
+    # Days messages are kept, None to keep them forever
+    retention_days: int | None = 365
+    # Rows deleted per transaction
+    batch_size: int = 500
+    # Free pages returned to the file system per step
+    vacuum_pages: int = 1000
+    # WAL checkpoint mode after a run (passive, full, restart or truncate)
+    checkpoint: str = "passive"
+    # Directory for gzipped JSONL archives of deleted messages, None to not archive
+    archive_dir: Path | None = None
+
+    @classmethod
+    def from_config(cls, memory_config: dict[str, Any]) -> "RetentionPolicy":
+        """Build a policy from the memory section of the config."""
+        retention = memory_config.get("retention", {})
+        archive = retention.get("archive")
+        return cls(
+            max_history=memory_config.get("max_history", cls.max_history) or None,
+            retention_days=memory_config.get("retention_days", cls.retention_days) or None,
+            batch_size=max(1, retention.get("batch_size", cls.batch_size)),
+            vacuum_pages=max(1, retention.get("vacuum_pages", cls.vacuum_pages)),
+            checkpoint=retention.get("checkpoint", cls.checkpoint),
+            archive_dir=Path(archive).expanduser() if archive else None,
+        )
+
+
+@dataclass
+class CompactionStats:
+    """What one compaction run removed."""
+    messages: int = 0
+    crawl_cache: int = 0
+    keyvalue: int = 0
+    freed_pages: int = 0
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "crawl_cache": self.crawl_cache,
+            "keyvalue": self.keyvalue,
+            "freed_pages": self.freed_pages,
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+class Compactor:
+    """Applies a retention policy to memory and compacts the database."""
+
+    def __init__(self, memory: Memory, policy: RetentionPolicy | None = None):
+        self.memory = memory
+        self.policy = policy or RetentionPolicy()
+
+    async def run(self) -> CompactionStats:
+        """Delete what the policy doesn't keep, then compact the database."""
+        policy = self.policy
+        start = time.perf_counter()
+        stats = CompactionStats()
+
+        stats.messages = await self.memory.prune_messages(
+            retention_days=policy.retention_days,
+            max_history=policy.max_history,
+            batch_size=policy.batch_size,
+            archive_dir=policy.archive_dir,
+        )
+        expired = await self.memory.prune_expired(batch_size=policy.batch_size)
+        stats.crawl_cache = expired["crawl_cache"]
+        stats.keyvalue = expired["keyvalue"]
+        stats.freed_pages = await self.memory.incremental_vacuum(policy.vacuum_pages)
+        await self.memory.checkpoint(policy.checkpoint)
+
+        stats.duration_ms = (time.perf_counter() - start) * 1000
+        MEMORY_COMPACTION_SECONDS.observe(stats.duration_ms / 1000)
+        for table in ("messages", "crawl_cache", "keyvalue"):
+            MEMORY_ROWS_PRUNED_TOTAL.labels(table=table).inc(getattr(stats, table))
+        logger.info(f"Memory compaction: {stats.to_dict()}")
+        return stats
@@ -4,8 +4,9 @@ SafeClaw Scheduler - Cron jobs, triggers, and timed events.
 Uses APScheduler for robust scheduling. No cloud required.
 """
 
+import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 
@@ -31,6 +32,9 @@ class Scheduler:
     def __init__(self) -> None:
         self._scheduler = AsyncIOScheduler()
         self._jobs: dict[str, str] = {}  # name -> job_id mapping
+        # Optional async runner(name, func) that async jobs are run through,
+        # e.g. the engine's scheduled lane
+        self.runner: Callable[[str, Callable], Awaitable[Any]] | None = None
 
     async def start(self) -> None:
         """Start the scheduler."""
@@ -76,12 +80,22 @@ class Scheduler:
             raise ValueError(f"Unknown trigger type: {trigger_type}")
 
         # Add job
+        if asyncio.iscoroutinefunction(func):
+            func = self._wrap(name, func)
         job = self._scheduler.add_job(func, trigger, id=name)
         self._jobs[name] = job.id
         logger.info(f"Added job: {name} ({trigger_type})")
 
         return job.id
 
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        """Route an async job through the runner, if one is set when it fires."""
+        async def run() -> Any:
+            if self.runner is None:
+                return await func()
+            return await self.runner(name, func)
+        return run
+
     def add_one_time(
         self,
         name: str,
@@ -0,0 +1,169 @@
+"""
+SafeClaw Startup Profiling - Import time and time to first response.
+
+Every CLI command and every fresh MCP container pays for Python imports
+before doing any work, so heavy dependencies (sumy/NLTK, dateparser,
+PyMuPDF, BeautifulSoup, ...) are imported where they're used, not at
+module level. This measures, each time in a fresh interpreter:
+- import time per module for `import safeclaw.cli` (python -X importtime)
+- time to first response: importing the CLI, create_engine(), starting
+  the engine and answering one message
+
+Run with `safeclaw debug startup`; tests/test_startup.py enforces the budgets.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import safeclaw
+
+# Must not be imported by `import safeclaw.cli`, create_engine() or
+# answering a help request; only the commands and actions that use them import them
+DEFERRED_MODULES = (
+    "sumy",
+    "nltk",
+    "dateparser",
+    "icalendar",
+    "feedparser",
+    "bs4",
+    "lxml",
+    "fitz",
+    "docx",
+    "httpx",
+    "pydantic_settings",
+)
+
+# Budgets in milliseconds, generous enough for a slow CI machine; a
+# dependency imported at module level again blows through them
+IMPORT_BUDGET_MS = 600
+FIRST_RESPONSE_BUDGET_MS = 2500
+
+# Run in a fresh interpreter; prints phase timings as JSON
+_FIRST_RESPONSE_SCRIPT = """
+import asyncio, json, sys, tempfile, time
+from pathlib import Path
+
+start = time.perf_counter()
+from safeclaw.cli import create_engine
+imported = time.perf_counter()
+
+config_path = {config!r}
+
+async def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        engine = create_engine(Path(config_path) if config_path else None, data_dir=Path(data_dir))
+        created = time.perf_counter()
+        await engine.start()
+        started = time.perf_counter()
+        reply = await engine.handle_message({text!r}, "cli", "startup_profile")
+        replied = time.perf_counter()
+        await engine.stop()
+    print(json.dumps({{
+        "import_ms": (imported - start) * 1000,
+        "create_engine_ms": (created - imported) * 1000,
+        "start_ms": (started - created) * 1000,
+        "response_ms": (replied - started) * 1000,
+        "total_ms": (replied - start) * 1000,
+        "reply": reply,
+        "modules": sorted(name for name in sys.modules if "." not in name),
+    }}))
+
+asyncio.run(main())
+"""
+
+
+@dataclass
+class ImportTiming:
+    """Import time of one module, from python -X importtime."""
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int  # 0 for modules imported directly by the profiled code
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "module": self.module,
+            "self_ms": round(self.self_ms, 2),
+            "cumulative_ms": round(self.cumulative_ms, 2),
+            "depth": self.depth,
+        }
+
+
+def _python(args: list[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter that imports this safeclaw checkout."""
+    env = dict(os.environ)
+    src = str(Path(safeclaw.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=timeout,
+        check=True,
+    )
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse python -X importtime output, in import completion order."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        timings.append(ImportTiming(
+            module=name.strip(),
+            self_ms=int(parts[0]) / 1000,
+            cumulative_ms=int(parts[1]) / 1000,
+            depth=(len(name) - len(name.lstrip()) - 1) // 2,
+        ))
+    return timings
+
+
+def measure_imports(module: str = "safeclaw.cli", timeout: float = 60) -> list[ImportTiming]:
+    """Import a module in a fresh interpreter and return per-module import times."""
+    result = _python(["-X", "importtime", "-c", f"import {module}"], timeout)
+    return parse_importtime(result.stderr)
+
+
+def import_time_ms(timings: list[ImportTiming], module: str = "safeclaw.cli") -> float:
+    """Cumulative import time of a module from measure_imports()."""
+    for timing in timings:
+        if timing.module == module:
+            return timing.cumulative_ms
+    raise ValueError(f"{module} was not imported")
+
+
+def deferred_imports(modules: list[str]) -> list[str]:
+    """Return the DEFERRED_MODULES among imported module names."""
+    top_level = {name.split(".")[0] for name in modules}
+    return [name for name in DEFERRED_MODULES if name in top_level]
+
+
+def measure_first_response(
+    text: str = "what can you do",
+    config_path: Path | None = None,
+    timeout: float = 120,
+) -> dict[str, Any]:
+    """
+    Time a cold start in a fresh interpreter, up to the reply to one message.
+
+    Uses a temporary data directory, so the user's memory isn't touched.
+
+    Returns:
+        Phase timings in ms (import_ms, create_engine_ms, start_ms,
+        response_ms, total_ms), the reply, and the top-level modules that
+        were imported
+    """
+    config = str(config_path) if config_path else ""
+    script = _FIRST_RESPONSE_SCRIPT.format(config=config, text=text)
+    result = _python(["-c", script], timeout)
+    return json.loads(result.stdout.strip().splitlines()[-1])
@@ -11,16 +11,18 @@ No GenAI required! Uses mathematical algorithms:
 
 import logging
 from enum import StrEnum
-
-from sumy.nlp.stemmers import Stemmer
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.summarizers.edmundson import EdmundsonSummarizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.summarizers.luhn import LuhnSummarizer
-from sumy.summarizers.text_rank import TextRankSummarizer
-from sumy.utils import get_stop_words
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+# sumy (and the NLTK it pulls in) is imported when a Summarizer is created,
+# not when this module is imported
+if TYPE_CHECKING:
+    from sumy.models.dom import ObjectDocumentModel
+    from sumy.summarizers.edmundson import EdmundsonSummarizer
+    from sumy.summarizers.lex_rank import LexRankSummarizer
+    from sumy.summarizers.lsa import LsaSummarizer
+    from sumy.summarizers.luhn import LuhnSummarizer
+    from sumy.summarizers.text_rank import TextRankSummarizer
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +56,10 @@ class Summarizer:
     ):
         self.language = language
         self.default_method = default_method
+
+        from sumy.nlp.stemmers import Stemmer
+        from sumy.utils import get_stop_words
+
         self.stemmer = Stemmer(language)
         self.stop_words = get_stop_words(language)
 
@@ -66,32 +72,42 @@ class Summarizer:
             SummaryMethod.EDMUNDSON: self._create_edmundson(),
         }
 
-    def _create_lsa(self) -> LsaSummarizer:
+    def _create_lsa(self) -> "LsaSummarizer":
         """Create LSA summarizer."""
+        from sumy.summarizers.lsa import LsaSummarizer
+
         summarizer = LsaSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         return summarizer
 
-    def _create_lexrank(self) -> LexRankSummarizer:
+    def _create_lexrank(self) -> "LexRankSummarizer":
         """Create LexRank summarizer."""
+        from sumy.summarizers.lex_rank import LexRankSummarizer
+
         summarizer = LexRankSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         return summarizer
 
-    def _create_textrank(self) -> TextRankSummarizer:
+    def _create_textrank(self) -> "TextRankSummarizer":
         """Create TextRank summarizer."""
+        from sumy.summarizers.text_rank import TextRankSummarizer
+
         summarizer = TextRankSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         return summarizer
 
-    def _create_luhn(self) -> LuhnSummarizer:
+    def _create_luhn(self) -> "LuhnSummarizer":
         """Create Luhn summarizer."""
+        from sumy.summarizers.luhn import LuhnSummarizer
+
         summarizer = LuhnSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         return summarizer
 
-    def _create_edmundson(self) -> EdmundsonSummarizer:
+    def _create_edmundson(self) -> "EdmundsonSummarizer":
         """Create Edmundson summarizer."""
+        from sumy.summarizers.edmundson import EdmundsonSummarizer
+
         summarizer = EdmundsonSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         # Bonus/stigma words for Edmundson
@@ -100,6 +116,13 @@ class Summarizer:
         summarizer.null_words = self.stop_words
         return summarizer
 
+    def _parse(self, text: str) -> "ObjectDocumentModel":
+        """Split text into sentences and words for the summarizers."""
+        from sumy.nlp.tokenizers import Tokenizer
+        from sumy.parsers.plaintext import PlaintextParser
+
+        return PlaintextParser.from_string(text, Tokenizer(self.language)).document
+
     def summarize(
         self,
         text: str,
@@ -123,7 +146,7 @@ class Summarizer:
             return ""
 
         # Parse text
-        parser = PlaintextParser.from_string(text, Tokenizer(self.language))
+        document = self._parse(text)
 
         # Get summarizer
         summarizer = self._summarizers.get(method)
@@ -133,7 +156,7 @@ class Summarizer:
 
         # Generate summary
         try:
-            summary_sentences = summarizer(parser.document, sentences)
+            summary_sentences = summarizer(document, sentences)
             return " ".join(str(sentence) for sentence in summary_sentences)
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
@@ -157,11 +180,11 @@ class Summarizer:
         if not text or not text.strip():
             return []
 
-        parser = PlaintextParser.from_string(text, Tokenizer(self.language))
+        document = self._parse(text)
         summarizer = self._summarizers.get(method, self._summarizers[SummaryMethod.LEXRANK])
 
         try:
-            summary_sentences = summarizer(parser.document, points)
+            summary_sentences = summarizer(document, points)
             return [str(sentence).strip() for sentence in summary_sentences]
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
@@ -221,3 +244,24 @@ class Summarizer:
         # Count and return top N
         counter = Counter(words)
         return [word for word, _ in counter.most_common(top_n)]
+
+
+@lru_cache(maxsize=8)
+def get_summarizer(language: str = "english") -> Summarizer:
+    """Return this process's shared Summarizer for a language, creating it on first use."""
+    return Summarizer(language=language)
+
+
+def summarize_text(
+    text: str,
+    sentences: int = 5,
+    method: SummaryMethod | None = None,
+    language: str = "english",
+) -> str:
+    """
+    Summarize text with the process's shared Summarizer.
+
+    A module-level function, so process pools only pickle the text and
+    parameters. Each worker process builds its summarizers once.
+    """
+    return get_summarizer(language).summarize(text, sentences, method)
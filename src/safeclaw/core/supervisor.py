@@ -0,0 +1,448 @@
+"""
+SafeClaw Supervisor - Engine worker processes sharded by user id.
+
+One engine runs on one event loop, so parsing, summarization and HTML
+parsing all share a single core. In supervisor mode (`safeclaw run
+--workers N`) the supervisor keeps the channels and starts N engine worker
+processes to do the work:
+- Each message goes to the worker that owns its user id on a consistent
+  hash ring, so a user's messages stay in order and their learned patterns
+  and cached replies stay in one process. Changing the number of workers
+  only moves about 1/N of the users.
+- Webhook events are routed by webhook name.
+- Workers share the SQLite store, which runs in WAL mode with a busy timeout.
+- Scheduled jobs (reminders) run on the worker of the user who created
+  them and are delivered through the supervisor's channels. Memory
+  compaction only runs on the first worker.
+- A worker that dies is restarted; its in-flight messages get an error reply.
+
+Workers talk to the supervisor over a socket pair, one JSON message per line.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import json
+import logging
+import multiprocessing
+import socket
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import yaml  # type: ignore
+
+from safeclaw.core.dispatcher import BUSY_REPLY, INTERACTIVE, SHUTDOWN_REPLY
+from safeclaw.core.retention import COMPACTION_JOB
+from safeclaw.infra.telemetry import (
+    SHARD_MESSAGES_TOTAL,
+    WORKER_RESTARTS_TOTAL,
+    request_scope,
+    start_span,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_LOST_REPLY = "Sorry, something went wrong while handling that. Please try again."
+
+# Largest message between supervisor and workers (a reply with a long crawl)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# Seconds a new worker has to build its engine and report ready
+READY_TIMEOUT = 60
+
+
+def load_config_file(config_path: Path) -> dict[str, Any]:
+    """Read a YAML config file, or return {} if it doesn't exist."""
+    if not config_path.exists():
+        return {}
+    with open(config_path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash; Python's hash() differs between processes."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to shards, with virtual nodes per shard."""
+
+    def __init__(self, shards: int, virtual_nodes: int = 64):
+        if shards < 1:
+            raise ValueError("A hash ring needs at least one shard")
+        points = sorted(
+            (_hash(f"shard-{shard}-{node}"), shard)
+            for shard in range(shards)
+            for node in range(max(1, virtual_nodes))
+        )
+        self.shards = shards
+        self._points = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        """Return the shard that owns a key."""
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    writer.write(json.dumps(message, default=str).encode() + b"\n")
+    await writer.drain()
+
+
+async def _connect(sock: socket.socket) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.open_connection(sock=sock, limit=MAX_FRAME_BYTES)
+
+
+# ---- Worker process ----
+
+class _RemoteChannel:
+    """A supervisor channel as seen from a worker: sends go back to the supervisor."""
+
+    def __init__(self, name: str, writer: asyncio.StreamWriter):
+        self.name = name
+        self._writer = writer
+
+    async def send(self, user_id: str, message: str) -> None:
+        await _send(self._writer, {"op": "send", "channel": self.name, "user_id": user_id, "text": message})
+
+
+def _worker_main(
+    shard: int,
+    factory: Callable[..., Any],
+    config_path: Path | None,
+    data_dir: Path | None,
+    sock: socket.socket,
+    channels: list[str],
+) -> None:
+    """Entry point of a worker process."""
+    logging.basicConfig(level=logging.INFO, format=f"[worker {shard}] %(name)s: %(message)s")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(shard, factory, config_path, data_dir, sock, channels))
+
+
+async def _serve(
+    shard: int,
+    factory: Callable[..., Any],
+    config_path: Path | None,
+    data_dir: Path | None,
+    sock: socket.socket,
+    channels: list[str],
+) -> None:
+    """Run an engine without channels and answer the supervisor's requests."""
+    reader, writer = await _connect(sock)
+    engine = factory(config_path, data_dir)
+    for name in channels:
+        engine.register_channel(name, _RemoteChannel(name, writer))
+    # Without channels of its own, start() returns once the engine is up
+    await engine.start()
+    if shard != 0:
+        # The workers share one database; compacting it once is enough
+        engine.scheduler.remove_job(COMPACTION_JOB)
+    await _send(writer, {"op": "ready", "help": engine.get_help()})
+
+    tasks: set[asyncio.Task] = set()
+
+    async def answer(message: dict[str, Any]) -> None:
+        try:
+            reply = await engine.handle_message(
+                message["text"],
+                message["channel"],
+                message["user_id"],
+                message.get("metadata"),
+                lane=message.get("lane", INTERACTIVE),
+            )
+        except Exception as e:
+            logger.exception(f"Message failed: {e}")
+            reply = WORKER_LOST_REPLY
+        await _send(writer, {"id": message["id"], "reply": reply})
+
+    async def run_webhook(message: dict[str, Any]) -> None:
+        event = SimpleNamespace(name=message["name"], payload=message["payload"])
+        with request_scope(message.get("request_id")):
+            await engine._run_webhook(message["action"], event)
+
+    try:
+        while line := await reader.readline():
+            message = json.loads(line)
+            if message["op"] == "message":
+                task = asyncio.create_task(answer(message))
+            elif message["op"] == "webhook":
+                task = asyncio.create_task(run_webhook(message))
+            elif message["op"] == "stop":
+                break
+            else:
+                logger.warning(f"Unknown supervisor request: {message['op']}")
+                continue
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        # Answers whatever is still queued with the shutdown reply
+        await engine.stop()
+        if tasks:
+            await asyncio.wait(tasks, timeout=5)
+        writer.close()
+
+
+# ---- Supervisor ----
+
+class _Worker:
+    """Supervisor side of one worker process."""
+
+    def __init__(self, shard: int):
+        self.shard = shard
+        self.process: Any = None
+        self.writer: asyncio.StreamWriter | None = None
+        self.reader_task: asyncio.Task | None = None
+        self.ready: asyncio.Future | None = None
+        self.pending: dict[int, asyncio.Future] = {}
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class Supervisor:
+    """
+    Runs engine worker processes and routes channel traffic to them.
+
+    Channels are registered and started here exactly as with SafeClaw; they
+    only need handle_message() (and get_help()) from their engine.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        processes: int,
+        config_path: Path | None = None,
+        data_dir: Path | None = None,
+        virtual_nodes: int = 64,
+        restart_delay: float = 1.0,
+    ):
+        """
+        Args:
+            factory: Module-level function building a worker's engine from
+                (config_path, data_dir), e.g. safeclaw.cli.create_engine
+            processes: Number of engine worker processes
+        """
+        self.factory = factory
+        self.config_path = config_path
+        self.data_dir = data_dir
+        self.restart_delay = restart_delay
+        self.config: dict[str, Any] = load_config_file(config_path or Path("config/config.yaml"))
+        self.ring = HashRing(processes, virtual_nodes)
+        self.channels: dict[str, Any] = {}
+        self.running = False
+        self._workers = [_Worker(shard) for shard in range(processes)]
+        self._next_id = 0
+        self._help = ""
+        self._tasks: set[asyncio.Task] = set()
+        self._context = multiprocessing.get_context("spawn")
+
+    def register_channel(self, name: str, channel: Any) -> None:
+        """Register a communication channel."""
+        self.channels[name] = channel
+        logger.info(f"Registered channel: {name}")
+
+    def get_help(self) -> str:
+        """Help text, as reported by the first worker."""
+        return self._help
+
+    async def handle_message(
+        self,
+        text: str,
+        channel: str,
+        user_id: str,
+        metadata: dict | None = None,
+        lane: str = INTERACTIVE,
+    ) -> str:
+        """Send a message to the worker that owns the user and return its reply."""
+        metadata = dict(metadata or {})
+        worker = self._workers[self.ring.shard_for(user_id)]
+        with request_scope(metadata.get("request_id")) as request_id:
+            metadata["request_id"] = request_id
+            with start_span("safeclaw.route", attributes={"safeclaw.shard": worker.shard, "safeclaw.request_id": request_id}):
+                if not self.running:
+                    return SHUTDOWN_REPLY
+                if worker.writer is None:
+                    # Being restarted
+                    return BUSY_REPLY
+                SHARD_MESSAGES_TOTAL.labels(shard=str(worker.shard)).inc()
+                self._next_id += 1
+                message_id = self._next_id
+                future = asyncio.get_running_loop().create_future()
+                worker.pending[message_id] = future
+                try:
+                    await _send(worker.writer, {
+                        "op": "message",
+                        "id": message_id,
+                        "text": text,
+                        "channel": channel,
+                        "user_id": user_id,
+                        "metadata": metadata,
+                        "lane": lane,
+                    })
+                except ConnectionError:
+                    worker.pending.pop(message_id, None)
+                    return BUSY_REPLY
+                return await future
+
+    async def start(self) -> None:
+        """Start the workers, then the channels."""
+        logger.info(f"Starting SafeClaw supervisor with {len(self._workers)} workers...")
+        self.running = True
+        await asyncio.gather(*(self._spawn(worker) for worker in self._workers))
+
+        channel_tasks = []
+        for name, channel in self.channels.items():
+            if hasattr(channel, "start"):
+                channel_tasks.append(asyncio.create_task(channel.start()))
+                logger.info(f"Started channel: {name}")
+            if hasattr(channel, "get_event"):
+                channel_tasks.append(asyncio.create_task(self._route_webhooks(channel)))
+
+        try:
+            await asyncio.gather(*channel_tasks)
+        except asyncio.CancelledError:
+            logger.info("SafeClaw supervisor shutting down...")
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Stop the channels, then let each worker finish and exit."""
+        logger.info("Stopping SafeClaw supervisor...")
+        self.running = False
+
+        for name, channel in self.channels.items():
+            if hasattr(channel, "stop"):
+                await channel.stop()
+                logger.info(f"Stopped channel: {name}")
+
+        for worker in self._workers:
+            if worker.writer is not None:
+                with contextlib.suppress(ConnectionError):
+                    await _send(worker.writer, {"op": "stop"})
+        for worker in self._workers:
+            if worker.process is not None:
+                await asyncio.to_thread(worker.process.join, timeout)
+                if worker.process.is_alive():
+                    logger.warning(f"Worker {worker.shard} didn't exit, terminating it")
+                    worker.process.terminate()
+            if worker.reader_task is not None:
+                worker.reader_task.cancel()
+            self._fail_pending(worker, SHUTDOWN_REPLY)
+        logger.info("SafeClaw supervisor stopped.")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return per-worker state."""
+        return {
+            "workers": [
+                {
+                    "shard": worker.shard,
+                    "pid": worker.process.pid if worker.process is not None else None,
+                    "alive": worker.alive,
+                    "in_flight": len(worker.pending),
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ],
+        }
+
+    async def _spawn(self, worker: _Worker) -> None:
+        """Start a worker process and wait until its engine is up."""
+        parent, child = socket.socketpair()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(worker.shard, self.factory, self.config_path, self.data_dir, child, list(self.channels)),
+            name=f"safeclaw-worker-{worker.shard}",
+            daemon=True,
+        )
+        worker.process.start()
+        child.close()
+
+        reader, worker.writer = await _connect(parent)
+        worker.ready = asyncio.get_running_loop().create_future()
+        worker.reader_task = asyncio.create_task(self._read(worker, reader))
+        await asyncio.wait_for(asyncio.shield(worker.ready), READY_TIMEOUT)
+        logger.info(f"Worker {worker.shard} ready (pid {worker.process.pid})")
+
+    async def _read(self, worker: _Worker, reader: asyncio.StreamReader) -> None:
+        """Handle replies and channel sends from a worker until it exits."""
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if "id" in message:
+                    future = worker.pending.pop(message["id"], None)
+                    if future is not None and not future.done():
+                        future.set_result(message["reply"])
+                elif message["op"] == "send":
+                    self._deliver(message)
+                elif message["op"] == "ready":
+                    if worker.shard == 0:
+                        self._help = message["help"]
+                    if worker.ready is not None and not worker.ready.done():
+                        worker.ready.set_result(True)
+        except (ConnectionError, ValueError) as e:
+            logger.error(f"Lost connection to worker {worker.shard}: {e}")
+
+        worker.writer = None
+        self._fail_pending(worker, WORKER_LOST_REPLY)
+        if worker.ready is not None and not worker.ready.done():
+            worker.ready.set_exception(RuntimeError(f"Worker {worker.shard} exited during startup"))
+        elif self.running:
+            logger.error(f"Worker {worker.shard} exited, restarting it")
+            self._background(self._restart(worker))
+
+    async def _restart(self, worker: _Worker) -> None:
+        await asyncio.sleep(self.restart_delay)
+        if not self.running:
+            return
+        worker.restarts += 1
+        WORKER_RESTARTS_TOTAL.labels(shard=str(worker.shard)).inc()
+        try:
+            await self._spawn(worker)
+        except (RuntimeError, TimeoutError) as e:
+            logger.error(f"Couldn't restart worker {worker.shard}: {e}")
+
+    def _deliver(self, message: dict[str, Any]) -> None:
+        """Send a worker's outgoing message (e.g. a reminder) through a channel."""
+        channel = self.channels.get(message["channel"])
+        if channel is None or not hasattr(channel, "send"):
+            logger.warning(f"Can't deliver to channel {message['channel']}")
+            return
+        self._background(channel.send(message["user_id"], message["text"]))
+
+    async def _route_webhooks(self, server: Any) -> None:
+        """Hand incoming webhook events to the worker that owns the webhook."""
+        while True:
+            event = await server.get_event()
+            handler = server.handlers.get(event.name)
+            if handler is None:
+                logger.warning(f"No action configured for webhook: {event.name}")
+                continue
+            worker = self._workers[self.ring.shard_for(f"webhook:{event.name}")]
+            if worker.writer is None:
+                logger.warning(f"Dropped webhook event {event.name}: worker {worker.shard} is down")
+                continue
+            with request_scope() as request_id:
+                await _send(worker.writer, {
+                    "op": "webhook",
+                    "name": event.name,
+                    "action": handler.action,
+                    "payload": event.payload,
+                    "request_id": request_id,
+                })
+
+    def _fail_pending(self, worker: _Worker, reply: str) -> None:
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_result(reply)
+        worker.pending.clear()
+
+    def _background(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
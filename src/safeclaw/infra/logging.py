@@ -5,6 +5,18 @@ from datetime import UTC, datetime
 from typing import Any
 
 from safeclaw.config.settings import settings
+from safeclaw.infra.telemetry import get_request_id
+
+
+class RequestIdFilter(logging.Filter):
+    """Tag records with the id of the request being handled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            request_id = get_request_id()
+            if request_id is not None:
+                record.request_id = request_id
+        return True
 
 
 class JSONFormatter(logging.Formatter):
@@ -38,6 +50,7 @@ class JSONFormatter(logging.Formatter):
 def configure_logging() -> None:
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JSONFormatter())
+    handler.addFilter(RequestIdFilter())
 
     root_logger = logging.getLogger()
     root_logger.setLevel(settings.LOG_LEVEL)
@@ -1,10 +1,17 @@
+import functools
+import inspect
+import logging
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
 from opentelemetry import trace
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.semconv.resource import ResourceAttributes
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
-from safeclaw.config.settings import settings
+logger = logging.getLogger(__name__)
 
 # Prometheus Metrics
 HTTP_REQUESTS_TOTAL = Counter(
@@ -37,16 +44,280 @@ CERBOS_DECISION_TOTAL = Counter(
     ["result", "resource", "action"]
 )
 
+PARSE_CACHE_REQUESTS_TOTAL = Counter(
+    "safeclaw_parse_cache_requests_total",
+    "Total number of parse cache lookups",
+    ["result"]
+)
+
+DISPATCH_QUEUE_DEPTH = Gauge(
+    "safeclaw_dispatch_queue_depth",
+    "Number of jobs waiting for an engine worker",
+    ["lane"]
+)
+
+DISPATCH_WAIT_SECONDS = Histogram(
+    "safeclaw_dispatch_wait_seconds",
+    "Time jobs spend queued before an engine worker picks them up",
+    ["lane"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+DISPATCH_LATENCY_SECONDS = Histogram(
+    "safeclaw_dispatch_latency_seconds",
+    "Time from queueing a job to its result, including the wait",
+    ["lane"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+DISPATCH_REJECTED_TOTAL = Counter(
+    "safeclaw_dispatch_rejected_total",
+    "Total number of jobs turned away because their lane was full",
+    ["lane", "reason"]
+)
+
+SHARD_MESSAGES_TOTAL = Counter(
+    "safeclaw_shard_messages_total",
+    "Total number of messages the supervisor routed to each engine worker",
+    ["shard"]
+)
+
+WORKER_RESTARTS_TOTAL = Counter(
+    "safeclaw_worker_restarts_total",
+    "Total number of engine worker processes restarted after exiting",
+    ["shard"]
+)
+
+ACTION_TIMEOUTS_TOTAL = Counter(
+    "safeclaw_action_timeouts_total",
+    "Total number of actions abandoned after running past their timeout",
+    ["action"]
+)
+
+RESPONSE_CACHE_REQUESTS_TOTAL = Counter(
+    "safeclaw_response_cache_requests_total",
+    "Total number of response cache lookups (hit, miss, or shared in-flight execution)",
+    ["action", "result"]
+)
+
+MEMORY_READ_WAIT_SECONDS = Histogram(
+    "safeclaw_memory_read_wait_seconds",
+    "Time queries wait for a connection from the memory read pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+
+MEMORY_WRITE_WAIT_SECONDS = Histogram(
+    "safeclaw_memory_write_wait_seconds",
+    "Time writes wait for the memory writer connection (another write or transaction)",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+
+MEMORY_ROWS_PRUNED_TOTAL = Counter(
+    "safeclaw_memory_rows_pruned_total",
+    "Total number of rows deleted by memory retention",
+    ["table"]
+)
+
+MEMORY_COMPACTION_SECONDS = Histogram(
+    "safeclaw_memory_compaction_seconds",
+    "Duration of memory retention and compaction runs",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+)
+
+MEMORY_READ_CONNECTIONS_IN_USE = Gauge(
+    "safeclaw_memory_read_connections_in_use",
+    "Number of memory read pool connections running a query"
+)
+
 # OpenTelemetry Setup
-def configure_telemetry() -> None:
-    resource = Resource.create(attributes={
-        ResourceAttributes.SERVICE_NAME: settings.MCP_SERVER_NAME,
-        ResourceAttributes.SERVICE_VERSION: "0.1.0",
-        ResourceAttributes.DEPLOYMENT_ENVIRONMENT: settings.APP_ENV,
-    })
-
-    trace.set_tracer_provider(TracerProvider(resource=resource))
-    # In a real setup, we would add OTLP exporter here.
-    # For now, we rely on auto-instrumentation or manual spans.
-
-tracer = trace.get_tracer(__name__)
+EXPORTERS = ("none", "console", "file", "otlp")
+
+_provider: Any = None
+
+
+def configure_telemetry(
+    exporter: Any = None,
+    endpoint: str | None = None,
+    file_path: str | Path | None = None,
+    service_name: str | None = None,
+    sample_ratio: float | None = None,
+    batch: dict[str, int] | None = None,
+) -> bool:
+    """
+    Export spans through a batch span processor.
+
+    Exporters: "none" (spans aren't recorded), "console" (stdout), "file"
+    (one JSON span per line, for offline use) and "otlp" (HTTP collector,
+    pip install safeclaw[otlp]), or a SpanExporter instance. Without an
+    exporter, it and any arguments not given are read from the OTEL_*
+    settings. Batch takes max_queue_size, schedule_delay_ms,
+    max_export_batch_size and export_timeout_ms. If a tracer provider is
+    already installed, the exporter is added to it.
+
+    Returns True if spans are exported.
+    """
+    global _provider
+
+    if exporter is None:
+        # Settings import pydantic-settings; only the MCP server needs them
+        from safeclaw.config.settings import settings
+
+        exporter = settings.OTEL_EXPORTER
+        endpoint = endpoint or settings.OTEL_EXPORTER_ENDPOINT
+        file_path = file_path or settings.OTEL_TRACES_FILE
+        service_name = service_name or settings.MCP_SERVER_NAME
+        sample_ratio = settings.OTEL_SAMPLE_RATIO if sample_ratio is None else sample_ratio
+
+    if isinstance(exporter, str) and exporter not in EXPORTERS:
+        raise ValueError(f"Unknown span exporter '{exporter}', expected one of {EXPORTERS}")
+    if exporter == "none":
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.semconv.resource import ResourceAttributes
+
+    span_exporter = _make_exporter(exporter, endpoint, file_path)
+    batch = batch or {}
+    processor = BatchSpanProcessor(
+        span_exporter,
+        max_queue_size=batch.get("max_queue_size"),
+        schedule_delay_millis=batch.get("schedule_delay_ms"),
+        max_export_batch_size=batch.get("max_export_batch_size"),
+        export_timeout_millis=batch.get("export_timeout_ms"),
+    )
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        from safeclaw import __version__
+
+        provider = TracerProvider(
+            resource=Resource.create(attributes={
+                ResourceAttributes.SERVICE_NAME: service_name or "safeclaw",
+                ResourceAttributes.SERVICE_VERSION: __version__,
+            }),
+            sampler=ParentBased(TraceIdRatioBased(1.0 if sample_ratio is None else sample_ratio)),
+        )
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(processor)
+    _provider = provider
+    logger.info(f"Exporting spans to {exporter if isinstance(exporter, str) else type(exporter).__name__}")
+    return True
+
+
+def _make_exporter(exporter: Any, endpoint: str | None, file_path: str | Path | None) -> Any:
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if not isinstance(exporter, str):
+        return exporter
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    if exporter == "file":
+        path = Path(file_path or "~/.safeclaw/traces.jsonl").expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return ConsoleSpanExporter(
+            out=open(path, "a", buffering=1, encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        raise ValueError("The otlp exporter needs: pip install safeclaw[otlp]") from e
+    return OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+
+
+def shutdown_telemetry() -> None:
+    """Flush and stop span export started by configure_telemetry()."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+tracer = trace.get_tracer("safeclaw")
+
+_NO_SPAN = nullcontext(trace.INVALID_SPAN)
+
+
+# SafeClaw's own spans are only started once configure_telemetry() has
+# installed an exporter. The parser and memory run them on every message,
+# and even no-op OpenTelemetry spans cost microseconds each.
+def start_span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    kind: trace.SpanKind = trace.SpanKind.INTERNAL,
+) -> Any:
+    """Start a span as the current span, for use in a with statement."""
+    if _provider is None:
+        return _NO_SPAN
+    return tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+
+def traced(name: str, attributes: dict[str, Any] | None = None) -> Callable:
+    """Decorator that runs a function, sync or async, in a span."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _provider is None:
+                    return await func(*args, **kwargs)
+                with tracer.start_as_current_span(name, attributes=attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _provider is None:
+                return func(*args, **kwargs)
+            with tracer.start_as_current_span(name, attributes=attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def http_span(method: str, url: str) -> Any:
+    """Client span for an outbound HTTP request; callers add the status code."""
+    return start_span(
+        f"HTTP {method}",
+        attributes={"http.request.method": method, "url.full": url},
+        kind=trace.SpanKind.CLIENT,
+    )
+
+
+# Request ids: set where a request enters (a channel message, an MCP tool
+# call) and carried by the context into everything it runs, including
+# dispatcher workers and executor threads, down to the audit log
+_request_id: ContextVar[str | None] = ContextVar("safeclaw_request_id", default=None)
+
+
+def new_request_id() -> str:
+    return f"req_{uuid.uuid4().hex[:16]}"
+
+
+def get_request_id() -> str | None:
+    """Id of the request being handled, if any."""
+    return _request_id.get()
+
+
+@contextmanager
+def request_scope(request_id: str | None = None) -> Iterator[str]:
+    """
+    Handle a request under an id.
+
+    Without an id, keeps the current request's id (nested requests, e.g.
+    a voice command re-entering the engine) or makes a new one.
+    """
+    request_id = request_id or _request_id.get() or new_request_id()
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def current_trace_id() -> str | None:
+    """Hex id of the current trace, if spans are being recorded."""
+    context = trace.get_current_span().get_span_context()
+    return trace.format_trace_id(context.trace_id) if context.is_valid else None
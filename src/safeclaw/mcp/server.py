@@ -12,7 +12,7 @@ from safeclaw.auth.middleware import get_principal
 from safeclaw.config.settings import settings
 from safeclaw.core.service import service
 from safeclaw.infra.logging import configure_logging
-from safeclaw.infra.telemetry import configure_telemetry
+from safeclaw.infra.telemetry import configure_telemetry, shutdown_telemetry
 
 # Configure Infrastructure
 configure_logging()
@@ -27,6 +27,7 @@ async def server_lifespan(server: FastMCP):
     logger.info("MCP Server started")
     yield
     await service.shutdown()
+    shutdown_telemetry()
     logger.info("MCP Server stopped")
 
 
@@ -1,3 +1,5 @@
+import functools
+from collections.abc import Callable
 from typing import Any
 
 from cerbos.sdk.model import Resource
@@ -9,12 +11,27 @@ from safeclaw.actions.summarize import SummarizeAction
 from safeclaw.auth.client import auth_client
 from safeclaw.auth.middleware import get_principal
 from safeclaw.core.service import service
+from safeclaw.infra.telemetry import request_scope, start_span
 from safeclaw.mcp.server import mcp
 
 # Instantiate action handlers
 crawl_action = CrawlAction()
 summarize_action = SummarizeAction()
 
+def _traced_tool(func: Callable) -> Callable:
+    """Run a tool call in a span, under the MCP request's id."""
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        ctx = kwargs.get("ctx") or next((arg for arg in args if isinstance(arg, Context)), None)
+        mcp_request_id = getattr(ctx, "request_id", None)
+        with request_scope(f"mcp_{mcp_request_id}" if mcp_request_id else None) as request_id:
+            with start_span(
+                f"mcp.{func.__name__}", attributes={"safeclaw.request_id": request_id}
+            ):
+                return await func(*args, **kwargs)
+    return wrapper
+
+
 async def _check_auth(ctx: Context, action: str, resource_kind: str, resource_id: str, attrs: dict[str, Any] | None = None) -> None:
     """Helper to check authorization."""
     principal = await get_principal(ctx)
@@ -29,6 +46,7 @@ async def _check_auth(ctx: Context, action: str, resource_kind: str, resource_id
 
 
 @mcp.tool()
+@_traced_tool
 async def get_weather(location: str, ctx: Context, units: str = "imperial") -> str:
     """
     Get weather forecast for a location.
@@ -43,10 +61,11 @@ async def get_weather(location: str, ctx: Context, units: str = "imperial") -> s
     params = {"location": location, "units": units}
 
     # Weather action is a module-level function
-    return await weather.execute(params, "mcp_user", "mcp", engine)
+    return str(await weather.execute(params, "mcp_user", "mcp", engine))
 
 
 @mcp.tool()
+@_traced_tool
 async def crawl_url(url: str, ctx: Context, depth: int = 0, same_domain: bool = True) -> str:
     """
     Crawl a website and extract links.
@@ -65,11 +84,12 @@ async def crawl_url(url: str, ctx: Context, depth: int = 0, same_domain: bool =
         "same_domain": same_domain
     }
 
-    # CrawlAction is a class
-    return await crawl_action.execute(params, "mcp_user", "mcp", engine)
+    # CrawlAction is a class; its ActionResult carries the CrawlResult artifact
+    return str(await crawl_action.execute(params, "mcp_user", "mcp", engine))
 
 
 @mcp.tool()
+@_traced_tool
 async def summarize_content(target: str, ctx: Context, sentences: int = 5) -> str:
     """
     Summarize text or a webpage.
@@ -92,6 +112,7 @@ async def summarize_content(target: str, ctx: Context, sentences: int = 5) -> st
 
 # Add flush cache tool
 @mcp.tool()
+@_traced_tool
 async def admin_flush_cache(ctx: Context) -> str:
     """
     Flush the Cerbos decision cache (Admin only).
@@ -26,6 +26,25 @@ class PluginInfo:
     keywords: list[str] = field(default_factory=list)
     patterns: list[str] = field(default_factory=list)
     examples: list[str] = field(default_factory=list)
+    # Load on first use instead of at startup. Set False for plugins whose
+    # on_load() must run right away.
+    lazy: bool = True
+
+    def intent_pattern(self) -> dict | None:
+        """
+        Convert the info to an IntentPattern dict for the parser.
+        Returns None if no keywords/patterns defined.
+        """
+        if not self.keywords and not self.patterns:
+            return None
+
+        return {
+            "intent": self.name,
+            "keywords": self.keywords,
+            "patterns": self.patterns,
+            "examples": self.examples,
+            "slots": [],
+        }
 
 
 class BasePlugin(ABC):
@@ -98,14 +117,4 @@ class BasePlugin(ABC):
         if not hasattr(cls, 'info'):
             return None
 
-        info = cls.info
-        if not info.keywords and not info.patterns:
-            return None
-
-        return {
-            "intent": info.name,
-            "keywords": info.keywords,
-            "patterns": info.patterns,
-            "examples": info.examples,
-            "slots": [],
-        }
+        return cls.info.intent_pattern()
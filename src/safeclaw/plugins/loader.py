@@ -1,7 +1,15 @@
 """
 SafeClaw Plugin Loader - Discovers and loads plugins from directories.
+
+Plugins are discovered from their metadata without being imported: the
+`info = PluginInfo(...)` literal in each plugin file is read with ast, which
+is enough to register the plugin's action and intent. The module is only
+imported, and the plugin instantiated, when its intent is first used.
+Plugins whose info isn't a plain literal, or that set lazy=False, are
+loaded at startup as before.
 """
 
+import ast
 import importlib.util
 import logging
 from pathlib import Path
@@ -13,6 +21,41 @@ from safeclaw.plugins.base import BasePlugin, PluginInfo
 logger = logging.getLogger(__name__)
 
 
+def read_plugin_info(file_path: Path) -> PluginInfo | None:
+    """
+    Read a plugin's PluginInfo from its source without importing it.
+
+    Returns None if the file has no `info = PluginInfo(...)` class attribute
+    made only of literals.
+    """
+    try:
+        tree = ast.parse(file_path.read_text(encoding="utf-8"), filename=str(file_path))
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.error(f"Could not read plugin {file_path}: {e}")
+        return None
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for statement in node.body:
+            if not (
+                isinstance(statement, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == "info" for t in statement.targets)
+                and isinstance(statement.value, ast.Call)
+                and isinstance(statement.value.func, ast.Name)
+                and statement.value.func.id == "PluginInfo"
+            ):
+                continue
+            call = statement.value
+            try:
+                args = [ast.literal_eval(arg) for arg in call.args]
+                kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords if kw.arg}
+                return PluginInfo(*args, **kwargs)
+            except (ValueError, TypeError):
+                return None
+    return None
+
+
 class PluginLoader:
     """
     Discovers and loads plugins from the plugins directories.
@@ -25,6 +68,8 @@ class PluginLoader:
 
     def __init__(self) -> None:
         self.plugins: dict[str, BasePlugin] = {}
+        # Plugins registered for loading on first use, by name
+        self.available: dict[str, PluginInfo] = {}
         self._plugin_dir = Path(__file__).parent
 
     def discover_plugins(self) -> list[str]:
@@ -46,26 +91,70 @@ class PluginLoader:
 
         return found
 
-    def load_all(self, engine: Any) -> dict[str, BasePlugin]:
+    def load_all(self, engine: Any, lazy: bool = True) -> dict[str, BasePlugin]:
         """
         Load all discovered plugins.
 
+        With lazy set, plugins whose metadata can be read without importing
+        them are registered now and loaded on first use.
+
         Returns dict of loaded plugins {name: instance}.
         """
         discovered = self.discover_plugins()
 
         for plugin_path in discovered:
             try:
-                self.load_plugin(plugin_path, engine)
+                info = read_plugin_info(self._resolve(plugin_path)[0]) if lazy else None
+                if info is not None and info.lazy:
+                    self.register_lazy(plugin_path, info, engine)
+                else:
+                    self.load_plugin(plugin_path, engine)
             except Exception as e:
                 logger.error(f"Failed to load plugin {plugin_path}: {e}")
 
         return self.plugins
 
+    def _resolve(self, plugin_path: str) -> tuple[Path, str]:
+        """Return the file and module name for a plugin path."""
+        parts = plugin_path.split("/")
+        if len(parts) == 2:
+            subdir, name = parts
+            return self._plugin_dir / subdir / f"{name}.py", name
+        # Direct file path
+        file_path = Path(plugin_path)
+        return file_path, file_path.stem
+
+    def register_lazy(self, plugin_path: str, info: PluginInfo, engine: Any) -> None:
+        """Register a plugin's action and intent now, and load it on first use."""
+        def build() -> BasePlugin:
+            instance = self.load_plugin(plugin_path, engine, register=False)
+            if instance is None:
+                raise RuntimeError(f"Plugin {info.name} failed to load")
+            return instance
+
+        engine.register_lazy_action(info.name, build)
+        self._register_intent(info, engine)
+        self.available[info.name] = info
+        logger.debug(f"Registered plugin: {info.name} v{info.version} (loads on first use)")
+
+    def _register_intent(self, info: PluginInfo, engine: Any) -> None:
+        """Register the plugin's intent pattern with the parser, if defined."""
+        intent_data = info.intent_pattern()
+        if intent_data:
+            pattern = IntentPattern(
+                intent=intent_data["intent"],
+                keywords=intent_data["keywords"],
+                patterns=intent_data["patterns"],
+                examples=intent_data["examples"],
+                slots=intent_data.get("slots", []),
+            )
+            engine.parser.register_intent(pattern)
+
     def load_plugin(
         self,
         plugin_path: str,
         engine: Any,
+        register: bool = True,
     ) -> BasePlugin | None:
         """
         Load a single plugin by path.
@@ -73,19 +162,13 @@ class PluginLoader:
         Args:
             plugin_path: Path like "official/smarthome" or "community/myplugin"
             engine: SafeClaw engine instance
+            register: Register the plugin's action and intent with the engine
+                (False when they were registered lazily)
 
         Returns:
             Loaded plugin instance or None if failed
         """
-        # Parse path
-        parts = plugin_path.split("/")
-        if len(parts) == 2:
-            subdir, name = parts
-            file_path = self._plugin_dir / subdir / f"{name}.py"
-        else:
-            # Direct file path
-            file_path = Path(plugin_path)
-            name = file_path.stem
+        file_path, name = self._resolve(plugin_path)
 
         if not file_path.exists():
             logger.error(f"Plugin file not found: {file_path}")
@@ -124,22 +207,13 @@ class PluginLoader:
             # Call on_load hook
             instance.on_load(engine)
 
-            # Register with engine
-            engine.register_action(plugin_name, instance.execute)
-
-            # Register intent pattern with parser if defined
-            intent_data = plugin_class.get_intent_pattern()
-            if intent_data:
-                pattern = IntentPattern(
-                    intent=intent_data["intent"],
-                    keywords=intent_data["keywords"],
-                    patterns=intent_data["patterns"],
-                    examples=intent_data["examples"],
-                    slots=intent_data.get("slots", []),
-                )
-                engine.parser.register_intent(pattern)
+            if register:
+                # Register with engine and parser
+                engine.register_action(plugin_name, instance.execute)
+                self._register_intent(instance.info, engine)
 
             self.plugins[plugin_name] = instance
+            self.available.pop(plugin_name, None)
             logger.info(f"Loaded plugin: {plugin_name} v{instance.info.version}")
             return instance
 
@@ -167,5 +241,5 @@ class PluginLoader:
         return self.plugins.get(name)
 
     def list_plugins(self) -> list[PluginInfo]:
-        """List all loaded plugins with their info."""
-        return [p.info for p in self.plugins.values()]
+        """List all plugins with their info, loaded or waiting for first use."""
+        return [p.info for p in self.plugins.values()] + list(self.available.values())
@@ -140,13 +140,14 @@ class SmartHomePlugin(BasePlugin):
         if not self.hue_bridge and not self.mqtt_client:
             return self._simulate_action(action, target, level)
 
+        # phue and paho calls block on the network, so run them off the event loop
         # Execute via Hue
         if self.hue_bridge and action:
-            return self._execute_hue(action, target, level)
+            return await engine.run_blocking(self._execute_hue, action, target, level)
 
         # Execute via MQTT (Home Assistant)
         if self.mqtt_client and action:
-            return self._execute_mqtt(action, target, level)
+            return await engine.run_blocking(self._execute_mqtt, action, target, level)
 
         return "Could not understand smart home command. Try 'turn on living room lights'"
 
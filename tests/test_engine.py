@@ -0,0 +1,886 @@
+"""Tests for the SafeClaw engine."""
+
+import asyncio
+import functools
+import os
+import pickle
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from safeclaw.actions.base import ActionResult, artifact_text
+from safeclaw.actions.crawl import CrawlAction
+from safeclaw.actions.email import EmailAction
+from safeclaw.actions.news import NewsAction
+from safeclaw.actions.summarize import SummarizeAction
+from safeclaw.core.crawler import Crawler, CrawlResult
+from safeclaw.core.dispatcher import (
+    BULK,
+    BUSY_REPLY,
+    INTERACTIVE,
+    LANES,
+    SCHEDULED,
+    SHUTDOWN_REPLY,
+    USER_BUSY_REPLY,
+    Dispatcher,
+    DispatcherBusyError,
+)
+from safeclaw.core.engine import SafeClaw
+from safeclaw.core.executor import ActionPolicy, ActionTimeoutError
+from safeclaw.core.feeds import FeedItem
+from safeclaw.core.parser import IntentPattern
+from safeclaw.core.response_cache import ResponseCache
+from safeclaw.core.summarizer import SummaryMethod, get_summarizer, summarize_text
+from safeclaw.core.supervisor import HashRing, Supervisor
+from safeclaw.infra import telemetry
+from safeclaw.infra.telemetry import configure_telemetry, get_request_id
+from safeclaw.plugins import PluginLoader
+from safeclaw.plugins.loader import read_plugin_info
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = SafeClaw(config_path=tmp_path / "config.yaml", data_dir=tmp_path)
+    engine.memory = AsyncMock()
+    engine.memory.get_user_patterns.return_value = []
+    engine.parser.memory = engine.memory
+    return engine
+
+
+def pid_and_engine(params, user_id, channel, engine):
+    """Sync handler for the process pool; module level so it can be pickled."""
+    return f"{os.getpid()} {engine}"
+
+
+def sleeper(reply: str, delay: float):
+    async def handler(**kwargs):
+        await asyncio.sleep(delay)
+        return reply
+    return handler
+
+
+# ---- Sequence chains ----
+
+class TestSequenceChains:
+    """Test concurrent execution of sequence chains."""
+
+    async def test_steps_run_concurrently_in_order(self, engine):
+        engine.register_action("email", sleeper("mail", 0.2))
+        engine.register_action("news", sleeper("headlines", 0.1))
+        engine.register_action("weather", sleeper("sunny", 0.2))
+
+        chain = engine.parser.parse_chain("check email; news tech; weather in Boston")
+        start = time.monotonic()
+        reply = await engine._handle_chain(chain, "cli", "u1", {})
+        elapsed = time.monotonic() - start
+
+        assert reply.split("\n\n---\n\n") == ["mail", "headlines", "sunny"]
+        assert elapsed < 0.4
+        stored = engine.memory.store_messages.await_args.args[0]
+        assert [message["metadata"]["chain_index"] for message in stored] == [0, 1, 2]
+
+    async def test_concurrency_cap(self, engine):
+        engine.config = {"chains": {"max_concurrency": 1}}
+        running = 0
+        peak = 0
+
+        async def handler(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "ok"
+
+        engine.register_action("news", handler)
+        await engine._handle_chain(engine.parser.parse_chain("news; news; news"), "cli", "u1", {})
+        assert peak == 1
+
+    async def test_failures_and_timeouts_are_isolated(self, engine):
+        engine.config = {"chains": {"step_timeout": 0.05}}
+
+        async def broken(**kwargs):
+            raise RuntimeError("no mailbox")
+
+        engine.register_action("email", broken)
+        engine.register_action("news", sleeper("headlines", 0))
+        engine.register_action("weather", sleeper("sunny", 1))
+
+        chain = engine.parser.parse_chain("check email; news tech; weather in Boston; xyzzy")
+        results = (await engine._handle_chain(chain, "cli", "u1", {})).split("\n\n---\n\n")
+        assert results[0] == "[1] Failed: no mailbox"
+        assert results[1] == "headlines"
+        assert results[2] == "[3] Timed out after 0.05s"
+        assert results[3] == "[4] Could not understand: xyzzy"
+
+
+# ---- Pipe artifacts ----
+
+PAGE_TEXT = "SafeClaw is a privacy-first automation assistant. It runs on your machine."
+
+
+class TestPipeArtifacts:
+    """Test structured artifacts passed between pipe steps."""
+
+    async def test_artifact_reaches_next_step(self, engine):
+        received = {}
+
+        async def crawl(params, **kwargs):
+            return ActionResult(text="**Links**", artifact=CrawlResult(url="https://example.com"))
+
+        async def summarize(params, **kwargs):
+            received.update(params)
+            return "done"
+
+        engine.register_action("crawl", crawl)
+        engine.register_action("summarize", summarize)
+        chain = engine.parser.parse_chain("crawl https://example.com | summarize it")
+        assert await engine._handle_chain(chain, "cli", "u1", {}) == "done"
+        assert received["_previous_output"] == "**Links**"
+        assert received["_previous_artifact"].url == "https://example.com"
+
+    async def test_summarize_uses_artifact_without_refetching(self, engine):
+        page = CrawlResult(url="https://example.com", title="SafeClaw", text=PAGE_TEXT)
+
+        async def crawl(params, **kwargs):
+            return ActionResult(text="**Links**", artifact=[page])
+
+        summarize = SummarizeAction(default_sentences=1)
+        engine.register_action("crawl", crawl)
+        engine.register_action("summarize", summarize.execute)
+
+        chain = engine.parser.parse_chain("crawl https://example.com | summarize it")
+        with patch(
+            "safeclaw.actions.summarize.summarize_text", return_value="A privacy-first assistant."
+        ) as summarize_text:
+            reply = await engine._handle_chain(chain, "cli", "u1", {})
+        assert reply == "**SafeClaw**\n\nA privacy-first assistant."
+        # Only the text and parameters go to the executor, never the action
+        assert summarize_text.call_args.args == (PAGE_TEXT, 1, "lexrank")
+        cached = engine.memory.cache_crawl_many.await_args.args[0]
+        assert cached == [{
+            "url": "https://example.com",
+            "content": PAGE_TEXT,
+            "links": [],
+            "summary": "A privacy-first assistant.",
+        }]
+
+    async def test_plain_string_replies_still_work(self, engine):
+        engine.register_action("news", lambda **kwargs: "headlines")
+        result = await engine._execute_action("news", {}, "u1", "cli")
+        assert result == ActionResult(text="headlines")
+
+    def test_artifact_text(self):
+        assert artifact_text(CrawlResult(url="u", text="page")) == "page"
+        assert artifact_text([
+            FeedItem(title="a", link="l", description="desc"),
+            FeedItem(title="b", link="l", content="body", description="desc"),
+        ]) == "desc\n\nbody"
+        assert artifact_text(None) == ""
+
+
+# ---- Streaming pipes ----
+
+class TestStreamingPipes:
+    """Test pipelining streamed items through pipe chains."""
+
+    def pages(self, count: int, delay: float):
+        async def stream(params, **kwargs):
+            for n in range(count):
+                yield ActionResult(text=f"page {n}", artifact=CrawlResult(url=f"https://example.com/{n}"))
+                await asyncio.sleep(delay)
+        return stream
+
+    async def test_items_flow_downstream_as_they_arrive(self, engine):
+        started = time.monotonic()
+        seen = []
+
+        async def summarize(params, **kwargs):
+            seen.append(time.monotonic() - started)
+            return f"summary of {params['_previous_artifact'].url}"
+
+        engine.register_action("crawl", AsyncMock(), stream=self.pages(3, 0.1))
+        engine.register_action("summarize", summarize)
+
+        chain = engine.parser.parse_chain("crawl https://example.com | summarize it")
+        reply = await engine._handle_chain(chain, "cli", "u1", {})
+        assert reply.split("\n\n") == [f"summary of https://example.com/{n}" for n in range(3)]
+        assert seen[0] < 0.1
+
+    async def test_failure_keeps_earlier_outputs(self, engine):
+        async def summarize(params, **kwargs):
+            if params["_previous_output"] == "page 1":
+                raise RuntimeError("bad page")
+            return "ok"
+
+        engine.register_action("crawl", AsyncMock(), stream=self.pages(3, 0))
+        engine.register_action("summarize", summarize)
+
+        chain = engine.parser.parse_chain("crawl https://example.com | summarize it")
+        reply = await engine._handle_chain(chain, "cli", "u1", {})
+        assert reply == "ok\n\n[2] Failed: bad page"
+
+    async def test_crawl_action_streams_pages(self, engine):
+        async def iter_crawl(self, start_url, **kwargs):
+            for n in range(2):
+                yield CrawlResult(url=f"{start_url}/{n}", title=f"Page {n}", depth=n)
+
+        action = CrawlAction(rate_limit=0)
+        with patch("safeclaw.actions.crawl.Crawler.iter_crawl", iter_crawl):
+            items = [
+                item async for item in action.stream(
+                    {"url": "https://example.com", "depth": 1}, "u1", "cli", engine,
+                )
+            ]
+        assert [item.text for item in items] == ["[0] ✓ Page 0", "[1] ✓ Page 1"]
+        assert items[1].artifact.url == "https://example.com/1"
+        engine.memory.cache_crawl.assert_not_awaited()
+        engine.memory.cache_crawl_many.assert_awaited_once()
+        pages = engine.memory.cache_crawl_many.await_args.args[0]
+        assert [page["url"] for page in pages] == ["https://example.com/0", "https://example.com/1"]
+
+
+# ---- Dispatcher ----
+
+class TestDispatcher:
+    """Test the per-user ordered worker pool."""
+
+    @pytest.fixture
+    async def dispatcher(self):
+        log = []
+
+        async def handler(text, channel, user_id, metadata):
+            log.append(("start", user_id, text))
+            await asyncio.sleep(float(metadata.get("delay", 0.01)))
+            log.append(("end", user_id, text))
+            return f"{user_id}:{text}"
+
+        dispatcher = Dispatcher(handler, workers=2, max_queue=4, max_per_user=3)
+        dispatcher.log = log
+        await dispatcher.start()
+        yield dispatcher
+        await dispatcher.stop()
+
+    async def test_user_messages_run_in_order(self, dispatcher):
+        replies = await asyncio.gather(*(
+            dispatcher.submit(f"m{i}", "cli", "u1") for i in range(3)
+        ))
+        assert replies == ["u1:m0", "u1:m1", "u1:m2"]
+        assert [entry[0] for entry in dispatcher.log] == ["start", "end"] * 3
+
+    async def test_slow_user_does_not_starve_others(self, dispatcher):
+        slow = asyncio.create_task(dispatcher.submit("deep crawl", "cli", "u1", {"delay": 0.5}))
+        queued = asyncio.create_task(dispatcher.submit("next", "cli", "u1"))
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        assert await dispatcher.submit("news", "cli", "u2") == "u2:news"
+        assert time.monotonic() - start < 0.2
+        assert not queued.done()
+        assert await slow == "u1:deep crawl"
+        assert await queued == "u1:next"
+
+    async def test_overload_gets_busy_reply(self, dispatcher):
+        def send(*users):
+            return [
+                asyncio.create_task(dispatcher.submit("m", "cli", user, {"delay": 0.1}))
+                for user in users
+            ]
+
+        # Both workers busy, then three queued for u1 and one for u3
+        tasks = send("u1", "u2")
+        await asyncio.sleep(0.01)
+        tasks += send("u1", "u1", "u1", "u3")
+        await asyncio.sleep(0)
+        assert len(dispatcher) == 4
+        assert await dispatcher.submit("m", "cli", "u1") == USER_BUSY_REPLY
+        assert await dispatcher.submit("m", "cli", "u4") == BUSY_REPLY
+        assert dispatcher.get_stats()["rejected"] == 2
+        await asyncio.gather(*tasks)
+        assert len(dispatcher) == 0
+
+    async def test_submit_while_key_finishes(self, dispatcher):
+        first = asyncio.create_task(dispatcher.submit("m1", "cli", "u1", {"delay": 0.02}))
+        await asyncio.sleep(0.005)
+        # The second submit waits on the lock while the first job finishes
+        async with dispatcher._changed:
+            second = asyncio.create_task(dispatcher.submit("m2", "cli", "u1"))
+            await asyncio.sleep(0.05)
+            assert first.done()
+        assert await asyncio.wait_for(second, 1) == "u1:m2"
+        await asyncio.sleep(0.01)
+        assert dispatcher.lanes[INTERACTIVE].pending == {}
+
+    async def test_stop_drains_running_and_answers_queued(self, dispatcher):
+        tasks = [
+            asyncio.create_task(dispatcher.submit(f"m{i}", "cli", "u1", {"delay": 0.1}))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        stopping = asyncio.create_task(dispatcher.stop())
+        await asyncio.sleep(0)
+        assert await dispatcher.submit("late", "cli", "u2") == SHUTDOWN_REPLY
+        await stopping
+        assert await asyncio.gather(*tasks) == ["u1:m0", SHUTDOWN_REPLY]
+        assert ("end", "u1", "m0") in dispatcher.log
+
+    async def test_stop_cancels_after_drain_timeout(self, dispatcher):
+        task = asyncio.create_task(dispatcher.submit("m", "cli", "u1", {"delay": 1}))
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await dispatcher.stop(drain_seconds=0.05)
+        assert time.monotonic() - start < 0.5
+        assert await task == SHUTDOWN_REPLY
+        assert not dispatcher.running
+
+    async def test_engine_routes_through_queue(self, engine):
+        async def listen(params, user_id, channel, engine):
+            # Re-entering the engine from an action must not deadlock
+            return await engine.handle_message("news tech", channel, user_id)
+
+        engine.register_action("news", sleeper("headlines", 0))
+        engine.register_action("email", listen)
+        await engine._message_queue.start()
+        try:
+            assert await asyncio.wait_for(engine.handle_message("check email", "cli", "u1"), 1) == "headlines"
+        finally:
+            await engine._message_queue.stop()
+
+
+# ---- Priority lanes ----
+
+class TestPriorityLanes:
+    """Test lane priorities, budgets and deferral."""
+
+    @pytest.fixture
+    async def dispatcher(self):
+        dispatcher = Dispatcher(AsyncMock(), workers=2, max_queue=10)
+        dispatcher.order = []
+        dispatcher.peak = {lane: 0 for lane in LANES}
+        await dispatcher.start()
+        yield dispatcher
+        await dispatcher.stop()
+
+    def job(self, dispatcher, name: str, lane: str, delay: float = 0.05):
+        async def run():
+            dispatcher.order.append(name)
+            running = dispatcher.lanes[lane].running
+            dispatcher.peak[lane] = max(dispatcher.peak[lane], running)
+            await asyncio.sleep(delay)
+            return name
+        return asyncio.create_task(dispatcher.run(name, run, lane=lane))
+
+    async def test_interactive_jumps_the_queue(self, dispatcher):
+        dispatcher.configure(workers=1)
+        await dispatcher.stop()
+        await dispatcher.start()
+        tasks = [self.job(dispatcher, f"bulk{i}", BULK) for i in range(3)]
+        await asyncio.sleep(0.01)
+        tasks.append(self.job(dispatcher, "chat", INTERACTIVE))
+        await asyncio.gather(*tasks)
+        assert dispatcher.order == ["bulk0", "chat", "bulk1", "bulk2"]
+
+    async def test_lane_budget_leaves_room_for_chat(self, dispatcher):
+        dispatcher.configure(lanes={BULK: {"concurrency": 1}})
+        burst = [self.job(dispatcher, f"hook{i}", BULK) for i in range(4)]
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        assert await self.job(dispatcher, "chat", INTERACTIVE, delay=0) == "chat"
+        assert time.monotonic() - start < 0.03
+        await asyncio.gather(*burst)
+        assert dispatcher.peak[BULK] == 1
+
+    async def test_full_bulk_lane_does_not_reject_chat(self, dispatcher):
+        dispatcher.configure(lanes={BULK: {"max_queue": 2}})
+        burst = [self.job(dispatcher, f"hook{i}", BULK) for i in range(2)]
+        await asyncio.sleep(0.01)
+        burst += [self.job(dispatcher, f"hook{i}", BULK) for i in range(2, 4)]
+        await asyncio.sleep(0)
+        with pytest.raises(DispatcherBusyError):
+            await dispatcher.run("hook", AsyncMock(), lane=BULK)
+        assert await self.job(dispatcher, "chat", INTERACTIVE, delay=0) == "chat"
+        await asyncio.gather(*burst)
+
+    async def test_slow_chat_defers_lower_lanes(self, dispatcher):
+        dispatcher.configure(workers=4, interactive_target_ms=10)
+        await dispatcher.stop()
+        await dispatcher.start()
+        dispatcher.interactive_latency = 1.0
+        chat = self.job(dispatcher, "chat", INTERACTIVE, delay=0.3)
+        await asyncio.sleep(0)
+        assert dispatcher.degraded
+        burst = [self.job(dispatcher, f"job{i}", SCHEDULED) for i in range(3)]
+        await asyncio.gather(chat, *burst)
+        assert dispatcher.peak[SCHEDULED] == 1
+        assert not dispatcher.degraded
+
+    async def test_engine_lanes(self, engine):
+        lanes = engine._message_queue.lanes
+        seen = {}
+
+        async def reminder():
+            seen["reminder"] = lanes[SCHEDULED].running
+            return "done"
+
+        async def webhook(params, **kwargs):
+            seen["webhook"] = (lanes[BULK].running, params["payload"])
+
+        engine.register_action("webhook", webhook)
+        event = Mock(payload={"ref": "main"})
+        event.name = "deploy"
+        await engine._message_queue.start()
+        try:
+            assert await engine.scheduler._wrap("reminder_1", reminder)() == "done"
+            await engine._run_webhook("webhook", event)
+        finally:
+            await engine._message_queue.stop()
+        assert seen == {"reminder": 1, "webhook": (1, {"ref": "main"})}
+
+
+# ---- Executor ----
+
+class TestExecutor:
+    """Test running blocking actions off the event loop."""
+
+    async def test_sync_handler_does_not_block_loop(self, engine):
+        def blocking(**kwargs):
+            time.sleep(0.2)
+            return threading.current_thread().name
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        engine.register_action("shell", blocking)
+        task = asyncio.create_task(ticker())
+        result = await engine._execute_action("shell", {}, "u1", "cli")
+        task.cancel()
+        assert result.text.startswith("safeclaw-exec")
+        assert ticks >= 5
+
+    async def test_cpu_work_in_process_pool(self, engine):
+        engine.executor.configure(processes=1)
+        try:
+            assert await engine.run_blocking(os.getpid, workload="cpu") != os.getpid()
+        finally:
+            engine.executor.shutdown()
+
+    async def test_cpu_handler_gets_no_engine_in_process_pool(self, engine):
+        engine.register_action("report", pid_and_engine, workload="cpu")
+        engine.executor.configure(processes=1)
+        try:
+            result = await engine._execute_action("report", {}, "u1", "cli")
+        finally:
+            engine.executor.shutdown()
+        pid, passed = result.text.split()
+        assert int(pid) != os.getpid()
+        assert passed == "None"
+
+    async def test_crawler_parses_html_with_run_blocking(self, engine):
+        calls = []
+
+        async def run_blocking(func, *args, **kwargs):
+            calls.append(func.__name__)
+            return await engine.run_blocking(func, *args, **kwargs)
+
+        crawler = Crawler(run_blocking=run_blocking)
+        crawler._client = AsyncMock()
+        crawler._client.get.return_value = Mock(
+            status_code=200,
+            text='<html><title>Home</title><body><a href="/about">About</a></body></html>',
+        )
+        result = await crawler.fetch("https://example.com", allow_internal=True)
+        assert calls == ["_parse_html"]
+        assert result.title == "Home"
+        assert result.links == ["https://example.com/about"]
+
+    def test_summarize_sends_only_text_to_process_pool(self):
+        call = functools.partial(summarize_text, PAGE_TEXT, 1, SummaryMethod.LEXRANK)
+        assert len(pickle.dumps(call)) < len(PAGE_TEXT) + 500
+        # Each process builds its summarizers once
+        assert get_summarizer() is get_summarizer()
+
+    async def test_timeout(self, engine):
+        engine.register_action("news", sleeper("headlines", 1), timeout=0.05)
+        with pytest.raises(ActionTimeoutError, match="news timed out after 0.05s"):
+            await engine._execute_action("news", {}, "u1", "cli")
+
+        reply = await engine.handle_message("news tech", "cli", "u1")
+        assert reply == "Sorry, that action failed: news timed out after 0.05s"
+
+    async def test_config_timeout_overrides_declared(self, engine):
+        summarize = SummarizeAction()
+        summarize.timeout = 30
+        engine.register_action("summarize", summarize.execute)
+        policy = engine.action_policies["summarize"]
+        assert (policy.workload, policy.timeout) == ("cpu", 30)
+        assert engine._action_timeout("summarize", policy) == 30
+
+        engine.config = {"executor": {"timeout": 0, "timeouts": {"summarize": 5}}}
+        assert engine._action_timeout("summarize", policy) == 5
+        assert engine._action_timeout("news", ActionPolicy()) is None
+
+    async def test_email_clients_are_per_request(self, engine):
+        clients = []
+
+        class FakeClient:
+            def __init__(self, config):
+                self.connected = True
+                clients.append(self)
+
+            def get_unread_count(self):
+                time.sleep(0.05)
+                return 1 if self.connected else -1
+
+            def disconnect_imap(self):
+                self.connected = False
+
+        engine.memory.get_preference.return_value = {"imap_server": "imap", "smtp_server": "smtp"}
+        action = EmailAction()
+        with patch("safeclaw.actions.email.EmailClient", FakeClient):
+            replies = await asyncio.gather(*(
+                action.execute({"subcommand": "count"}, user, "cli", engine)
+                for user in ("u1", "u2")
+            ))
+        assert replies == ["📧 You have 1 unread email"] * 2
+        assert len(clients) == 2
+        assert not any(client.connected for client in clients)
+
+
+# ---- Response cache ----
+
+class TestResponseCache:
+    """Test declarative caching of action replies."""
+
+    def counting(self, reply: str = "sunny", delay: float = 0):
+        calls = []
+
+        async def handler(params, user_id, **kwargs):
+            calls.append((user_id, params.get("location")))
+            await asyncio.sleep(delay)
+            return reply
+
+        return handler, calls
+
+    async def test_hit_skips_action(self, engine):
+        handler, calls = self.counting()
+        engine.register_action("weather", handler, cache_ttl=600, cache_key=("location",))
+        for _ in range(3):
+            result = await engine._execute_action("weather", {"location": "Boston", "raw_input": "x"}, "u1", "cli")
+            assert result.text == "sunny"
+        await engine._execute_action("weather", {"location": "Paris"}, "u1", "cli")
+        await engine._execute_action("weather", {"location": "Paris"}, "u2", "cli")
+        assert calls == [("u1", "Boston"), ("u1", "Paris"), ("u2", "Paris")]
+        assert engine.response_cache.stats()["hits"] == 2
+
+    async def test_single_flight(self, engine):
+        handler, calls = self.counting(delay=0.05)
+        engine.register_action("weather", handler, cache_ttl=600, cache_per_user=False)
+        results = await asyncio.gather(*(
+            engine._execute_action("weather", {}, f"u{i}", "cli") for i in range(5)
+        ))
+        assert [r.text for r in results] == ["sunny"] * 5
+        assert len(calls) == 1
+        assert engine.response_cache.stats()["shared"] == 4
+
+    async def test_ttl_errors_and_uncacheable_replies(self, engine):
+        replies = [ActionResult(text="offline", cacheable=False), "sunny"]
+
+        async def handler(**kwargs):
+            reply = replies.pop(0)
+            if reply == "boom":
+                raise RuntimeError(reply)
+            return reply
+
+        engine.register_action("weather", handler, cache_ttl=0.05)
+        assert (await engine._execute_action("weather", {}, "u1", "cli")).text == "offline"
+        assert (await engine._execute_action("weather", {}, "u1", "cli")).text == "sunny"
+        assert (await engine._execute_action("weather", {}, "u1", "cli")).text == "sunny"
+        replies.append("boom")
+        await asyncio.sleep(0.06)
+        with pytest.raises(RuntimeError):
+            await engine._execute_action("weather", {}, "u1", "cli")
+        assert len(engine.response_cache) == 0
+
+    async def test_invalidate_during_run_is_not_lost(self, engine):
+        handler, calls = self.counting(delay=0.05)
+        engine.register_action("weather", handler, cache_ttl=600)
+        running = asyncio.create_task(engine._execute_action("weather", {}, "u1", "cli"))
+        await asyncio.sleep(0.01)
+        engine.response_cache.invalidate("weather", "u1")
+        assert (await running).text == "sunny"
+        assert len(engine.response_cache) == 0
+        await engine._execute_action("weather", {}, "u1", "cli")
+        assert len(calls) == 2
+
+    async def test_news_declaration(self, engine):
+        news = NewsAction()
+        news._fetch_news = AsyncMock(return_value="headlines")
+        news._load_user_prefs = AsyncMock()
+        engine.register_action("news", news.execute)
+        for _ in range(2):
+            await engine._execute_action("news", {"category": "tech"}, "u1", "cli")
+        assert news._fetch_news.await_count == 1
+
+        news._list_categories = Mock(return_value="tech, world")
+        for _ in range(2):
+            await engine._execute_action("news", {"subcommand": "categories"}, "u1", "cli")
+        assert news._list_categories.call_count == 2
+
+        await news._save_user_prefs("u1", engine)
+        await engine._execute_action("news", {"category": "tech"}, "u1", "cli")
+        assert news._fetch_news.await_count == 2
+
+    async def test_help_follows_intent_changes(self, engine):
+        engine.register_action(
+            "help", lambda **_: engine.get_help(), cache_ttl=float("inf"), cache_per_user=False
+        )
+        assert "greet" not in (await engine._execute_action("help", {}, "u1", "cli")).text
+
+        engine.parser.register_intent(IntentPattern(intent="greet", keywords=["hi"], patterns=[], examples=["hi there"]))
+        assert "greet: hi there" in (await engine._execute_action("help", {}, "u1", "cli")).text
+
+        engine.parser.update_intents(removed=["greet"])
+        assert "greet" not in (await engine._execute_action("help", {}, "u1", "cli")).text
+
+    def test_lru_bounds(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10_000)
+        for n in range(3):
+            cache.put(("a", None, (str(n),)), ActionResult(text=f"r{n}"), 60)
+        assert cache.get(("a", None, ("0",))) is None
+        assert len(cache) == 2
+        cache.put(("a", None, ("big",)), ActionResult(text="x" * 20_000), 60)
+        assert cache.size_bytes() <= 10_000
+
+
+# ---- Lazy registry ----
+
+PLUGIN_SOURCE = '''
+from safeclaw.plugins.base import BasePlugin, PluginInfo
+
+LOADS.append("imported")
+
+
+class HelloPlugin(BasePlugin):
+    info = PluginInfo(
+        name="hello",
+        version="1.0.0",
+        description="Says hello",
+        keywords=["hello"],
+        examples=["hello"],
+    )
+
+    def on_load(self, engine):
+        LOADS.append("on_load")
+
+    async def execute(self, params, user_id, channel, engine):
+        return "Hello!"
+'''
+
+
+class TestLazyRegistry:
+    """Test actions and plugins built on first use."""
+
+    async def test_action_built_on_first_use(self, engine):
+        built = []
+
+        class Counting(NewsAction):
+            def __init__(self):
+                built.append(self)
+                super().__init__()
+
+            async def execute(self, params, user_id, channel, engine):
+                return "headlines"
+
+        lazy = engine.register_lazy_action("news", Counting)
+        assert not lazy.built
+        assert engine.action_policies["news"].cache_ttl == NewsAction.cache_ttl
+
+        for _ in range(2):
+            await engine._execute_action("news", {"category": "tech", "subcommand": "x"}, "u1", "cli")
+        assert len(built) == 1
+
+    async def test_plugin_registered_without_import(self, engine, tmp_path, monkeypatch):
+        loads = []
+        monkeypatch.setattr("builtins.LOADS", loads, raising=False)
+        (tmp_path / "community").mkdir()
+        (tmp_path / "community" / "hello.py").write_text(PLUGIN_SOURCE)
+
+        loader = PluginLoader()
+        loader._plugin_dir = tmp_path
+        loader.load_all(engine)
+
+        assert loads == []
+        assert "hello" in engine.actions
+        assert engine.parser.parse("hello").intent == "hello"
+        assert [info.name for info in loader.list_plugins()] == ["hello"]
+
+        assert (await engine._execute_action("hello", {}, "u1", "cli")).text == "Hello!"
+        assert loads == ["imported", "on_load"]
+        assert loader.get_plugin("hello") is not None
+
+    def test_read_plugin_info(self, tmp_path):
+        path = tmp_path / "dynamic.py"
+        path.write_text("class P:\n    info = PluginInfo(name=NAME, version='1', description='')\n")
+        assert read_plugin_info(path) is None
+        path.write_text(PLUGIN_SOURCE)
+        assert read_plugin_info(path).keywords == ["hello"]
+
+
+# ---- Tracing ----
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from safeclaw.core.memory import Memory  # noqa: E402
+
+
+class TestTracing:
+    """Test spans and request ids from the channel down to actions and memory."""
+
+    @pytest.fixture
+    def spans(self, monkeypatch):
+        monkeypatch.setattr(telemetry, "_provider", None)
+        exporter = InMemorySpanExporter()
+        assert configure_telemetry(exporter=exporter)
+
+        def finished():
+            trace.get_tracer_provider().force_flush()
+            return exporter.get_finished_spans()
+
+        yield finished
+        exporter.shutdown()
+
+    async def test_message_span_tree(self, engine, spans):
+        seen = []
+
+        async def news(params, user_id, channel, engine):
+            seen.append(get_request_id())
+            return "headlines"
+
+        engine.register_action("news", news)
+        await engine._message_queue.start()
+        try:
+            reply = await engine.handle_message("news tech", "cli", "u1", {"request_id": "telegram_42"})
+        finally:
+            await engine._message_queue.stop()
+
+        assert reply == "headlines"
+        assert seen == ["telegram_42"]
+        by_name = {span.name: span for span in spans()}
+        root = by_name["safeclaw.handle_message"]
+        assert root.attributes["safeclaw.request_id"] == "telegram_42"
+        assert by_name["safeclaw.process_message"].parent.span_id == root.context.span_id
+        for name in ("parser.parse", "safeclaw.action"):
+            assert by_name[name].context.trace_id == root.context.trace_id
+        assert by_name["safeclaw.action"].attributes["safeclaw.action"] == "news"
+
+    async def test_request_id_generated_and_reset(self, engine):
+        seen = []
+
+        async def news(params, user_id, channel, engine):
+            seen.append(get_request_id())
+            return "headlines"
+
+        engine.register_action("news", news)
+        await engine.handle_message("news tech", "cli", "u1")
+        assert seen[0].startswith("req_")
+        assert get_request_id() is None
+
+    async def test_memory_queries_traced(self, tmp_path, spans):
+        memory = Memory(tmp_path / "memory.db")
+        await memory.initialize()
+        try:
+            await memory.set("k", "v")
+            assert await memory.get("k") == "v"
+        finally:
+            await memory.close()
+        names = [span.name for span in spans()]
+        assert "memory.set" in names and "memory.get" in names
+
+    def test_file_exporter_and_none(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(telemetry, "_provider", None)
+        assert not configure_telemetry(exporter="none")
+        with pytest.raises(ValueError):
+            configure_telemetry(exporter="zipkin")
+
+        path = tmp_path / "traces.jsonl"
+        assert configure_telemetry(exporter="file", file_path=path)
+        with telemetry.start_span("test.file_export"):
+            pass
+        trace.get_tracer_provider().force_flush()
+        assert '"name": "test.file_export"' in path.read_text()
+
+
+# ---- Supervisor ----
+
+def echo_engine(config_path, data_dir):
+    """Worker engine for the supervisor tests; module level so it can be pickled."""
+    engine = SafeClaw(config_path=config_path, data_dir=data_dir)
+
+    async def news(params, user_id, channel, engine):
+        if "sink" in engine.channels:
+            await engine.channels["sink"].send(user_id, "reminder")
+        return f"{user_id}@{os.getpid()}"
+
+    engine.register_action("news", news)
+    return engine
+
+
+class Sink:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, user_id, message):
+        self.sent.append((user_id, message))
+
+
+class TestSupervisor:
+    """Test routing users to engine worker processes."""
+
+    def test_ring_is_stable_and_balanced(self):
+        users = [f"user{i}" for i in range(2000)]
+        three = HashRing(3)
+        four = HashRing(4)
+        owners = [three.shard_for(user) for user in users]
+        assert owners == [HashRing(3).shard_for(user) for user in users]
+        assert all(owners.count(shard) > 400 for shard in range(3))
+        moved = sum(three.shard_for(user) != four.shard_for(user) for user in users)
+        assert moved < len(users) * 0.4
+
+    async def test_users_stick_to_workers(self, tmp_path):
+        supervisor = Supervisor(
+            echo_engine, 2, config_path=tmp_path / "config.yaml", data_dir=tmp_path, restart_delay=0
+        )
+        sink = Sink()
+        supervisor.register_channel("sink", sink)
+        await supervisor.start()
+        try:
+            users = [f"u{i}" for i in range(8)]
+            replies = await asyncio.gather(*(
+                supervisor.handle_message("news tech", "sink", user) for user in users
+            ))
+            pids = {user: reply.split("@")[1] for user, reply in zip(users, replies, strict=True)}
+            assert len(set(pids.values())) == 2
+            assert str(os.getpid()) not in pids.values()
+            assert await supervisor.handle_message("news tech", "sink", "u0") == replies[0]
+            assert ("u0", "reminder") in sink.sent
+
+            # A dead worker is replaced
+            assert all(stats["alive"] for stats in supervisor.get_stats()["workers"])
+            worker = supervisor._workers[supervisor.ring.shard_for("u0")]
+            worker.process.kill()
+            for _ in range(200):
+                if worker.restarts and worker.writer is not None:
+                    break
+                await asyncio.sleep(0.1)
+            reply = await supervisor.handle_message("news tech", "sink", "u0")
+            assert reply.startswith("u0@") and reply != replies[0]
+        finally:
+            await supervisor.stop()
+        assert not any(worker.alive for worker in supervisor._workers)
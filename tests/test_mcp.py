@@ -52,6 +52,22 @@ async def test_crawl_url_allowed():
 
         assert result == "Links found"
 
+@pytest.mark.asyncio
+async def test_crawl_url_returns_text():
+    from safeclaw.actions.base import ActionResult
+
+    with patch('safeclaw.mcp.tools.auth_client.check', new_callable=AsyncMock) as mock_check, \
+         patch('safeclaw.actions.crawl.CrawlAction.execute', new_callable=AsyncMock) as mock_execute:
+
+        mock_check.return_value = True
+        mock_execute.return_value = ActionResult(text="Links found", artifact=object())
+
+        ctx = mock_context()
+        result = await crawl_url(url="https://example.com", ctx=ctx)
+
+        assert isinstance(result, str)
+        assert result == "Links found"
+
 @pytest.mark.asyncio
 async def test_summarize_allowed():
     with patch('safeclaw.mcp.tools.auth_client.check', new_callable=AsyncMock) as mock_check, \
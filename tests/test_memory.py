@@ -0,0 +1,297 @@
+"""Tests for SQLite-backed memory."""
+
+import asyncio
+import gzip
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from safeclaw.core.memory import Memory
+from safeclaw.core.parser import ParsedCommand
+from safeclaw.core.retention import Compactor, RetentionPolicy
+
+
+@pytest.fixture
+async def memory(tmp_path):
+    memory = Memory(tmp_path / "memory.db")
+    await memory.initialize()
+    yield memory
+    await memory.close()
+
+
+def parsed(intent: str = "news") -> ParsedCommand:
+    return ParsedCommand(raw_text="x", intent=intent, params={"category": "tech"})
+
+
+# ---- Write-behind message log ----
+
+class TestWriteBehind:
+    """Test batched, write-behind message logging."""
+
+    @pytest.fixture
+    async def memory(self, tmp_path):
+        memory = Memory(tmp_path / "memory.db", durability="write_behind", batch_size=10, flush_ms=50)
+        await memory.initialize()
+        yield memory
+        await memory.close()
+
+    async def test_store_does_not_commit_inline(self, memory):
+        assert await memory.store_message("u1", "cli", "news tech", parsed()) == 0
+        cursor = await memory._connection.execute("SELECT COUNT(*) FROM messages")
+        assert (await cursor.fetchone())[0] == 0
+        await memory.flush()
+        cursor = await memory._connection.execute("SELECT COUNT(*) FROM messages")
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_history_sees_queued_messages(self, memory):
+        for i in range(25):
+            await memory.store_message("u1", "cli", f"msg {i}", parsed())
+        history = await memory.get_history("u1", limit=100)
+        assert [m["text"] for m in history] == [f"msg {i}" for i in range(25)]
+        assert history[0]["params"] == {"category": "tech"}
+
+    async def test_batches_share_a_commit(self, memory):
+        commits = 0
+        commit = memory._connection.commit
+
+        async def counting_commit():
+            nonlocal commits
+            commits += 1
+            await commit()
+
+        memory._connection.commit = counting_commit
+        for i in range(20):
+            await memory.store_message("u1", "cli", f"msg {i}", parsed())
+        await memory.flush()
+        assert commits <= 3
+
+    async def test_close_flushes(self, tmp_path):
+        memory = Memory(tmp_path / "memory.db", durability="write_behind", flush_ms=10_000)
+        await memory.initialize()
+        await memory.store_message("u1", "cli", "last words", parsed())
+        await memory.close()
+
+        reopened = Memory(tmp_path / "memory.db")
+        await reopened.initialize()
+        assert [m["text"] for m in await reopened.get_history("u1")] == ["last words"]
+        await reopened.close()
+
+
+class TestSyncDurability:
+    """Test the default commit-per-message mode."""
+
+    async def test_store_returns_row_id(self, memory):
+        assert await memory.store_message("u1", "cli", "news", parsed()) > 0
+        assert memory._write_queue is None
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            Memory(tmp_path / "m.db").configure(durability="eventually")
+
+
+# ---- Read pool ----
+
+class TestReadPool:
+    """Test queries on the read-only connection pool."""
+
+    async def test_reads_do_not_wait_for_open_write(self, memory):
+        await memory.set("k", "old")
+        await memory._connection.execute("BEGIN IMMEDIATE")
+        await memory._connection.execute(
+            "UPDATE keyvalue SET value = :value WHERE key = 'k'", {"value": '"new"'}
+        )
+        # Readers see the last commit while the write is in progress
+        assert await asyncio.wait_for(memory.get("k"), 1) == "old"
+        await memory._connection.commit()
+        assert await memory.get("k") == "new"
+
+    async def test_waits_for_free_connection(self, tmp_path):
+        memory = Memory(tmp_path / "memory.db", read_connections=1)
+        await memory.initialize()
+        try:
+            await memory.set("k", "v")
+            async with memory._reader():
+                pending = asyncio.create_task(memory.get("k"))
+                await asyncio.sleep(0.05)
+                assert not pending.done()
+            assert await pending == "v"
+        finally:
+            await memory.close()
+
+    async def test_without_pool_reads_use_writer(self, tmp_path):
+        memory = Memory(tmp_path / "memory.db", read_connections=0)
+        await memory.initialize()
+        try:
+            assert memory._readers is None
+            await memory.learn_pattern("u1", "Morning", "briefing")
+            assert (await memory.match_learned_pattern("u1", "morning"))["intent"] == "briefing"
+        finally:
+            await memory.close()
+
+    async def test_readers_cannot_write(self, memory):
+        async with memory._reader() as connection:
+            with pytest.raises(sqlite3.OperationalError):
+                await connection.execute("DELETE FROM keyvalue")
+
+
+# ---- Transactions and bulk writes ----
+
+def count_commits(memory: Memory) -> list[int]:
+    commits = [0]
+    commit = memory._connection.commit
+
+    async def counting_commit():
+        commits[0] += 1
+        await commit()
+
+    memory._connection.commit = counting_commit
+    return commits
+
+
+class TestTransactions:
+    """Test grouping writes into one transaction."""
+
+    async def test_writes_share_one_commit(self, memory):
+        commits = count_commits(memory)
+        async with memory.transaction():
+            await memory.set("a", 1)
+            await memory.set_preference("u1", "units", "metric")
+            async with memory.transaction():
+                await memory.learn_pattern("u1", "morning", "briefing")
+            # Not visible to the read pool until the commit
+            assert await memory.get("a") is None
+        assert commits == [1]
+        assert await memory.get("a") == 1
+        assert await memory.get_preference("u1", "units") == "metric"
+
+    async def test_rolled_back_on_error(self, memory):
+        with pytest.raises(RuntimeError):
+            async with memory.transaction():
+                await memory.set("a", 1)
+                raise RuntimeError("import failed")
+        assert await memory.get("a") is None
+        await memory.set("b", 2)
+        assert await memory.get("b") == 2
+
+    async def test_other_writes_wait(self, memory):
+        async with memory.transaction():
+            other = asyncio.create_task(memory.set("b", 2))
+            await memory.set("a", 1)
+            await asyncio.sleep(0.05)
+            assert not other.done()
+        await other
+        assert await memory.get("b") == 2
+
+    async def test_flush_inside_transaction(self, tmp_path):
+        memory = Memory(tmp_path / "memory.db", durability="write_behind")
+        await memory.initialize()
+        try:
+            await memory.store_message("u1", "cli", "queued", parsed())
+            async with memory.transaction(), asyncio.timeout(1):
+                await memory.get_history("u1")
+            assert [m["text"] for m in await memory.get_history("u1")] == ["queued"]
+        finally:
+            await memory.close()
+
+
+class TestBulkWrites:
+    """Test bulk inserts with one commit."""
+
+    async def test_cache_crawl_many(self, memory):
+        commits = count_commits(memory)
+        pages = [{"url": f"https://example.com/{i}", "content": f"page {i}", "links": []} for i in range(50)]
+        assert await memory.cache_crawl_many(pages) == 50
+        assert commits == [1]
+        assert (await memory.get_cached_crawl("https://example.com/49"))["content"] == "page 49"
+
+    async def test_add_reminders_returns_ids(self, memory):
+        first = await memory.add_reminder("u1", "cli", "first", datetime(2020, 1, 1))
+        ids = await memory.add_reminders(
+            {"user_id": "u1", "channel": "cli", "task": f"task {i}", "trigger_at": datetime(2020, 1, 2)}
+            for i in range(3)
+        )
+        assert ids == [first + 1, first + 2, first + 3]
+        pending = await memory.get_pending_reminders()
+        assert {r["id"]: r["task"] for r in pending}[ids[2]] == "task 2"
+
+    async def test_store_messages(self, memory):
+        messages = [{"user_id": "u1", "channel": "cli", "text": f"msg {i}", "parsed": parsed()} for i in range(3)]
+        assert await memory.store_messages(messages) == 3
+        assert [m["text"] for m in await memory.get_history("u1")] == ["msg 0", "msg 1", "msg 2"]
+
+
+# ---- Retention ----
+
+class TestRetention:
+    """Test retention enforcement and compaction."""
+
+    async def add_messages(self, memory, user_id, count, age_days=0):
+        messages = [
+            {"user_id": user_id, "channel": "cli", "text": f"{user_id} {i}", "parsed": parsed()}
+            for i in range(count)
+        ]
+        await memory.store_messages(messages)
+        if age_days:
+            async with memory._write() as connection:
+                await connection.execute(
+                    "UPDATE messages SET created_at = datetime('now', :age) WHERE user_id = :user_id",
+                    {"age": f"-{age_days} days", "user_id": user_id},
+                )
+
+    async def test_old_messages_archived_and_deleted(self, memory, tmp_path):
+        await self.add_messages(memory, "old", 5, age_days=400)
+        await self.add_messages(memory, "new", 2)
+        archive = tmp_path / "archive"
+
+        deleted = await memory.prune_messages(retention_days=365, batch_size=2, archive_dir=archive)
+
+        assert deleted == 5
+        assert await memory.get_history("old") == []
+        assert len(await memory.get_history("new")) == 2
+        [path] = archive.iterdir()
+        with gzip.open(path, "rt") as f:
+            archived = [json.loads(line) for line in f]
+        assert [m["text"] for m in archived] == [f"old {i}" for i in range(5)]
+
+    async def test_max_history_per_user(self, memory):
+        await self.add_messages(memory, "u1", 12)
+        await self.add_messages(memory, "u2", 3)
+        assert await memory.prune_messages(max_history=5, batch_size=4) == 7
+        assert [m["text"] for m in await memory.get_history("u1")] == [f"u1 {i}" for i in range(7, 12)]
+        assert len(await memory.get_history("u2")) == 3
+
+    async def test_expired_rows_deleted(self, memory):
+        await memory.cache_crawl_many(
+            [{"url": f"https://example.com/{i}", "content": "x", "links": []} for i in range(3)],
+            ttl_hours=-1,
+        )
+        await memory.cache_crawl("https://example.com/fresh", "x", [])
+        await memory.set("session", "abc", ttl_seconds=3600)
+        await memory.set("forever", 1)
+        async with memory._write() as connection:
+            await connection.execute("UPDATE keyvalue SET expires_at = '2000-01-01' WHERE key = 'session'")
+
+        assert await memory.prune_expired(batch_size=2) == {"crawl_cache": 3, "keyvalue": 1}
+        assert await memory.get_cached_crawl("https://example.com/fresh") is not None
+        assert await memory.get("forever") == 1
+
+    async def test_compactor_frees_pages(self, memory):
+        await self.add_messages(memory, "u1", 2000)
+        stats = await Compactor(memory, RetentionPolicy(max_history=10, vacuum_pages=5)).run()
+        assert stats.messages == 1990
+        assert stats.freed_pages > 0
+        async with memory._write() as connection:
+            assert await memory._pragma(connection, "freelist_count") == 0
+
+    def test_policy_from_config(self, tmp_path):
+        policy = RetentionPolicy.from_config({
+            "max_history": 0,
+            "retention_days": 30,
+            "retention": {"batch_size": 100, "archive": str(tmp_path)},
+        })
+        assert policy.max_history is None
+        assert policy.retention_days == 30
+        assert policy.batch_size == 100
+        assert policy.archive_dir == tmp_path
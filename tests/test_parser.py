@@ -0,0 +1,470 @@
+"""Tests for the rule-based command parser."""
+
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from safeclaw.core.benchmark import build_corpus, run_parser_benchmark
+from safeclaw.core.engine import SafeClaw
+from safeclaw.core.intents import IntentsLoader
+from safeclaw.core.learned import (
+    LearnedPatternCache,
+    LearnedPatternIndex,
+    estimate_patterns_size,
+)
+from safeclaw.core.matcher import IntentMatcher, PhraseMatcher
+from safeclaw.core.parser import (
+    CommandParser,
+    IntentPattern,
+    ParseCache,
+    ParsedCommand,
+    _parse_datetime,
+    tokenize_chain,
+)
+
+
+@pytest.fixture
+def parser():
+    return CommandParser()
+
+
+# ---- Compiled intent matcher ----
+
+class TestIntentMatcher:
+    """Test the compiled keyword/regex index."""
+
+    def test_regex_match(self, parser):
+        assert parser._match_keywords("check my email") == ("email", 0.95)
+
+    def test_exact_keyword_hit(self, parser):
+        intent, score = parser._match_keywords("forecast")
+        assert intent == "weather"
+        assert score == 0.9
+
+    def test_fuzzy_keyword_typo(self, parser):
+        intent, score = parser._match_keywords("wether boston")
+        assert intent == "weather"
+        assert 0.8 < score < 0.95
+
+    def test_no_match(self, parser):
+        assert parser._match_keywords("xyzzy plugh") is None
+
+    def test_overlapping_keywords_all_hit(self):
+        matcher = IntentMatcher()
+        matcher.add(IntentPattern("short", ["extract"], [], []))
+        matcher.add(IntentPattern("long", ["extract text"], [], []))
+        assert matcher.exact_hits("please extract text now") == {"extract", "extract text"}
+
+    def test_first_registered_intent_wins_ties(self):
+        matcher = IntentMatcher()
+        matcher.add(IntentPattern("first", ["deploy"], [], []))
+        matcher.add(IntentPattern("second", ["deploy"], [], []))
+        assert matcher.match("deploy now") == ("first", 0.9)
+
+    def test_register_intent_updates_index(self, parser):
+        parser.register_intent(IntentPattern(
+            intent="deploy",
+            keywords=["deploy"],
+            patterns=[r"deploy\s+to\s+(production|staging)"],
+            examples=["deploy to production"],
+            slots=["env"],
+        ))
+        result = parser.parse("deploy to staging")
+        assert result.intent == "deploy"
+        assert result.params == {"env": "staging"}
+
+    def test_remove_intent(self):
+        matcher = IntentMatcher()
+        matcher.add(IntentPattern("deploy", ["deploy"], [], []))
+        assert matcher.remove("deploy")
+        assert matcher.match("deploy") is None
+        assert not matcher.remove("deploy")
+
+
+# ---- Phrase variations ----
+
+class TestPhraseMatcher:
+    """Test batched phrase-variation matching."""
+
+    def test_exact_phrase(self, parser):
+        assert parser._match_phrase_variations("please don't let me forget the milk") == (
+            "reminder", 0.92,
+        )
+
+    def test_fuzzy_phrase(self, parser):
+        intent, score = parser._match_phrase_variations("hows the weathr")
+        assert intent == "weather"
+        assert score > 0.85
+
+    def test_no_phrase(self, parser):
+        assert parser._match_phrase_variations("xyzzy plugh") is None
+
+    def test_earliest_phrase_wins_ties(self):
+        matcher = PhraseMatcher({"a": ["deploy now"], "b": ["deploy now"]})
+        assert matcher.match("deploy now please") == ("a", 0.92)
+
+    def test_only_registered_intents(self):
+        parser = CommandParser()
+        del parser.intents["smarthome"]
+        parser._phrase_matcher = None
+        assert parser._match_phrase_variations("switch on") is None
+
+
+# ---- Entity extraction ----
+
+class TestEntities:
+    """Test lazy entity extraction and the date fast path."""
+
+    def test_entities_are_lazy(self, parser):
+        with patch.object(parser, "_extract_entities", wraps=parser._extract_entities) as spy:
+            result = parser.parse("crawl https://example.com")
+            assert spy.call_count == 0
+            assert result.entities["urls"] == ["https://example.com"]
+            assert result.entities["urls"] == ["https://example.com"]
+            assert spy.call_count == 1
+
+    def test_no_temporal_hint_skips_dateparser(self, parser):
+        with patch("dateparser.parse") as mock_parse:
+            entities = parser.parse("news tech").entities
+        mock_parse.assert_not_called()
+        assert "datetime" not in entities
+
+    def test_temporal_hint_parses_datetime(self, parser):
+        entities = parser._extract_entities("tomorrow at 3pm")
+        assert entities["datetime"].date() > datetime.now().date()
+
+    def test_datetime_results_are_cached(self, parser):
+        _parse_datetime.cache_clear()
+        parser._extract_datetime("tomorrow at 3pm")
+        parser._extract_datetime("Tomorrow  at 3pm")
+        assert _parse_datetime.cache_info().hits >= 1
+
+    def test_entities_setter(self):
+        cmd = ParsedCommand(raw_text="x")
+        cmd.entities = {"numbers": [1]}
+        assert cmd.entities == {"numbers": [1]}
+
+    def test_entities_constructor_argument(self):
+        cmd = ParsedCommand(raw_text="x", entities={"urls": ["https://example.com"]})
+        assert cmd.entities == {"urls": ["https://example.com"]}
+        assert ParsedCommand(raw_text="x").entities == {}
+
+
+# ---- Learned pattern cache ----
+
+class TestLearnedPatternCache:
+    """Test the bounded per-user learned-pattern cache."""
+
+    def _patterns(self, n=1):
+        return [{"phrase": f"phrase {i}", "intent": "news", "params": None} for i in range(n)]
+
+    def test_lru_eviction_by_user_count(self):
+        cache = LearnedPatternCache(max_users=2)
+        cache.put("a", self._patterns())
+        cache.put("b", self._patterns())
+        cache.get("a")
+        cache.put("c", self._patterns())
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+
+    def test_eviction_by_memory_budget(self):
+        cache = LearnedPatternCache(max_bytes=estimate_patterns_size(self._patterns(10)))
+        cache.put("a", self._patterns(10))
+        cache.put("b", self._patterns(5))
+        assert "a" not in cache
+        assert cache.size_bytes <= cache.max_bytes
+
+    def test_idle_eviction(self):
+        cache = LearnedPatternCache(idle_seconds=60)
+        cache.put("a", self._patterns())
+        assert cache.evict_idle(now=time.monotonic() + 120) == 1
+        assert "a" not in cache
+
+    def test_empty_patterns_are_cached(self):
+        cache = LearnedPatternCache()
+        cache.put("a", [])
+        assert "a" in cache
+        assert len(cache.get("a")) == 0
+
+
+class TestLearnedPatternIndex:
+    """Test per-user learned-pattern lookup."""
+
+    @pytest.fixture
+    def index(self):
+        return LearnedPatternIndex([
+            {"phrase": "whats happening", "intent": "news", "params": None, "use_count": 3},
+            {"phrase": "morning roundup", "intent": "briefing", "params": None, "use_count": 1},
+        ])
+
+    def test_exact_match(self, index):
+        assert index.match("morning roundup")["intent"] == "briefing"
+
+    def test_fuzzy_match_above_threshold(self, index):
+        assert index.match("whats hapening")["intent"] == "news"
+
+    def test_fuzzy_below_threshold(self, index):
+        assert index.match("whats up") is None
+
+    def test_earliest_pattern_wins_ties(self):
+        index = LearnedPatternIndex([
+            {"phrase": "abcdefghijkx", "intent": "first"},
+            {"phrase": "abcdefghijky", "intent": "second"},
+        ])
+        assert index.match("abcdefghijkz")["intent"] == "first"
+
+    def test_add_updates_incrementally(self, index):
+        index.add("morning roundup", "news")
+        index.add("evening roundup", "briefing")
+        assert index.match("morning roundup")["intent"] == "news"
+        assert index.match("morning roundup")["use_count"] == 2
+        assert index.match("evening roundup")["intent"] == "briefing"
+        assert len(index) == 3
+
+
+class TestLearnedPatternLoading:
+    """Test lazy loading of learned patterns from memory."""
+
+    @pytest.fixture
+    def memory(self):
+        memory = AsyncMock()
+        memory.get_user_patterns.return_value = [
+            {"phrase": "whats up", "intent": "news", "params": None, "use_count": 1},
+        ]
+        return memory
+
+    async def test_loads_on_first_use_only(self, memory):
+        parser = CommandParser(memory=memory)
+        await parser.ensure_user_patterns("u1")
+        await parser.ensure_user_patterns("u1")
+        memory.get_user_patterns.assert_awaited_once_with("u1")
+        assert parser.parse("whats up", "u1").intent == "news"
+
+    async def test_learn_correction_updates_cached_user(self, memory):
+        parser = CommandParser(memory=memory)
+        await parser.ensure_user_patterns("u1")
+        await parser.learn_correction("u1", "Whats Up", "briefing")
+        memory.learn_pattern.assert_awaited_once()
+        memory.get_user_patterns.assert_awaited_once()
+        assert parser.parse("whats up", "u1").intent == "briefing"
+
+    async def test_learn_correction_skips_uncached_user(self, memory):
+        parser = CommandParser(memory=memory)
+        await parser.learn_correction("u2", "whats up", "briefing")
+        assert "u2" not in parser.learned_patterns
+
+
+# ---- Parse result cache ----
+
+class TestParseCache:
+    """Test memoization of parse results."""
+
+    def test_repeat_parse_hits_cache(self, parser):
+        first = parser.parse("news tech")
+        with patch.object(parser, "_parse") as mock_parse:
+            second = parser.parse("  news tech ")
+        mock_parse.assert_not_called()
+        assert second.intent == first.intent
+        assert second.params == first.params
+        assert parser.parse_cache.stats()["hits"] == 1
+
+    def test_results_are_copies(self, parser):
+        first = parser.parse("news tech")
+        first.params["category"] = "mutated"
+        assert parser.parse("news tech").params["category"] == "tech"
+
+    def test_register_intent_invalidates(self, parser):
+        parser.parse("deploy to staging")
+        parser.register_intent(IntentPattern(
+            intent="deploy",
+            keywords=["deploy"],
+            patterns=[r"deploy\s+to\s+(\w+)"],
+            examples=[],
+        ))
+        assert parser.parse("deploy to staging").intent == "deploy"
+
+    def test_temporal_entries_expire_sooner(self):
+        cache = ParseCache(ttl_seconds=3600, temporal_ttl_seconds=0)
+        cache.put(("k",), ParsedCommand(raw_text="tomorrow"), temporal=True)
+        cache.put(("j",), ParsedCommand(raw_text="news"))
+        assert cache.get(("k",)) is None
+        assert cache.get(("j",)) is not None
+
+    def test_lru_bound(self):
+        cache = ParseCache(max_entries=1)
+        cache.put(("a",), ParsedCommand(raw_text="a"))
+        cache.put(("b",), ParsedCommand(raw_text="b"))
+        assert len(cache) == 1
+        assert cache.get(("a",)) is None
+
+
+# ---- Bulk parsing ----
+
+class TestParseMany:
+    """Test batch parsing."""
+
+    TEXTS = ["news tech", "check my email", "xyzzy", "turn on kitchen lights", "help", ""]
+
+    def test_inline_matches_parse(self, parser):
+        results = parser.parse_many(self.TEXTS, workers=1)
+        assert [r.intent for r in results] == [parser.parse(t).intent for t in self.TEXTS]
+
+    def test_process_pool_preserves_order(self, parser):
+        parser.register_intent(IntentPattern("deploy", ["deploy"], [r"deploy\s+to\s+(\w+)"], [], ["env"]))
+        texts = self.TEXTS + ["deploy to staging", "crawl https://example.com"]
+        results = parser.parse_many(texts, workers=2, chunk_size=2)
+        expected = [parser.parse(t) for t in texts]
+        assert [(r.intent, r.params) for r in results] == [(e.intent, e.params) for e in expected]
+        assert results[-1].entities["urls"] == ["https://example.com"]
+
+    def test_process_pool_uses_learned_patterns(self):
+        parser = CommandParser()
+        parser.learned_patterns.put("u1", [{"phrase": "whats up", "intent": "news", "params": None}])
+        results = parser.parse_many(["whats up", "news"], user_id="u1", workers=2, chunk_size=1)
+        assert [r.intent for r in results] == ["news", "news"]
+
+
+# ---- Command chains ----
+
+class TestChainTokenizer:
+    """Test single-pass chain detection and splitting."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("crawl https://example.com | summarize", (["crawl https://example.com", "summarize"], "pipe")),
+        ("crawl https://example.com -> summarize", (["crawl https://example.com", "summarize"], "pipe")),
+        ("check email; news tech", (["check email", "news tech"], "sequence")),
+        ("news and then weather then help", (["news", "weather", "help"], "sequence")),
+        ("check email", (["check email"], "none")),
+        ("news |", (["news |"], "none")),
+    ])
+    def test_split(self, text, expected):
+        assert tokenize_chain(text) == expected
+
+    def test_pipe_takes_precedence(self):
+        assert tokenize_chain("news; weather | summarize") == (["news; weather", "summarize"], "pipe")
+
+    def test_quoted_strings_are_protected(self):
+        assert tokenize_chain('remind me "milk | eggs; bread" then news') == (
+            ['remind me "milk | eggs; bread"', "news"], "sequence",
+        )
+        assert tokenize_chain("what's up; don't forget") == (["what's up", "don't forget"], "sequence")
+
+    def test_urls_are_protected(self):
+        assert tokenize_chain("crawl https://example.com/a;b?q=x|y | summarize") == (
+            ["crawl https://example.com/a;b?q=x|y", "summarize"], "pipe",
+        )
+        assert tokenize_chain("crawl https://example.com; news")[0] == ["crawl https://example.com", "news"]
+
+    def test_parse_chain_marks_pipes(self, parser):
+        chain = parser.parse_chain("crawl https://example.com | summarize it")
+        assert chain.chain_type == "pipe"
+        assert [c.use_previous_output for c in chain.commands] == [False, True]
+        assert parser.is_chain("news; weather")
+        assert not parser.is_chain("news")
+
+
+# ---- Custom intents ----
+
+DEPLOY_YAML = """
+intents:
+  deploy:
+    keywords: ["deploy"]
+    patterns: ["deploy to (production|staging)"]
+    slots: ["env"]
+    action: "shell"
+    params:
+      command: "make deploy"
+"""
+
+
+class TestCustomIntents:
+    """Test loading and hot-reloading intents.yaml."""
+
+    def test_update_intents_swaps_snapshot(self, parser):
+        old_matcher = parser._matcher
+        parser.update_intents([IntentPattern("deploy", ["deploy"], [], [])], removed=["weather"])
+        assert parser.parse("deploy").intent == "deploy"
+        assert "weather" not in parser.intents
+        # The previous index is untouched for anyone still holding it
+        assert old_matcher.match("deploy") is None
+        assert old_matcher.match("weather forecast")[0] == "weather"
+
+    def test_load_and_reload_only_changed(self, parser, tmp_path):
+        path = tmp_path / "intents.yaml"
+        path.write_text(DEPLOY_YAML)
+        loader = IntentsLoader(parser, path)
+        assert loader.reload()
+        assert parser.parse("deploy to staging").params == {"env": "staging"}
+        assert not loader.reload()
+
+        compiled_weather = parser._matcher._intents["weather"]
+        path.write_text(DEPLOY_YAML.replace('["deploy"]', '["deploy", "ship it"]'))
+        assert loader.reload()
+        assert parser.parse("ship it").intent == "deploy"
+        assert parser._matcher._intents["weather"] is compiled_weather
+
+        path.write_text("intents: {}\n")
+        assert loader.reload()
+        assert "deploy" not in parser.intents
+
+    def test_keywords_are_lowercased(self, parser, tmp_path):
+        path = tmp_path / "intents.yaml"
+        path.write_text(DEPLOY_YAML.replace('["deploy"]', '["Ship It"]'))
+        IntentsLoader(parser, path).reload()
+        assert parser.intents["deploy"].keywords == ["ship it"]
+        assert parser.parse("Ship it now").intent == "deploy"
+
+    def test_invalid_entry_keeps_previous(self, parser, tmp_path):
+        path = tmp_path / "intents.yaml"
+        path.write_text(DEPLOY_YAML)
+        loader = IntentsLoader(parser, path)
+        loader.reload()
+        path.write_text(DEPLOY_YAML.replace("(production|staging)", "(production|staging"))
+        assert not loader.reload()
+        assert parser.parse("deploy to staging").intent == "deploy"
+
+    def test_override_restores_builtin(self, parser, tmp_path):
+        builtin = parser.intents["weather"]
+        path = tmp_path / "intents.yaml"
+        path.write_text('intents:\n  weather:\n    keywords: ["sky"]\n')
+        loader = IntentsLoader(parser, path)
+        loader.reload()
+        assert parser.intents["weather"] is not builtin
+        path.unlink()
+        assert loader.reload()
+        assert parser.intents["weather"] is builtin
+
+    def test_engine_routes_custom_intent_to_action(self, tmp_path):
+        (tmp_path / "intents.yaml").write_text(DEPLOY_YAML)
+        engine = SafeClaw(config_path=tmp_path / "config.yaml", data_dir=tmp_path)
+        engine.register_action("shell", lambda **kwargs: "ok")
+        engine.custom_intents.reload()
+        parsed = engine.parser.parse("deploy to production")
+        assert engine._resolve_action(parsed) == (
+            "shell", {"command": "make deploy", "env": "production"},
+        )
+
+
+# ---- Benchmarks ----
+
+class TestParserBenchmark:
+    """Test the parser micro-benchmark suite."""
+
+    def test_corpus_covers_examples_and_chains(self, parser):
+        corpus = build_corpus(parser)
+        assert "check my email" in corpus["single"]
+        assert all(parser.is_chain(text) for text in corpus["chains"])
+
+    def test_reports_every_stage(self, parser):
+        corpus = {"single": ["news tech", "check my email"], "chains": ["news | summarize"]}
+        results = run_parser_benchmark(parser, rounds=2, corpus=corpus, learned_patterns=5)
+        assert [r.name for r in results] == [
+            "parse", "parse_chain", "parse (cached)", "chain_tokenize", "learned_patterns",
+            "phrase_variations", "keyword_regex", "param_extraction", "entities",
+        ]
+        for r in results:
+            assert r.calls > 0
+            assert r.p50_us <= r.p95_us <= r.p99_us
+        assert "bench_user" not in parser.learned_patterns
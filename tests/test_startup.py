@@ -0,0 +1,74 @@
+"""Tests for startup import time and time to first response."""
+
+import os
+
+import pytest
+
+import safeclaw.actions
+import safeclaw.core
+from safeclaw.core.startup import (
+    FIRST_RESPONSE_BUDGET_MS,
+    IMPORT_BUDGET_MS,
+    deferred_imports,
+    import_time_ms,
+    measure_first_response,
+    measure_imports,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       800 |        920 |   rich.console
+warning: some library printed this
+import time:      5000 |       5920 | safeclaw.cli
+"""
+
+
+class TestImportTimeParsing:
+    """Test parsing of python -X importtime output."""
+
+    def test_parses_modules_and_depth(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [t.module for t in timings] == ["_io", "rich.console", "safeclaw.cli"]
+        assert [t.depth for t in timings] == [2, 1, 0]
+        assert timings[-1].self_ms == 5.0
+        assert import_time_ms(timings) == 5.92
+
+    def test_deferred_imports_match_top_level_package(self):
+        assert deferred_imports(["sumy.nlp.stemmers", "rich", "httpx"]) == ["sumy", "httpx"]
+
+
+class TestLazyPackages:
+    """Test that package-level exports still resolve."""
+
+    def test_exports_resolve_on_access(self):
+        assert safeclaw.core.Memory.__module__ == "safeclaw.core.memory"
+        assert safeclaw.actions.NewsAction.__name__ == "NewsAction"
+        assert "SafeClaw" in dir(safeclaw)
+
+
+# ---- Startup budget ----
+
+class TestDeferredImports:
+    """Test that heavy packages stay out of CLI startup and the first reply."""
+
+    def test_cli_import_defers_heavy_packages(self):
+        timings = measure_imports()
+        assert deferred_imports([t.module for t in timings]) == []
+
+    def test_first_response_defers_heavy_packages(self):
+        result = measure_first_response("what can you do")
+        assert "Available commands" in result["reply"]
+        assert deferred_imports(result["modules"]) == []
+
+
+@pytest.mark.skipif(not os.getenv("RUN_STARTUP_BUDGET"), reason="Wall-clock budgets depend on the machine")
+class TestStartupBudget:
+    """Regression budget for CLI import time and time to first response."""
+
+    def test_cli_import_within_budget(self):
+        assert import_time_ms(measure_imports()) <= IMPORT_BUDGET_MS
+
+    def test_first_response_within_budget(self):
+        assert measure_first_response("what can you do")["total_ms"] <= FIRST_RESPONSE_BUDGET_MS